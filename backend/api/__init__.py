@@ -1,2 +1,2 @@
-from . import events, query, stats, alerts, containers, websocket
-__all__ = ["events", "query", "stats", "alerts", "containers", "websocket"]
+from . import events, ingest, query, stats, alerts, containers, websocket
+__all__ = ["events", "ingest", "query", "stats", "alerts", "containers", "websocket"]
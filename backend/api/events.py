@@ -1,47 +1,36 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
-from backend.database import get_db
+from backend.database import get_db, SessionLocal
 from backend.models.event import Event
 from backend.schemas.event import EventCreate, EventResponse
 from backend.schemas.response import SuccessResponse
 from backend.utils.logger import logger
-from datetime import datetime
+from backend.utils.gzip_route import GzipRoute
+from backend.config import config
+from utilities.event_schema import event_values
 from backend.services.broadcast_manager import manager
-router = APIRouter()
+router = APIRouter(route_class=GzipRoute)
+NOTIFY_BROADCAST_LIMIT = 1000
+_notify_lock = asyncio.Lock()
+_last_broadcast_id = None
+def seed_broadcast_watermark():
+    global _last_broadcast_id
+    db = SessionLocal()
+    try:
+        _last_broadcast_id = db.query(func.max(Event.id)).scalar() or 0
+    finally:
+        db.close()
+    logger.info(f"Live feed notify resumes after event ID {_last_broadcast_id}")
 @router.post("/events", response_model=SuccessResponse, status_code=status.HTTP_201_CREATED)
 async def create_event(
         event: EventCreate,
         db: Session = Depends(get_db)
 ):
     try:
-        timestamp_iso = datetime.fromisoformat(event.timestamp_iso.replace('Z', '+00:00'))
-        db_event = Event(
-            timestamp_ns=event.timestamp_ns,
-            timestamp_iso=timestamp_iso,
-            pid=event.pid,
-            tgid=event.tgid,
-            uid=event.uid,
-            comm=event.comm,
-            monitor_type=event.monitor_type,
-            container_id=event.container_id,
-            container_name=event.container_name,
-            container_image=event.container_image,
-            container_status=event.container_status,
-            argv=event.argv,
-            categories=event.categories,
-            risk_score=event.risk_score,
-            is_security_relevant=event.is_security_relevant,
-            source_ip=event.source_ip,
-            dest_ip=event.dest_ip,
-            source_port=event.source_port,
-            dest_port=event.dest_port,
-            event_type=event.event_type,
-            source_container_id=event.source_container_id,
-            dest_container_id=event.dest_container_id,
-            source_container_name=event.source_container_name,
-            dest_container_name=event.dest_container_name
-        )
+        db_event = Event(**event_values(event.model_dump()))
         db.add(db_event)
         db.commit()
         db.refresh(db_event)
@@ -63,40 +52,23 @@ async def create_events_batch(
         events: List[EventCreate],
         db: Session = Depends(get_db)
 ):
+    if len(events) > config.ingestion.max_batch_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch of {len(events)} events exceeds max_batch_size {config.ingestion.max_batch_size}"
+        )
     try:
         db_events = []
         for event in events:
-            timestamp_iso = datetime.fromisoformat(event.timestamp_iso.replace('Z', '+00:00'))
-            db_event = Event(
-                timestamp_ns=event.timestamp_ns,
-                timestamp_iso=timestamp_iso,
-                pid=event.pid,
-                tgid=event.tgid,
-                uid=event.uid,
-                comm=event.comm,
-                monitor_type=event.monitor_type,
-                container_id=event.container_id,
-                container_name=event.container_name,
-                container_image=event.container_image,
-                container_status=event.container_status,
-                argv=event.argv,
-                categories=event.categories,
-                risk_score=event.risk_score,
-                is_security_relevant=event.is_security_relevant,
-                source_ip=event.source_ip,
-                dest_ip=event.dest_ip,
-                source_port=event.source_port,
-                dest_port=event.dest_port,
-                event_type=event.event_type,
-                source_container_id=event.source_container_id,
-                dest_container_id=event.dest_container_id,
-                source_container_name=event.source_container_name,
-                dest_container_name=event.dest_container_name
-            )
+            db_event = Event(**event_values(event.model_dump()))
             db_events.append(db_event)
-        db.bulk_save_objects(db_events)
+        db.add_all(db_events)
+        db.flush()
+        payloads = [db_event.to_dict() for db_event in db_events]
         db.commit()
         logger.info(f"Batch created: {len(db_events)} events")
+        for payload in payloads:
+            await manager.broadcast(payload)
         return SuccessResponse(
             message=f"Batch created successfully",
             data={"count": len(db_events)}
@@ -108,6 +80,21 @@ async def create_events_batch(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create batch: {str(e)}"
         )
+@router.post("/events/notify", response_model=SuccessResponse)
+async def notify_events(db: Session = Depends(get_db)):
+    global _last_broadcast_id
+    async with _notify_lock:
+        if _last_broadcast_id is None or not manager.get_connection_count():
+            _last_broadcast_id = db.query(func.max(Event.id)).scalar() or 0
+            return SuccessResponse(message="No live subscribers", data={"count": 0})
+        new_events = db.query(Event).filter(Event.id > _last_broadcast_id).order_by(Event.id).limit(NOTIFY_BROADCAST_LIMIT).all()
+        if len(new_events) == NOTIFY_BROADCAST_LIMIT:
+            _last_broadcast_id = db.query(func.max(Event.id)).scalar() or 0
+        elif new_events:
+            _last_broadcast_id = new_events[-1].id
+        for db_event in new_events:
+            await manager.broadcast(db_event.to_dict())
+    return SuccessResponse(message="Live feed notified", data={"count": len(new_events)})
 @router.get("/events/{event_id}", response_model=EventResponse)
 async def get_event(
         event_id: int,
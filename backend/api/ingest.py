@@ -0,0 +1,117 @@
+import asyncio
+import json
+from collections import OrderedDict
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.exc import DataError, IntegrityError
+from backend.database import SessionLocal
+from backend.models.event import Event
+from backend.schemas.event import EventCreate
+from backend.config import config
+from backend.utils.logger import logger
+from utilities.event_schema import event_values
+from backend.services.broadcast_manager import manager
+router = APIRouter()
+MAX_TRACKED_SESSIONS = 1024
+_session_acks = OrderedDict()
+def _insert(rows):
+    db = SessionLocal()
+    try:
+        db_events = [Event(**row) for row in rows]
+        db.add_all(db_events)
+        db.flush()
+        payloads = [db_event.to_dict() for db_event in db_events]
+        db.commit()
+        return payloads
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+def _store_events(rows, node):
+    try:
+        return _insert(rows)
+    except (IntegrityError, DataError):
+        pass
+    payloads = []
+    for row in rows:
+        try:
+            payloads.extend(_insert([row]))
+        except (IntegrityError, DataError) as e:
+            logger.warning(f"Ingest stream {node}: dropping event rejected by the database: {e.orig}")
+    return payloads
+def _event_row(raw, node):
+    try:
+        return event_values(EventCreate(**raw).model_dump())
+    except ValidationError as e:
+        logger.warning(f"Ingest stream {node}: dropping invalid event: {e.errors()[:1]}")
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        logger.warning(f"Ingest stream {node}: dropping unconvertible event: {e!r}")
+    return None
+def _remember_ack(session: str, ack: int):
+    _session_acks[session] = ack
+    _session_acks.move_to_end(session)
+    while len(_session_acks) > MAX_TRACKED_SESSIONS:
+        _session_acks.popitem(last=False)
+@router.websocket("/events/stream")
+async def stream_events(
+        websocket: WebSocket,
+        node: str = Query("unknown", description="Collector node name"),
+        session: str = Query(..., description="Collector process session id; sequence numbers restart with each session"),
+):
+    await websocket.accept()
+    acked = _session_acks.get(session, 0)
+    await websocket.send_json({"type": "ready", "ack": acked, "max_batch_size": config.ingestion.max_batch_size})
+    logger.info(f"Ingest stream opened: node={node}, session={session}, resuming after seq {acked}")
+    pending = asyncio.Queue()
+    async def read_messages():
+        try:
+            while True:
+                await pending.put(json.loads(await websocket.receive_text()))
+        except (WebSocketDisconnect, json.JSONDecodeError) as e:
+            if isinstance(e, json.JSONDecodeError):
+                logger.warning(f"Ingest stream {node}: malformed message: {e}")
+            await pending.put(None)
+    reader = asyncio.create_task(read_messages())
+    try:
+        closing = False
+        while not closing:
+            message = await pending.get()
+            if message is None:
+                break
+            messages = [message]
+            count = len(message.get("events", []))
+            while count < config.ingestion.max_batch_size and not pending.empty():
+                message = pending.get_nowait()
+                if message is None:
+                    closing = True
+                    break
+                messages.append(message)
+                count += len(message.get("events", []))
+            rows = []
+            for message in messages:
+                if message["seq"] <= acked:
+                    continue
+                for raw in message.get("events", []):
+                    row = _event_row(raw, node)
+                    if row is not None:
+                        rows.append(row)
+            payloads = await run_in_threadpool(_store_events, rows, node) if rows else []
+            acked = max(acked, max(message["seq"] for message in messages))
+            _remember_ack(session, acked)
+            await websocket.send_json({"type": "ack", "ack": acked})
+            for payload in payloads:
+                await manager.broadcast(payload)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Ingest stream {node} failed after seq {acked}: {e}", exc_info=True)
+        try:
+            await websocket.send_json({"type": "error", "ack": acked, "detail": str(e)})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        reader.cancel()
+        logger.info(f"Ingest stream closed: node={node}, session={session}, acked seq {acked}")
\ No newline at end of file
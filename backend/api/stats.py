@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func, distinct
 from typing import Optional
 from datetime import datetime, timedelta
 from backend.database import get_db
 from backend.models.event import Event
-from backend.schemas.response import StatsResponse, TimelineResponse, TimelineDataPoint
+from backend.models.drop_stat import DropStat
+from backend.schemas.drop_stat import DropStatCreate
+from backend.schemas.response import StatsResponse, TimelineResponse, TimelineDataPoint, DropStatsResponse, SuccessResponse
 from backend.config import config
 from backend.utils.logger import logger
+from utilities.event_schema import drop_stat_values
 router = APIRouter()
 @router.get("/stats/summary", response_model=StatsResponse)
 async def get_summary_stats(
@@ -101,3 +104,59 @@ async def get_timeline(
     except Exception as e:
         logger.error(f"Failed to get timeline: {e}", exc_info=True)
         raise
+
+@router.post("/stats/drops", response_model=SuccessResponse, status_code=status.HTTP_201_CREATED)
+async def create_drop_stat(
+        stat: DropStatCreate,
+        db: Session = Depends(get_db)
+):
+    try:
+        db_stat = DropStat(**drop_stat_values(stat.model_dump()))
+        db.add(db_stat)
+        db.commit()
+        db.refresh(db_stat)
+        logger.info(f"Drop stat recorded: reason={stat.event_type}, count={stat.count}, container={stat.container_name}")
+        return SuccessResponse(
+            message="Drop stat recorded",
+            data={"id": db_stat.id}
+        )
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to record drop stat: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to record drop stat: {str(e)}"
+        )
+@router.get("/stats/drops", response_model=DropStatsResponse)
+async def get_drop_stats(
+        start_time: Optional[int] = Query(None, description="Start timestamp (nanoseconds)"),
+        end_time: Optional[int] = Query(None, description="End timestamp (nanoseconds)"),
+        limit: int = Query(10, ge=1, le=100, description="Number of containers to return"),
+        db: Session = Depends(get_db)
+):
+    try:
+        query = db.query(DropStat)
+        if start_time:
+            query = query.filter(DropStat.timestamp_ns >= start_time)
+        if end_time:
+            query = query.filter(DropStat.timestamp_ns <= end_time)
+        by_reason = {
+            reason: int(total or 0)
+            for reason, total in query.with_entities(DropStat.reason, func.sum(DropStat.count)).group_by(DropStat.reason).all()
+        }
+        top = query.filter(DropStat.container_id.isnot(None)).with_entities(
+            DropStat.container_id,
+            DropStat.container_name,
+            func.sum(DropStat.count).label("total")
+        ).group_by(DropStat.container_id, DropStat.container_name).order_by(func.sum(DropStat.count).desc()).limit(limit).all()
+        return DropStatsResponse(
+            total_dropped=sum(by_reason.values()),
+            by_reason=by_reason,
+            top_containers=[
+                {"container_id": cid, "container_name": name, "dropped": int(total or 0)}
+                for cid, name, total in top
+            ]
+        )
+    except Exception as e:
+        logger.error(f"Failed to get drop stats: {e}", exc_info=True)
+        raise
\ No newline at end of file
@@ -22,6 +22,7 @@ def init_db():
     logger.info("Initializing database...")
     try:
         from backend.models.event import Event
+        from backend.models.drop_stat import DropStat
         Base.metadata.create_all(bind=engine)
         logger.info("Database initialized successfully")
     except Exception as e:
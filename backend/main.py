@@ -6,7 +6,7 @@ from backend.config import config
 from backend.database import init_db, engine
 from backend.utils.logger import logger
 from sqlalchemy import text
-from backend.api import events, query, stats, alerts, containers, websocket, analytics
+from backend.api import events, ingest, query, stats, alerts, containers, websocket, analytics
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 Starting Container Security Visualizer Backend...")
@@ -14,6 +14,7 @@ async def lifespan(app: FastAPI):
     logger.info(f"Database: {config.database.type} at {config.database.host}")
     try:
         init_db()
+        events.seed_broadcast_watermark()
         logger.info("✅ Database initialized")
     except Exception as e:
         logger.error(f"❌ Database initialization failed: {e}")
@@ -71,6 +72,7 @@ async def root():
         "health": "/health"
     }
 app.include_router(events.router, prefix="/api", tags=["events"])
+app.include_router(ingest.router, prefix="/api", tags=["ingest"])
 app.include_router(query.router, prefix="/api", tags=["query"])
 app.include_router(stats.router, prefix="/api", tags=["statistics"])
 app.include_router(alerts.router, prefix="/api", tags=["alerts"])
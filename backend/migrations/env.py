@@ -8,6 +8,7 @@ if config.config_file_name is not None:
 from backend.database import Base
 from backend.config import config as project_config
 from backend.models.event import Event
+from backend.models.drop_stat import DropStat
 target_metadata = Base.metadata
 config.set_main_option("sqlalchemy.url", project_config.database.url)
 def run_migrations_offline() -> None:
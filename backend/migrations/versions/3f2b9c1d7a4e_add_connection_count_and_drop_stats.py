@@ -0,0 +1,49 @@
+"""add events.connection_count and the drop_stats table
+
+Revision ID: 3f2b9c1d7a4e
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2b9c1d7a4e'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    if 'events' in tables and 'connection_count' not in {column['name'] for column in inspector.get_columns('events')}:
+        op.add_column('events', sa.Column('connection_count', sa.Integer(), server_default='1', nullable=True))
+    if 'drop_stats' not in tables:
+        op.create_table(
+            'drop_stats',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('timestamp_ns', sa.BigInteger(), nullable=False),
+            sa.Column('timestamp_iso', sa.TIMESTAMP(timezone=True), nullable=False),
+            sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column('container_id', sa.String(12)),
+            sa.Column('container_name', sa.String(255)),
+            sa.Column('reason', sa.String(20), nullable=False),
+            sa.Column('count', sa.BigInteger(), nullable=False),
+        )
+        op.create_index('ix_drop_stats_id', 'drop_stats', ['id'])
+        op.create_index('ix_drop_stats_timestamp_ns', 'drop_stats', ['timestamp_ns'])
+        op.create_index('ix_drop_stats_container_id', 'drop_stats', ['container_id'])
+        op.create_index('ix_drop_stats_reason', 'drop_stats', ['reason'])
+        op.create_index('idx_drop_stats_reason_timestamp', 'drop_stats', ['reason', sa.text('timestamp_ns DESC')])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('drop_stats')
+    op.drop_column('events', 'connection_count')
@@ -1,2 +1,3 @@
 from .event import Event
-__all__ = ["Event"]
+from .drop_stat import DropStat
+__all__ = ["Event", "DropStat"]
\ No newline at end of file
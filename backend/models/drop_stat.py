@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, BigInteger, TIMESTAMP, Index
+from sqlalchemy.sql import func
+from backend.database import Base
+from utilities.event_schema import DROP_STATS_TABLE, DROP_STAT_COLUMNS, check_table_columns
+class DropStat(Base):
+    __tablename__ = DROP_STATS_TABLE
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    timestamp_ns = Column(BigInteger, nullable=False, index=True)
+    timestamp_iso = Column(TIMESTAMP(timezone=True), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    container_id = Column(String(12), index=True)
+    container_name = Column(String(255))
+    reason = Column(String(20), nullable=False, index=True)
+    count = Column(BigInteger, nullable=False)
+    __table_args__ = (
+        Index('idx_drop_stats_reason_timestamp', reason, timestamp_ns.desc()),
+    )
+    def __repr__(self):
+        return f"<DropStat(id={self.id}, reason={self.reason}, count={self.count}, container={self.container_name})>"
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "timestamp_ns": self.timestamp_ns,
+            "timestamp_iso": self.timestamp_iso.isoformat() if self.timestamp_iso else None,
+            "container_id": self.container_id,
+            "container_name": self.container_name,
+            "reason": self.reason,
+            "count": self.count,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
+check_table_columns(DropStat.__table__, DROP_STAT_COLUMNS)
\ No newline at end of file
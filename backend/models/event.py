@@ -2,8 +2,9 @@ from sqlalchemy import Column, Integer, String, BigInteger, Boolean, Text, TIMES
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from backend.database import Base
+from utilities.event_schema import EVENTS_TABLE, EVENT_COLUMNS, check_table_columns
 class Event(Base):
-    __tablename__ = "events"
+    __tablename__ = EVENTS_TABLE
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     timestamp_ns = Column(BigInteger, nullable=False, index=True)
     timestamp_iso = Column(TIMESTAMP(timezone=True), nullable=False)
@@ -26,6 +27,7 @@ class Event(Base):
     source_port = Column(Integer)
     dest_port = Column(Integer)
     event_type = Column(String(50))
+    connection_count = Column(Integer, default=1)
     source_container_id = Column(String(12), index=True)
     dest_container_id = Column(String(12), index=True)
     source_container_name = Column(String(255))
@@ -61,9 +63,12 @@ class Event(Base):
             "source_port": self.source_port,
             "dest_port": self.dest_port,
             "event_type": self.event_type,
+            "connection_count": self.connection_count,
             "source_container_id": self.source_container_id,
             "dest_container_id": self.dest_container_id,
             "source_container_name": self.source_container_name,
             "dest_container_name": self.dest_container_name,
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
+
+check_table_columns(Event.__table__, EVENT_COLUMNS)
\ No newline at end of file
@@ -7,6 +7,7 @@ from .event import (
     SyscallEventCreate,
     NetworkEventCreate
 )
+from .drop_stat import DropStatCreate
 from .response import (
     SuccessResponse,
     ErrorResponse,
@@ -14,6 +15,7 @@ from .response import (
     StatsResponse,
     TimelineResponse,
     TimelineDataPoint,
+    DropStatsResponse,
     ContainerInfo,
     AlertEvent
 )
@@ -25,12 +27,14 @@ __all__ = [
     "EventListResponse",
     "SyscallEventCreate",
     "NetworkEventCreate",
+    "DropStatCreate",
     "SuccessResponse",
     "ErrorResponse",
     "HealthResponse",
     "StatsResponse",
     "TimelineResponse",
     "TimelineDataPoint",
+    "DropStatsResponse",
     "ContainerInfo",
     "AlertEvent",
 ]
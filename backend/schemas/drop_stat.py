@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+class DropStatCreate(BaseModel):
+    timestamp_ns: int = Field(..., description="Monotonic nanosecond timestamp when the counter was read")
+    timestamp_iso: str = Field(..., description="ISO 8601 timestamp")
+    event_type: str = Field(..., max_length=20, description="Drop reason: rate_limited or buffer_lost")
+    count: int = Field(..., ge=0, description="Events dropped since the previous report")
+    cgroup_id: Optional[int] = Field(None, description="Kernel cgroup id, 0 for buffer losses")
+    container_id: Optional[str] = Field(None, max_length=12)
+    container_name: Optional[str] = Field(None, max_length=255)
\ No newline at end of file
@@ -30,6 +30,7 @@ class NetworkEventCreate(EventBase):
     source_port: Optional[int] = Field(None, ge=0, le=65535, description="Source port")
     dest_port: Optional[int] = Field(None, ge=0, le=65535, description="Destination port")
     event_type: Optional[str] = Field(None, max_length=50, description="Event type (e.g., tcp_connect)")
+    connection_count: Optional[int] = Field(1, ge=1, description="Connects folded into this record by in-kernel aggregation")
     source_container_id: Optional[str] = Field(None, max_length=12)
     dest_container_id: Optional[str] = Field(None, max_length=12)
     source_container_name: Optional[str] = Field(None, max_length=255)
@@ -55,6 +56,7 @@ class EventCreate(BaseModel):
     source_port: Optional[int] = None
     dest_port: Optional[int] = None
     event_type: Optional[str] = None
+    connection_count: Optional[int] = 1
     source_container_id: Optional[str] = None
     dest_container_id: Optional[str] = None
     source_container_name: Optional[str] = None
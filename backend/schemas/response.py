@@ -28,6 +28,10 @@ class TimelineDataPoint(BaseModel):
 class TimelineResponse(BaseModel):
     interval: str
     data: list[TimelineDataPoint]
+class DropStatsResponse(BaseModel):
+    total_dropped: int
+    by_reason: Dict[str, int]
+    top_containers: list[Dict[str, Any]]
 class ContainerInfo(BaseModel):
     container_id: str
     container_name: str
@@ -125,9 +125,11 @@ class AnalyticsService:
         ]
     @staticmethod
     def get_network_connections_summary(db: Session) -> Dict:
-        total_connections = db.query(Event).filter(
+        total_connections = db.query(
+            func.sum(func.coalesce(Event.connection_count, 1))
+        ).filter(
             Event.monitor_type == 'network'
-        ).count()
+        ).scalar() or 0
         unique_dest_ips = db.query(
             func.count(func.distinct(Event.dest_ip))
         ).filter(
@@ -138,7 +140,7 @@ class AnalyticsService:
         ).scalar() or 0
         top_destinations = db.query(
             Event.dest_ip,
-            func.count(Event.id).label('count')
+            func.sum(func.coalesce(Event.connection_count, 1)).label('count')
         ).filter(
             and_(
                 Event.monitor_type == 'network',
@@ -1,2 +1,3 @@
 from .logger import logger, setup_logger
-__all__ = ["logger", "setup_logger"]
+from .gzip_route import GzipRoute
+__all__ = ["logger", "setup_logger", "GzipRoute"]
@@ -0,0 +1,195 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "collector"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fake_docker import FakeDockerDaemon
+SYSCALLS = ("execve", "openat", "connect", "setuid", "read", "mount", "clone", "write", "init_module", "ptrace")
+OUTPUT_MODES = ("stdout", "file", "http", "http_batch")
+def write_process(root: str, pid: int, cgroup: str):
+    os.makedirs(os.path.join(root, str(pid)), exist_ok=True)
+    with open(os.path.join(root, str(pid), "cgroup"), "w") as f:
+        f.write(f"0::{cgroup}\n")
+    with open(os.path.join(root, str(pid), "stat"), "w") as f:
+        f.write(f"{pid} (bench) S 1 {pid} {pid} 0 -1 4194560 0 0 0 0 0 0 0 0 20 0 1 0 {100000 + pid} 0 0\n")
+def build_proc_tree(root: str, containers, pids_per_container: int) -> dict:
+    pids = {}
+    pid = 20000
+    for container_id in containers:
+        for _ in range(pids_per_container):
+            write_process(root, pid, f"/system.slice/docker-{container_id}.scope")
+            pids[pid] = container_id[:12]
+            pid += 1
+    write_process(root, 1, "/init.scope")
+    return pids
+class _BackendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"success": true, "data": {"event_id": 1}}'
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def log_message(self, format, *args):
+        pass
+def start_fake_backend():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BackendHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api/events"
+def percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(samples) - 1))), len(samples) - 1)
+    return samples[index]
+def measure(fn, inputs, prepare=None, warmup: int = 50) -> dict:
+    for item in inputs[:warmup]:
+        if prepare:
+            prepare(item)
+        fn(item)
+    samples = []
+    clock = time.perf_counter_ns
+    for item in inputs:
+        if prepare:
+            prepare(item)
+        start = clock()
+        fn(item)
+        samples.append(clock() - start)
+    samples.sort()
+    total_ns = sum(samples)
+    return {
+        "iterations": len(samples),
+        "events_per_sec": round(len(samples) / (total_ns / 1e9), 1) if total_ns else None,
+        "mean_us": round(total_ns / len(samples) / 1000, 2),
+        "p50_us": round(percentile(samples, 50) / 1000, 2),
+        "p99_us": round(percentile(samples, 99) / 1000, 2),
+        "max_us": round(samples[-1] / 1000, 2),
+    }
+def syscall_event(pid: int, index: int) -> dict:
+    return {
+        "timestamp_ns": index,
+        "timestamp_iso": "2024-01-01T00:00:00Z",
+        "monitor_type": "syscall",
+        "cgroup_id": 0,
+        "pid": pid,
+        "tgid": pid,
+        "uid": 1000 if index % 3 else 0,
+        "comm": "bench",
+        "argv": "/usr/bin/bench --flag",
+        "syscall_name": SYSCALLS[index % len(SYSCALLS)],
+    }
+def network_event(pid: int, index: int, dest_ip: int) -> dict:
+    return {
+        "timestamp_ns": index,
+        "timestamp_iso": "2024-01-01T00:00:00Z",
+        "monitor_type": "network",
+        "cgroup_id": 0,
+        "pid": pid,
+        "tgid": pid,
+        "uid": 0,
+        "comm": "bench",
+        "saddr": 0,
+        "daddr": dest_ip,
+        "sport": 0,
+        "dport": (22, 443, 5432)[index % 3],
+        "ip_version": 4,
+    }
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+def run(iterations: int, containers: int, pids_per_container: int, docker_latency: float, workdir: str) -> dict:
+    proc_root = os.path.join(workdir, "proc")
+    daemon = FakeDockerDaemon(os.path.join(workdir, "docker.sock"), containers=containers, latency=docker_latency).start()
+    pids = build_proc_tree(proc_root, list(daemon.containers), pids_per_container)
+    os.environ["HOST_PROC"] = proc_root
+    os.environ["DOCKER_HOST"] = daemon.docker_host
+    from utilities import get_container_id_from_pid, categorize_syscall, get_risk_score
+    from event_enricher import EventEnricher
+    from output_adapter import OutputAdapter
+    import socket
+    import struct
+    pid_list = list(pids)
+    results = {}
+    inputs = [pid_list[i % len(pid_list)] for i in range(iterations)]
+    results["get_container_id_from_pid"] = measure(get_container_id_from_pid, inputs)
+    names = [(SYSCALLS[i % len(SYSCALLS)], i % 2000) for i in range(iterations)]
+    results["categorize_and_score"] = measure(lambda item: (categorize_syscall(item[0]), get_risk_score(item[0], item[1])), names)
+    enricher = EventEnricher(use_cgroup_index=False, use_docker_events=False)
+    events = [syscall_event(inputs[i], i) for i in range(iterations)]
+    results["enrich_warm"] = measure(lambda e: enricher.enrich(dict(e)), events)
+    results["enrich_pid_miss"] = measure(lambda e: enricher.enrich(dict(e)), events, prepare=lambda e: enricher.pid_cache.clear())
+    metadata_events = events[:max(iterations // 10, 1)]
+    results["enrich_metadata_miss"] = measure(lambda e: enricher.enrich(dict(e)), metadata_events, prepare=lambda e: enricher.cache.clear(), warmup=5)
+    ips = [struct.unpack("<I", socket.inet_aton(c["NetworkSettings"]["Networks"]["bridge"]["IPAddress"]))[0] for c in daemon.containers.values()]
+    net_events = [network_event(inputs[i], i, ips[i % len(ips)]) for i in range(iterations)]
+    results["enrich_network"] = measure(lambda e: enricher.enrich(dict(e)), net_events)
+    live = EventEnricher(use_cgroup_index=False, use_docker_events=True)
+    deadline = time.time() + 5
+    while not live.registry.connected and time.time() < deadline:
+        time.sleep(0.01)
+    results["enrich_docker_events"] = measure(lambda e: live.enrich(dict(e)), metadata_events, prepare=lambda e: live.cache.clear(), warmup=5)
+    results["enrich_network_docker_events"] = measure(lambda e: live.enrich(dict(e)), net_events)
+    live.registry.stop()
+    enriched = [enricher.enrich(dict(e)) for e in events[:1000]]
+    enriched = [e for e in enriched if e] or [dict(events[0])]
+    outputs = [enriched[i % len(enriched)] for i in range(iterations)]
+    backend, endpoint = start_fake_backend()
+    for mode in OUTPUT_MODES:
+        adapter = OutputAdapter(mode=mode, config={
+            "file_path": os.path.join(workdir, "events.log"),
+            "api_endpoint": endpoint,
+            "stats_endpoint": endpoint,
+        })
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            results[f"output_{mode}"] = measure(adapter.send, outputs)
+        adapter.close()
+    backend.shutdown()
+    daemon.stop()
+    return {
+        "timestamp": time.time(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "iterations": iterations,
+            "containers": containers,
+            "pids_per_container": pids_per_container,
+            "docker_latency_ms": docker_latency * 1000,
+            "fake_docker_requests": daemon.requests,
+        },
+        "results": results,
+    }
+def main():
+    parser = argparse.ArgumentParser(description="Collector micro-benchmarks against a fake Docker API and a synthetic /proc")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--containers", type=int, default=50)
+    parser.add_argument("--pids-per-container", type=int, default=20)
+    parser.add_argument("--docker-latency-ms", type=float, default=0)
+    parser.add_argument("--output", default=None, help="results file (default: benchmarks/results/collector-<timestamp>.json)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="collector-bench-") as workdir:
+        report = run(args.iterations, args.containers, args.pids_per_container, args.docker_latency_ms / 1000, workdir)
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", time.strftime("collector-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    width = max(len(name) for name in report["results"])
+    for name, stats in report["results"].items():
+        print(f"{name:<{width}}  {stats['events_per_sec']:>12} ev/s  p50 {stats['p50_us']:>9} us  p99 {stats['p99_us']:>9} us")
+    print(f"Results written to {output}")
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,171 @@
+import json
+import os
+import queue
+import re
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+_VERSION_PREFIX = re.compile(r"^/v[0-9.]+")
+def fake_container(index: int, network: str = "bridge") -> dict:
+    container_id = f"{index:012x}" + "f" * 52
+    return {
+        "Id": container_id,
+        "Name": f"/bench-{index}",
+        "Image": "sha256:" + "a" * 64,
+        "Config": {"Image": f"bench/app:{index % 5}", "Labels": {}},
+        "State": {"Status": "running", "Running": True, "Pid": 10000 + index},
+        "NetworkSettings": {"Networks": {network: {"IPAddress": f"172.18.{index // 250}.{index % 250 + 2}"}}},
+    }
+class FakeDockerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def do_GET(self):
+        daemon = self.server.fake_daemon
+        path = _VERSION_PREFIX.sub("", self.path.split("?", 1)[0])
+        daemon.requests += 1
+        if daemon.latency:
+            daemon.sleep(daemon.latency)
+        if path == "/_ping":
+            body = b"OK"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif path == "/version":
+            self._send_json(200, {"ApiVersion": "1.43", "Version": "24.0.0-fake", "MinAPIVersion": "1.12"})
+        elif path == "/containers/json":
+            self._send_json(200, [
+                {"Id": c["Id"], "Names": [c["Name"]], "Image": c["Config"]["Image"], "State": c["State"]["Status"], "NetworkSettings": c["NetworkSettings"]}
+                for c in daemon.containers.values()
+            ])
+        elif path.startswith("/containers/") and path.endswith("/json"):
+            container = daemon.find(path[len("/containers/"):-len("/json")])
+            if container is None:
+                self._send_json(404, {"message": "No such container"})
+            else:
+                self._send_json(200, container)
+        elif path == "/events":
+            self._stream_events(daemon)
+        elif path.startswith("/images/") and path.endswith("/json"):
+            image_id = path[len("/images/"):-len("/json")]
+            self._send_json(200, {"Id": image_id, "RepoTags": ["bench/app:latest"]})
+        else:
+            self._send_json(404, {"message": f"page not found: {path}"})
+    def _stream_events(self, daemon):
+        events = daemon.subscribe()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.wfile.flush()
+        try:
+            while not daemon._stop.is_set():
+                try:
+                    event = events.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                if event is None:
+                    break
+                body = json.dumps(event).encode() + b"\n"
+                self.wfile.write(f"{len(body):x}\r\n".encode() + body + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass
+        finally:
+            daemon.unsubscribe(events)
+            self.close_connection = True
+    def log_message(self, format, *args):
+        pass
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("local", 0)
+class FakeDockerDaemon:
+    def __init__(self, socket_path: str, containers: int = 50, latency: float = 0):
+        self.socket_path = socket_path
+        self.latency = latency
+        self.requests = 0
+        self.containers = {}
+        for index in range(containers):
+            self.add_container(fake_container(index))
+        self._server = None
+        self._stop = threading.Event()
+        self._subscribers = []
+        self._lock = threading.Lock()
+    def sleep(self, seconds: float):
+        self._stop.wait(seconds)
+    def add_container(self, container: dict):
+        self.containers[container["Id"]] = container
+    def subscribe(self) -> queue.Queue:
+        events = queue.Queue()
+        with self._lock:
+            self._subscribers.append(events)
+        return events
+    def unsubscribe(self, events: queue.Queue):
+        with self._lock:
+            if events in self._subscribers:
+                self._subscribers.remove(events)
+    def emit(self, event_type: str, action: str, actor_id: str, **attributes):
+        event = {"Type": event_type, "Action": action, "Actor": {"ID": actor_id, "Attributes": attributes}, "time": int(time.time()), "timeNano": time.time_ns()}
+        with self._lock:
+            for events in self._subscribers:
+                events.put(event)
+    def disconnect_subscribers(self):
+        with self._lock:
+            for events in self._subscribers:
+                events.put(None)
+    def start_container(self, container: dict):
+        self.add_container(container)
+        container["State"].update(Status="running", Running=True)
+        self.emit("container", "start", container["Id"], name=container["Name"].lstrip("/"), image=container["Config"]["Image"])
+    def stop_container(self, ref: str):
+        container = self.find(ref)
+        container["State"].update(Status="exited", Running=False)
+        for network in container["NetworkSettings"]["Networks"].values():
+            network["IPAddress"] = ""
+        self.emit("container", "die", container["Id"], name=container["Name"].lstrip("/"), exitCode="0")
+    def rename_container(self, ref: str, name: str):
+        container = self.find(ref)
+        old_name = container["Name"]
+        container["Name"] = "/" + name
+        self.emit("container", "rename", container["Id"], name=name, oldName=old_name)
+    def connect_network(self, ref: str, network: str, ip: str):
+        container = self.find(ref)
+        container["NetworkSettings"]["Networks"][network] = {"IPAddress": ip}
+        self.emit("network", "connect", "n" * 64, container=container["Id"], name=network, type="bridge")
+    def destroy_container(self, ref: str):
+        container = self.containers.pop(self.find(ref)["Id"])
+        self.emit("container", "destroy", container["Id"], name=container["Name"].lstrip("/"))
+    def find(self, ref: str):
+        ref = ref.lstrip("/")
+        for container_id, container in self.containers.items():
+            if container_id.startswith(ref) or container["Name"].lstrip("/") == ref:
+                return container
+        return None
+    def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = _UnixHTTPServer(self.socket_path, FakeDockerHandler)
+        self._server.fake_daemon = self
+        threading.Thread(target=self._server.serve_forever, name="fake-docker", daemon=True).start()
+        return self
+    def stop(self):
+        self._stop.set()
+        self.disconnect_subscribers()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+    @property
+    def docker_host(self) -> str:
+        return f"unix://{self.socket_path}"
\ No newline at end of file
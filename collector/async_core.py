@@ -0,0 +1,225 @@
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from event_enricher import EventEnricher
+from output_adapter import OutputAdapter, AsyncOutputAdapter, output_config
+from event_queue import AsyncPriorityEventQueue
+from pipeline import shard_key
+from replay import ReplaySource, open_recording
+from utilities import config, AsyncDockerClient
+from utilities.record_codec import RECORD_FD_ENV, FRAME_HEADER, decode_records
+from metrics import (
+    MONITOR_RECORDS,
+    MONITOR_READ_SECONDS,
+    JSON_DECODE_SECONDS,
+    METADATA_FETCH_SECONDS,
+    register_queue_gauges,
+    start_metrics_server
+)
+async def read_monitor_output(stream, label, events, recording=None):
+    async for raw in stream:
+        line = raw.decode("utf-8", "replace").strip()
+        if not line or not line.startswith('{'):
+            if line:
+                print(f"[{label}] {line}", file=sys.stderr)
+            continue
+        try:
+            with JSON_DECODE_SECONDS.time():
+                event = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"[{label}] JSON error: {e}", file=sys.stderr)
+            continue
+        MONITOR_RECORDS.inc("json")
+        event.setdefault("monitor_type", label)
+        await events.put(event)
+        if recording is not None:
+            recording.write(line + "\n")
+async def read_monitor_records(reader, label, events, recording=None):
+    while True:
+        try:
+            header = await reader.readexactly(FRAME_HEADER.size)
+            record_type, length = FRAME_HEADER.unpack(header)
+            payload = await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            return
+        if recording is not None:
+            recording.write(header)
+            recording.write(payload)
+        with MONITOR_READ_SECONDS.time("binary"):
+            decoded = list(decode_records(record_type, payload))
+        MONITOR_RECORDS.inc("binary", amount=len(decoded))
+        for event in decoded:
+            await events.put(event)
+async def open_record_reader(fd):
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=1 << 20)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(fd, "rb", buffering=0))
+    return reader
+async def start_monitor(script, label, events, recording=None):
+    env = dict(os.environ)
+    pass_fds = ()
+    record_fd = None
+    binary = str(config.ebpf_record_format).lower() == "binary"
+    if binary:
+        record_fd, write_fd = os.pipe()
+        env[RECORD_FD_ENV] = str(write_fd)
+        pass_fds = (write_fd,)
+    process = await asyncio.create_subprocess_exec(
+        "python3", script,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+        env=env, pass_fds=pass_fds
+    )
+    readers = [asyncio.create_task(read_monitor_output(process.stdout, label, events, None if binary else recording))]
+    if record_fd is not None:
+        os.close(pass_fds[0])
+        reader = await open_record_reader(record_fd)
+        readers.append(asyncio.create_task(read_monitor_records(reader, label, events, recording)))
+    return process, readers
+class AsyncEnrichmentPipeline:
+    def __init__(self, enricher, output, docker, workers: int = 4, queue_size: int = 1024):
+        self.enricher = enricher
+        self.output = output
+        self.docker = docker
+        self.workers = max(int(workers), 1)
+        self.shards = [asyncio.Queue(maxsize=queue_size) for _ in range(self.workers)]
+        self.output_queue = asyncio.Queue(maxsize=queue_size)
+        self.sent = 0
+        self._ip_refresh = None
+        self._metadata_fetches = set()
+        self._tasks = []
+        self._output_task = None
+    def pending(self) -> int:
+        return sum(shard.qsize() for shard in self.shards) + self.output_queue.qsize()
+    def start(self):
+        self._tasks = [asyncio.create_task(self._enrich_loop(shard)) for shard in self.shards]
+        self._output_task = asyncio.create_task(self._output_loop())
+        return self
+    async def submit(self, event: dict):
+        await self.shards[hash(shard_key(event, self.enricher.shard_container)) % self.workers].put(event)
+    async def _refresh_ips(self):
+        try:
+            self.enricher.store_container_ips(await self.docker.get_all_container_ips())
+        except Exception as e:
+            print(f"Error refreshing IP cache: {e}", file=sys.stderr)
+    async def _fetch_metadata(self, container_id: str):
+        try:
+            with METADATA_FETCH_SECONDS.time("async"):
+                metadata = await self.docker.get_container_metadata(container_id)
+        except Exception as e:
+            self.enricher.cache.finish(container_id, error=e)
+        else:
+            self.enricher.cache.finish(container_id, metadata)
+    async def _prefetch(self, event: dict):
+        if event.get("monitor_type") == "lifecycle":
+            return
+        if event.get("monitor_type") == "stats":
+            container_id = self.enricher.resolve_cgroup(event.get("cgroup_id"))
+        elif event.get("pid") is None:
+            return
+        else:
+            container_id = self.enricher.resolve_container_id(event.get("cgroup_id"), event["pid"])
+        if container_id is not None and self.enricher.metadata_stale(container_id):
+            future, owner = self.enricher.cache.claim(container_id)
+            if owner:
+                task = asyncio.create_task(self._fetch_metadata(container_id))
+                self._metadata_fetches.add(task)
+                task.add_done_callback(self._metadata_fetches.discard)
+            if container_id not in self.enricher.cache:
+                await asyncio.wrap_future(future)
+        if event.get("monitor_type") == "network" and self.enricher.ip_cache_stale():
+            if self._ip_refresh is None or self._ip_refresh.done():
+                self._ip_refresh = asyncio.create_task(self._refresh_ips())
+            await asyncio.shield(self._ip_refresh)
+    async def _enrich_loop(self, shard):
+        while True:
+            event = await shard.get()
+            if event is None:
+                return
+            try:
+                await self._prefetch(event)
+                enriched = self.enricher.enrich(event)
+            except Exception as e:
+                print(f"Enrichment error: {e}", file=sys.stderr)
+                continue
+            if enriched is not None:
+                await self.output_queue.put(enriched)
+    async def _output_loop(self):
+        while True:
+            event = await self.output_queue.get()
+            if event is None:
+                return
+            await self.output.send(event)
+            self.sent += 1
+    async def stop(self):
+        for shard in self.shards:
+            await shard.put(None)
+        await asyncio.gather(*self._tasks)
+        await self.output_queue.put(None)
+        await self._output_task
+async def run():
+    print("Starting collector (asyncio core)...", file=sys.stderr, flush=True)
+    enricher = EventEnricher(replay=bool(config.collector_replay_file), metadata_wait=False)
+    output = AsyncOutputAdapter(OutputAdapter(mode=config.collector_output_mode, config=output_config()))
+    events = AsyncPriorityEventQueue(
+        maxsize=config.collector_event_queue_size,
+        high_risk=config.collector_high_risk_score,
+        low_risk=config.collector_low_risk_score,
+        control_maxsize=config.collector_control_queue_size
+    )
+    pipeline = AsyncEnrichmentPipeline(
+        enricher,
+        output,
+        AsyncDockerClient(),
+        workers=config.collector_enrich_workers,
+        queue_size=config.collector_queue_size
+    ).start()
+    async def dispatch():
+        while True:
+            event = await events.get()
+            if event is None:
+                return
+            await pipeline.submit(event)
+    dispatcher = asyncio.create_task(dispatch())
+    register_queue_gauges(events, pipeline.pending)
+    start_metrics_server(config.collector_metrics_host, config.collector_metrics_port)
+    recording = None
+    process = None
+    if config.collector_replay_file:
+        print(f"Replaying {config.collector_replay_file} (speed: {config.collector_replay_speed or 'max'})...", file=sys.stderr, flush=True)
+        replay = ReplaySource(config.collector_replay_file, events, speed=config.collector_replay_speed, loops=config.collector_replay_loops)
+        source = asyncio.create_task(replay.run_async())
+        readers = []
+    else:
+        recording = open_recording(config.collector_record_file, str(config.ebpf_record_format).lower() == "binary")
+        process, readers = await start_monitor(os.path.join(os.path.dirname(__file__), config.ebpf_monitor_host), "monitor", events, recording)
+        source = asyncio.create_task(process.wait())
+        print("Monitor host process started.", file=sys.stderr, flush=True)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, source.cancel)
+    print("Collector ready...", file=sys.stderr)
+    started = time.monotonic()
+    try:
+        await source
+        if process is not None:
+            print(f"Monitor host exited with code {process.returncode}", file=sys.stderr, flush=True)
+    except asyncio.CancelledError:
+        print("\nStopping collector...", file=sys.stderr)
+    finally:
+        if process is not None and process.returncode is None:
+            process.terminate()
+            await process.wait()
+        await asyncio.gather(*readers, return_exceptions=True)
+        await events.close()
+        await dispatcher
+        await pipeline.stop()
+        await output.close()
+        if recording is not None:
+            recording.close()
+        elapsed = time.monotonic() - started
+        print(f"Collector queue drops by lane: {events.drop_counts()} (blocked puts: {events.blocked})", file=sys.stderr, flush=True)
+        print(f"Collector sent {pipeline.sent} events in {elapsed:.2f}s ({pipeline.sent / elapsed if elapsed > 0 else 0:.0f} events/s)", file=sys.stderr, flush=True)
\ No newline at end of file
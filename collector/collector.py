@@ -1,90 +1,152 @@
 import sys
 import os
+import asyncio
+import json
 import subprocess
 import threading
+import time
 import queue
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from event_enricher import EventEnricher
-from output_adapter import OutputAdapter
+from output_adapter import OutputAdapter, output_config
+from pipeline import EnrichmentPipeline
+from event_queue import PriorityEventQueue
+from replay import ReplaySource, TeeReader, open_recording
 from utilities import config
+from utilities.record_codec import RECORD_FD_ENV, iter_frames, decode_records
+from metrics import (
+    MONITOR_RECORDS,
+    MONITOR_READ_SECONDS,
+    JSON_DECODE_SECONDS,
+    register_queue_gauges,
+    start_metrics_server
+)
 EBPF_DIR = os.path.dirname(__file__)
-SYSCALL_MONITOR = os.path.join(EBPF_DIR, config.ebpf_syscall_monitor)
-NET_MONITOR = os.path.join(EBPF_DIR, config.ebpf_net_monitor)
-event_queue = queue.Queue()
-def read_monitor_output(process, monitor_type, event_queue):
+MONITOR_HOST = os.path.join(EBPF_DIR, config.ebpf_monitor_host)
+event_queue = PriorityEventQueue(
+    maxsize=config.collector_event_queue_size,
+    high_risk=config.collector_high_risk_score,
+    low_risk=config.collector_low_risk_score,
+    control_maxsize=config.collector_control_queue_size
+)
+def read_monitor_output(process, label, event_queue, recording=None):
     try:
         for line in iter(process.stdout.readline, ''):
             line = line.strip()
             if not line or not line.startswith('{'):
                 if line:
-                    print(f"[{monitor_type}] {line}", file=sys.stderr)
+                    print(f"[{label}] {line}", file=sys.stderr)
                 continue
             try:
-                import json
-                event = json.loads(line)
-                event["monitor_type"] = monitor_type
+                with JSON_DECODE_SECONDS.time():
+                    event = json.loads(line)
+                MONITOR_RECORDS.inc("json")
+                event.setdefault("monitor_type", label)
                 event_queue.put(event)
+                if recording is not None:
+                    recording.write(line + "\n")
             except json.JSONDecodeError as e:
-                print(f"[{monitor_type}] JSON error: {e}", file=sys.stderr)
+                print(f"[{label}] JSON error: {e}", file=sys.stderr)
     except Exception as e:
-        print(f"[{monitor_type}] Error: {e}", file=sys.stderr)
-def main():
-    print("Starting collector...", file=sys.stderr, flush=True)
-    print("Initializing EventEnricher...", file=sys.stderr, flush=True)
-    enricher = EventEnricher()
-    print("EventEnricher initialized.", file=sys.stderr, flush=True)
-    output = OutputAdapter(mode=config.collector_output_mode, config={
-        "api_endpoint": config.collector_api_endpoint
-    })
-    print(f"OutputAdapter initialized (mode: {config.collector_output_mode}).", file=sys.stderr, flush=True)
-    sudo_cmd = []
-    print(f"Starting syscall monitor (sudo: {os.geteuid() != 0})...", file=sys.stderr, flush=True)
-    syscall_proc = subprocess.Popen(
-        sudo_cmd + ["python3", SYSCALL_MONITOR],
-        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-        text=True, bufsize=1
-    )
-    print("Syscall monitor process started.", file=sys.stderr, flush=True)
-    print(f"Starting network monitor (sudo: {os.geteuid() != 0})...", file=sys.stderr, flush=True)
-    net_proc = subprocess.Popen(
-        sudo_cmd + ["python3", NET_MONITOR],
+        print(f"[{label}] Error: {e}", file=sys.stderr)
+def read_monitor_records(record_fd, label, event_queue, recording=None):
+    try:
+        with os.fdopen(record_fd, "rb", buffering=1 << 20) as stream:
+            source = TeeReader(stream, recording) if recording is not None else stream
+            for record_type, payload in iter_frames(source):
+                with MONITOR_READ_SECONDS.time("binary"):
+                    events = list(decode_records(record_type, payload))
+                MONITOR_RECORDS.inc("binary", amount=len(events))
+                for event in events:
+                    event_queue.put(event)
+    except Exception as e:
+        print(f"[{label}] Record stream error: {e}", file=sys.stderr)
+def start_monitor(script, label, event_queue, recording=None):
+    env = dict(os.environ)
+    pass_fds = ()
+    record_fd = None
+    binary = str(config.ebpf_record_format).lower() == "binary"
+    if binary:
+        record_fd, write_fd = os.pipe()
+        env[RECORD_FD_ENV] = str(write_fd)
+        pass_fds = (write_fd,)
+    process = subprocess.Popen(
+        ["python3", script],
         stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-        text=True, bufsize=1
+        text=True, bufsize=1, env=env, pass_fds=pass_fds
     )
-    print("Network monitor process started.", file=sys.stderr, flush=True)
+    if record_fd is not None:
+        os.close(pass_fds[0])
+        threading.Thread(
+            target=read_monitor_records,
+            args=(record_fd, label, event_queue, recording),
+            daemon=True
+        ).start()
     threading.Thread(
         target=read_monitor_output,
-        args=(syscall_proc, "syscall", event_queue),
+        args=(process, label, event_queue, None if binary else recording),
         daemon=True
     ).start()
-    threading.Thread(
-        target=read_monitor_output,
-        args=(net_proc, "network", event_queue),
-        daemon=True
+    return process
+def main():
+    if str(config.collector_runtime).lower() == "asyncio":
+        from async_core import run
+        asyncio.run(run())
+        return
+    print("Starting collector...", file=sys.stderr, flush=True)
+    print("Initializing EventEnricher...", file=sys.stderr, flush=True)
+    enricher = EventEnricher(replay=bool(config.collector_replay_file))
+    print("EventEnricher initialized.", file=sys.stderr, flush=True)
+    output = OutputAdapter(mode=config.collector_output_mode, config=output_config())
+    print(f"OutputAdapter initialized (mode: {config.collector_output_mode}).", file=sys.stderr, flush=True)
+    recording = None
+    if config.collector_replay_file:
+        print(f"Replaying {config.collector_replay_file} (speed: {config.collector_replay_speed or 'max'})...", file=sys.stderr, flush=True)
+        monitor_proc = ReplaySource(
+            config.collector_replay_file,
+            event_queue,
+            speed=config.collector_replay_speed,
+            loops=config.collector_replay_loops
+        ).start()
+    else:
+        recording = open_recording(config.collector_record_file, str(config.ebpf_record_format).lower() == "binary")
+        print(f"Starting monitor host (probes: {', '.join(config.ebpf_probes)}, record format: {config.ebpf_record_format})...", file=sys.stderr, flush=True)
+        monitor_proc = start_monitor(MONITOR_HOST, "monitor", event_queue, recording)
+        print("Monitor host process started.", file=sys.stderr, flush=True)
+    pipeline = EnrichmentPipeline(
+        enricher,
+        output,
+        workers=config.collector_enrich_workers,
+        queue_size=config.collector_queue_size
     ).start()
+    print(f"Enrichment pipeline started ({pipeline.workers} workers).", file=sys.stderr, flush=True)
+    register_queue_gauges(event_queue, pipeline.pending)
+    start_metrics_server(config.collector_metrics_host, config.collector_metrics_port)
+    debug_events = config.collector_debug_logging
     print("Collector ready...", file=sys.stderr)
+    started = time.monotonic()
     try:
         while True:
             try:
                 event = event_queue.get(timeout=1)
-                comm = event.get("comm", "unknown")
-                argv = event.get("argv", "")
-                mtype = event.get("monitor_type", "unknown")
-                print(f"DEBUG: Processing {mtype} event: {comm} {argv}", file=sys.stderr)
-                enriched = enricher.enrich(event)
-                if enriched is None:
-                    continue
-                output.send(enriched)
+                if debug_events:
+                    print(f"DEBUG: Processing {event.get('monitor_type', 'unknown')} event: {event.get('comm', 'unknown')} {event.get('argv', '')}", file=sys.stderr)
+                pipeline.submit(event)
             except queue.Empty:
-                if syscall_proc.poll() is not None or net_proc.poll() is not None:
+                if monitor_proc.poll() is not None:
                     break
                 continue
     except KeyboardInterrupt:
         print("\nStopping collector...", file=sys.stderr)
     finally:
-        syscall_proc.terminate()
-        net_proc.terminate()
-        syscall_proc.wait()
-        net_proc.wait()
+        monitor_proc.terminate()
+        monitor_proc.wait()
+        pipeline.stop()
+        processed = pipeline.sent
+        if recording is not None:
+            recording.close()
+        elapsed = time.monotonic() - started
+        print(f"Collector queue drops by lane: {event_queue.drop_counts()} (blocked puts: {event_queue.blocked})", file=sys.stderr, flush=True)
+        print(f"Collector sent {processed} events in {elapsed:.2f}s ({processed / elapsed if elapsed > 0 else 0:.0f} events/s)", file=sys.stderr, flush=True)
 if __name__ == "__main__":
     main()
\ No newline at end of file
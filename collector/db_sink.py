@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import sys
+import threading
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utilities.event_schema import (
+    EVENTS_TABLE,
+    EVENT_COLUMNS,
+    DROP_STATS_TABLE,
+    DROP_STAT_COLUMNS,
+    event_values,
+    drop_stat_values,
+    encode_json_columns
+)
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+class DatabaseSink:
+    def __init__(self, url: str, batch_size: int = 1000, flush_interval: float = 1, on_commit=None):
+        self.url = url
+        self.dialect = "sqlite" if url.startswith("sqlite") else "postgresql"
+        if self.dialect == "postgresql" and psycopg is None:
+            raise RuntimeError("db output mode needs psycopg installed to write to PostgreSQL")
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = flush_interval
+        self.on_commit = on_commit
+        self.written = 0
+        self.failed = 0
+        self._conn = None
+        self._buffer = []
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="db-sink", daemon=True)
+        self._flusher.start()
+    def _connect(self):
+        if self._conn is None:
+            if self.dialect == "sqlite":
+                self._conn = sqlite3.connect(self.url.split(":///", 1)[1], check_same_thread=False)
+            else:
+                self._conn = psycopg.connect(self.url.replace("postgresql+psycopg://", "postgresql://", 1))
+        return self._conn
+    def _row(self, values: dict, columns) -> tuple:
+        values = encode_json_columns(values)
+        if self.dialect == "sqlite":
+            values["timestamp_iso"] = values["timestamp_iso"].strftime(SQLITE_TIMESTAMP_FORMAT)
+        return tuple(values[column] for column in columns)
+    def write(self, event: dict):
+        with self._cond:
+            self._buffer.append(event)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+    def write_drop_stat(self, event: dict):
+        self._insert(DROP_STATS_TABLE, DROP_STAT_COLUMNS, [self._row(drop_stat_values(event), DROP_STAT_COLUMNS)])
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                if not self._closed and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+    def flush(self):
+        with self._cond:
+            events, self._buffer = self._buffer, []
+        for start in range(0, len(events), self.batch_size):
+            batch = events[start:start + self.batch_size]
+            rows = []
+            for event in batch:
+                try:
+                    rows.append(self._row(event_values(event), EVENT_COLUMNS))
+                except (KeyError, ValueError, TypeError) as e:
+                    self.failed += 1
+                    print(f"✗ Skipping event without a valid timestamp: {e}", file=sys.stderr)
+            if rows and self._insert(EVENTS_TABLE, EVENT_COLUMNS, rows) and self.on_commit is not None:
+                self.on_commit(len(rows))
+    def _insert(self, table: str, columns, rows) -> bool:
+        with self._write_lock:
+            try:
+                conn = self._connect()
+                if self.dialect == "sqlite":
+                    conn.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", rows)
+                else:
+                    with conn.cursor() as cur:
+                        with cur.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+                            for row in rows:
+                                copy.write_row(row)
+                conn.commit()
+            except Exception as e:
+                self.failed += len(rows)
+                print(f"✗ Database write of {len(rows)} rows into {table} failed: {e}", file=sys.stderr)
+                if self._conn is not None:
+                    try:
+                        self._conn.close()
+                    except Exception:
+                        pass
+                    self._conn = None
+                return False
+            self.written += len(rows)
+            return True
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._flusher.join(timeout=30)
+        if self._conn is not None:
+            self._conn.close()
\ No newline at end of file
@@ -2,24 +2,54 @@ import sys
 import os
 import socket
 import struct
-from time import time
+from time import time, perf_counter
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utilities import (
     get_container_id_from_pid,
+    get_process_start_time,
     get_container_metadata,
     get_all_container_ips,
     categorize_syscall,
     get_risk_score,
+    get_network_risk,
     is_security_relevant_syscall,
+    is_cgroup_v2,
+    CgroupIndex,
+    ContainerRegistry,
     config
 )
+from metrics import (
+    CONTAINER_RESOLVE,
+    CONTAINER_RESOLVE_SECONDS,
+    METADATA_CACHE,
+    METADATA_FETCH_SECONDS,
+    IP_CACHE,
+    SCORING_SECONDS,
+    ENRICHED_EVENTS
+)
+from pid_cache import PidCache, MISS
+from metadata_cache import MetadataCache
+from replay import ReplayContainers
 class EventEnricher:
-    def __init__(self):
-        self.cache = {}
+    def __init__(self, use_cgroup_index: bool = True, use_docker_events: bool = None, replay: bool = False, metadata_wait: bool = True):
+        self.cache = MetadataCache(self._fetch_metadata, config.metadata_cache_size, config.cache_ttl, config.metadata_fetch_workers)
+        self.pid_cache = PidCache(config.pid_cache_size, config.pid_revalidate_interval)
         self.ip_cache = {}
         self.ip_cache_time = 0
-        self.pid_ttl = config.cache_ttl
         self.ip_ttl = 30
+        self.debug_logging = config.collector_debug_logging
+        self.metadata_wait = metadata_wait
+        self.registry = None
+        self.replay = ReplayContainers() if replay else None
+        if replay:
+            use_cgroup_index = use_docker_events = False
+        if config.collector_docker_events if use_docker_events is None else use_docker_events:
+            self.registry = ContainerRegistry().start()
+        self.cgroup_index = None
+        if use_cgroup_index and is_cgroup_v2():
+            self.cgroup_index = CgroupIndex(resync_interval=config.ebpf_cgroup_resync_interval, poll_interval=config.ebpf_cgroup_poll_interval)
+            self.cgroup_index.subscribe(self._on_cgroups_changed)
+            self.cgroup_index.start()
     def _int_to_ip(self, ip_int: int) -> str:
         if not ip_int:
             return None
@@ -27,66 +57,174 @@ class EventEnricher:
             return socket.inet_ntoa(struct.pack('<I', ip_int))
         except Exception:
             return None
+    def _live(self, container_id: str):
+        if self.replay is not None:
+            return self.replay.get(container_id)
+        if self.registry is None or not self.registry.connected:
+            return None
+        return self.registry.get(container_id)
+    def ip_cache_stale(self) -> bool:
+        if self.replay is not None or (self.registry is not None and self.registry.connected):
+            return False
+        return time() - self.ip_cache_time >= self.ip_ttl
+    def store_container_ips(self, ips: dict):
+        self.ip_cache = ips
+        self.ip_cache_time = time()
+    def metadata_stale(self, container_id: str) -> bool:
+        if self._live(container_id) is not None:
+            return False
+        return self.cache.stale(container_id)
+    def store_metadata(self, container_id: str, metadata: dict):
+        self.cache.put(container_id, metadata)
     def _refresh_ip_cache(self):
-        now = time()
-        if now - self.ip_cache_time >= self.ip_ttl:
+        if self.ip_cache_stale():
             try:
-                self.ip_cache = get_all_container_ips()
-                self.ip_cache_time = now
+                self.store_container_ips(get_all_container_ips())
             except Exception as e:
                 print(f"Error refreshing IP cache: {e}", file=sys.stderr)
     def _get_container_id_from_ip(self, ip_addr: str) -> str:
         if not ip_addr:
             return None
-        self._refresh_ip_cache()
-        return self.ip_cache.get(ip_addr)
-    def enrich(self, event: dict) -> dict:
-        pid = event.get("pid")
-        if pid is None:
-            return None
+        if self.registry is not None and self.registry.connected:
+            container_id = self.registry.container_for_ip(ip_addr)
+        else:
+            self._refresh_ip_cache()
+            container_id = self.ip_cache.get(ip_addr)
+        IP_CACHE.inc("hit" if container_id else "miss")
+        return container_id
+    def _debug(self, message: str):
+        if not self.debug_logging:
+            return
+        try:
+            with open("/tmp/enricher_debug.log", "a") as log:
+                log.write(message + "\n")
+        except OSError:
+            pass
+    def resolve_container_id(self, cgroup_id, pid) -> str:
+        start = perf_counter()
+        container_id, source = self._lookup_container_id(cgroup_id, pid)
+        CONTAINER_RESOLVE.inc(source)
+        CONTAINER_RESOLVE_SECONDS.observe(perf_counter() - start, source)
+        return container_id
+    def _replay_container(self, cgroup_id, pid):
+        if cgroup_id:
+            return self.replay.container_for(f"cgroup-{cgroup_id}")
+        container_id = self.pid_cache.container_of(pid)
+        if container_id is None:
+            container_id = self.replay.container_for(f"pid-{pid}")
+            self.pid_cache.put(pid, None, container_id)
+        return container_id
+    def _lookup_container_id(self, cgroup_id, pid):
+        if self.replay is not None:
+            return self._replay_container(cgroup_id, pid), "replay"
+        if cgroup_id and self.cgroup_index is not None:
+            container_id = self.cgroup_index.lookup(cgroup_id)
+            if container_id is not None:
+                return container_id, "cgroup_index"
+        cached = self.pid_cache.get(pid)
+        if cached is not MISS:
+            return cached, "pid_cache" if cached is not None else "pid_cache_negative"
+        start_time = get_process_start_time(pid)
+        if start_time is None:
+            return None, "miss"
         try:
             container_id = get_container_id_from_pid(int(pid))
-            try:
-                with open("/tmp/enricher_debug.log", "a") as log:
-                    log.write(f"PID {pid} -> Container ID: {container_id}\n")
-            except: pass
+            self._debug(f"PID {pid} -> Container ID: {container_id}")
         except Exception as e:
-            try:
-                with open("/tmp/enricher_debug.log", "a") as log:
-                    log.write(f"Error mapping PID {pid}: {e}\n")
-            except: pass
+            self._debug(f"Error mapping PID {pid}: {e}")
+            return None, "miss"
+        self.pid_cache.put(pid, start_time, container_id)
+        return container_id, "proc"
+    def shard_container(self, event: dict) -> str:
+        if event.get("monitor_type") == "lifecycle" and event.get("event_type") == "process_fork":
+            return self.pid_cache.container_of(event.get("ppid"))
+        return self.pid_cache.container_of(event.get("pid"))
+    def _handle_lifecycle(self, event: dict):
+        pid = event.get("pid")
+        if event.get("event_type") == "process_exit":
+            self.pid_cache.discard(pid)
+        elif event.get("event_type") == "process_fork":
             container_id = None
+            if self.cgroup_index is not None and event.get("cgroup_id"):
+                container_id = self.cgroup_index.lookup(event["cgroup_id"])
+            if container_id is None:
+                container_id = self.pid_cache.container_of(event.get("ppid"))
+            if container_id is not None:
+                self.pid_cache.put(pid, None, container_id)
+    def _on_cgroups_changed(self, added: dict, removed: dict):
+        if not removed:
+            return
+        live = set(self.cgroup_index.snapshot().values())
+        gone = {cid for cid in removed.values() if cid and cid not in live}
+        if not gone:
+            return
+        self.cache.discard(gone)
+        self.ip_cache = {ip: cid for ip, cid in list(self.ip_cache.items()) if cid not in gone}
+        self.pid_cache.drop_containers(gone)
+    def resolve_cgroup(self, cgroup_id) -> str:
+        if not cgroup_id:
+            return None
+        if self.cgroup_index is not None:
+            return self.cgroup_index.lookup(cgroup_id)
+        if self.replay is not None:
+            return self.replay.container_for(f"cgroup-{cgroup_id}")
+        return None
+    def _enrich_stats(self, event: dict) -> dict:
+        container_id = self.resolve_cgroup(event.get("cgroup_id"))
+        event["container_id"] = container_id
+        event["container_name"] = None
+        if container_id is not None:
+            metadata = self._metadata_for(container_id)
+            event["container_name"] = metadata.get("name") if metadata else None
+        return event
+    def _known_name(self, container_id: str) -> str:
+        live = self._live(container_id)
+        if live is not None:
+            return live["name"]
+        metadata = self.cache.peek(container_id)
+        return metadata.get("name") if metadata else None
+    def _fetch_metadata(self, container_id: str) -> dict:
+        with METADATA_FETCH_SECONDS.time("docker_sdk"):
+            return get_container_metadata(container_id)
+    def _metadata_for(self, container_id: str) -> dict:
+        live = self._live(container_id)
+        if live is not None:
+            METADATA_CACHE.inc("docker_events")
+            return {"name": live["name"], "image": live["image"], "status": live["status"]}
+        try:
+            metadata, result = self.cache.get(container_id, self.metadata_wait)
+        except Exception as e:
+            METADATA_CACHE.inc("error")
+            print(f"Metadata error: {e}", file=sys.stderr)
+            return self.cache.peek(container_id) or {}
+        METADATA_CACHE.inc(result)
+        return metadata
+    def enrich(self, event: dict) -> dict:
+        if event.get("monitor_type") == "lifecycle":
+            self._handle_lifecycle(event)
+            return None
+        if event.get("monitor_type") == "stats":
+            return self._enrich_stats(event)
+        pid = event.get("pid")
+        if pid is None:
+            return None
+        container_id = self.resolve_container_id(event.get("cgroup_id"), pid)
         if container_id is None:
+            ENRICHED_EVENTS.inc("no_container")
             return None
         event["container_id"] = container_id
-        now = time()
-        metadata = None
-        if container_id in self.cache:
-            cached_metadata, cached_time = self.cache[container_id]
-            if now - cached_time < self.pid_ttl:
-                metadata = cached_metadata
-            else:
-                try:
-                    metadata = get_container_metadata(container_id)
-                    self.cache[container_id] = (metadata, now)
-                except Exception as e:
-                    print(f"Metadata error: {e}", file=sys.stderr)
-                    metadata = cached_metadata
-        else:
-            try:
-                metadata = get_container_metadata(container_id)
-                self.cache[container_id] = (metadata, now)
-            except Exception as e:
-                print(f"Metadata error: {e}", file=sys.stderr)
-                metadata = {}
+        metadata = self._metadata_for(container_id)
         event["container_name"] = metadata.get("name") if metadata else None
         event["container_image"] = metadata.get("image") if metadata else None
         event["container_status"] = metadata.get("status") if metadata else None
+        scoring_start = perf_counter()
         if event.get("monitor_type") == "syscall":
             syscall = event.get("syscall_name", "unknown")
             event["categories"] = categorize_syscall(syscall)
             event["risk_score"] = get_risk_score(syscall, event.get("uid"))
             event["is_security_relevant"] = is_security_relevant_syscall(syscall)
+            if "syscall_args" in event and not event.get("argv"):
+                event["argv"] = f"{syscall}({', '.join(hex(a) for a in event['syscall_args'])})"
         elif event.get("monitor_type") == "network":
             saddr = event.get("saddr", 0)
             daddr = event.get("daddr", 0)
@@ -95,28 +233,20 @@ class EventEnricher:
             event["source_port"] = event.get("sport", 0)
             event["dest_port"] = event.get("dport", 0)
             event["event_type"] = "tcp_connect"
-            dest_port = event.get("dest_port", 0)
-            if dest_port in [22, 23, 3389]:
-                event["risk_score"] = 5
-                event["is_security_relevant"] = True
-            elif dest_port in [80, 443, 8080, 8443]:
-                event["risk_score"] = 1
-                event["is_security_relevant"] = False
-            else:
-                event["risk_score"] = 3
-                event["is_security_relevant"] = True
+            event["connection_count"] = int(event.get("connection_count", 1))
+            event["risk_score"], event["is_security_relevant"] = get_network_risk(event.get("dest_port", 0))
             event["categories"] = ["network"]
             source_container_id = container_id
             dest_ip = event.get("dest_ip")
             dest_container_id = self._get_container_id_from_ip(dest_ip)
-            if source_container_id and dest_container_id:
+            if source_container_id and dest_container_id and self.debug_logging:
                 print(f"EDGE DETECTED: {source_container_id} -> {dest_container_id} (dest_ip: {dest_ip})", file=sys.stderr)
             if source_container_id:
                 event["source_container_id"] = source_container_id
-                if source_container_id in self.cache:
-                    event["source_container_name"] = self.cache[source_container_id][0].get("name")
+                event["source_container_name"] = self._known_name(source_container_id)
             if dest_container_id:
                 event["dest_container_id"] = dest_container_id
-                if dest_container_id in self.cache:
-                    event["dest_container_name"] = self.cache[dest_container_id][0].get("name")
+                event["dest_container_name"] = self._known_name(dest_container_id)
+        SCORING_SECONDS.observe(perf_counter() - scoring_start, event.get("monitor_type", "unknown"))
+        ENRICHED_EVENTS.inc("enriched")
         return event
\ No newline at end of file
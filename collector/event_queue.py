@@ -0,0 +1,159 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import queue
+from collections import deque
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utilities import get_risk_score, is_security_relevant_syscall, get_network_risk
+LANE_CONTROL = 0
+LANE_HIGH = 1
+LANE_NORMAL = 2
+LANE_LOW = 3
+LANE_NAMES = ("control", "high", "normal", "low")
+CONTROL_TYPES = ("lifecycle", "stats")
+def classify_event(event: dict, high_risk: int = 5, low_risk: int = 2) -> int:
+    monitor_type = event.get("monitor_type")
+    if monitor_type in CONTROL_TYPES:
+        return LANE_CONTROL
+    if monitor_type == "network":
+        risk, relevant = get_network_risk(event.get("dport", 0))
+    else:
+        syscall = event.get("syscall_name", "unknown")
+        risk = get_risk_score(syscall, 0)
+        relevant = is_security_relevant_syscall(syscall)
+    if risk >= high_risk:
+        return LANE_HIGH
+    if relevant or risk > low_risk:
+        return LANE_NORMAL
+    return LANE_LOW
+class PriorityEventQueue:
+    def __init__(self, maxsize: int = 10000, high_risk: int = 5, low_risk: int = 2, warn_interval: float = 10, control_maxsize: int = 1024):
+        self.maxsize = max(int(maxsize), 1)
+        self.control_maxsize = max(int(control_maxsize), 1)
+        self.high_risk = high_risk
+        self.low_risk = low_risk
+        self.warn_interval = warn_interval
+        self.lanes = [deque() for _ in LANE_NAMES]
+        self.dropped = [0] * len(LANE_NAMES)
+        self.blocked = 0
+        self._seq = 0
+        self._size = 0
+        self._last_warn = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+    def qsize(self) -> int:
+        return self._size
+    def _shed(self, lane: int) -> bool:
+        for victim in range(len(self.lanes) - 1, lane, -1):
+            if self.lanes[victim]:
+                self.lanes[victim].popleft()
+                self._size -= 1
+                self._count_drop(victim)
+                return True
+        return False
+    def _count_drop(self, lane: int):
+        self.dropped[lane] += 1
+        now = time.monotonic()
+        if now - self._last_warn >= self.warn_interval:
+            self._last_warn = now
+            print(f"Collector queue full, shedding events (dropped: {self.drop_counts()})", file=sys.stderr, flush=True)
+    def _has_room(self, lane: int) -> bool:
+        if lane == LANE_CONTROL:
+            return True
+        return self._size - len(self.lanes[LANE_CONTROL]) < self.maxsize or self._shed(lane)
+    def _append_control(self, event: dict):
+        control = self.lanes[LANE_CONTROL]
+        if len(control) >= self.control_maxsize:
+            control.popleft()
+            self._size -= 1
+            self._count_drop(LANE_CONTROL)
+        self._append(LANE_CONTROL, event)
+    def _append(self, lane: int, event: dict):
+        self._seq += 1
+        self.lanes[lane].append((self._seq, event))
+        self._size += 1
+    def _pop(self) -> dict:
+        lane = min((l for l in self.lanes if l), key=lambda l: l[0][0])
+        _, event = lane.popleft()
+        self._size -= 1
+        return event
+    def put(self, event: dict, block: bool = True, timeout=None):
+        lane = classify_event(event, self.high_risk, self.low_risk)
+        with self._not_full:
+            if lane == LANE_CONTROL:
+                self._append_control(event)
+                self._not_empty.notify()
+                return True
+            if not self._has_room(lane):
+                if lane == LANE_LOW or not block:
+                    self._count_drop(lane)
+                    return False
+                self.blocked += 1
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while not self._has_room(lane):
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._count_drop(lane)
+                        return False
+                    self._not_full.wait(remaining)
+            self._append(lane, event)
+            self._not_empty.notify()
+            return True
+    def get(self, block: bool = True, timeout=None) -> dict:
+        with self._not_empty:
+            if not block:
+                if not self._size:
+                    raise queue.Empty
+            elif timeout is None:
+                while not self._size:
+                    self._not_empty.wait()
+            else:
+                deadline = time.monotonic() + timeout
+                while not self._size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise queue.Empty
+                    self._not_empty.wait(remaining)
+            event = self._pop()
+            self._not_full.notify()
+            return event
+    def lane_depths(self) -> dict:
+        return {name: len(lane) for name, lane in zip(LANE_NAMES, self.lanes)}
+    def drop_counts(self) -> dict:
+        return dict(zip(LANE_NAMES, self.dropped))
+class AsyncPriorityEventQueue(PriorityEventQueue):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._changed = asyncio.Condition()
+        self._closed = False
+    async def put(self, event: dict):
+        lane = classify_event(event, self.high_risk, self.low_risk)
+        async with self._changed:
+            if lane == LANE_CONTROL:
+                self._append_control(event)
+                self._changed.notify_all()
+                return True
+            if not self._has_room(lane):
+                if lane == LANE_LOW:
+                    self._count_drop(lane)
+                    return False
+                self.blocked += 1
+                await self._changed.wait_for(lambda: self._has_room(lane))
+            self._append(lane, event)
+            self._changed.notify_all()
+            return True
+    async def get(self):
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._size or self._closed)
+            if not self._size:
+                return None
+            event = self._pop()
+            self._changed.notify_all()
+            return event
+    async def close(self):
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
\ No newline at end of file
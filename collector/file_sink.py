@@ -0,0 +1,123 @@
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+class FileSink:
+    def __init__(self, path: str, buffer_bytes: int = 1 << 20, flush_interval: float = 1, rotate_bytes: int = 256 << 20, rotate_seconds: float = 3600, compression: str = "none"):
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.stem, self.extension = os.path.splitext(os.path.basename(path))
+        self.extension = self.extension or ".log"
+        self.buffer_bytes = max(int(buffer_bytes), 1)
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compression = str(compression or "none").lower()
+        if self.compression not in COMPRESSION_SUFFIXES:
+            print(f"Unknown file compression '{compression}', writing uncompressed", file=sys.stderr)
+            self.compression = "none"
+        if self.compression == "zstd" and zstandard is None:
+            print("zstandard not installed, file output falls back to gzip", file=sys.stderr)
+            self.compression = "gzip"
+        self.index_path = os.path.join(self.directory, f"{self.stem}.index.jsonl")
+        self.segments = 0
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        os.makedirs(self.directory, exist_ok=True)
+        self._open_segment()
+        self._flusher = threading.Thread(target=self._flush_loop, name="file-sink", daemon=True)
+        self._flusher.start()
+    def _open_segment(self):
+        self.segment_started = time.time()
+        while True:
+            self.segment_path = os.path.join(
+                self.directory,
+                f"{self.stem}-{time.strftime('%Y%m%dT%H%M%S', time.gmtime(self.segment_started))}-{self.segments:04d}{self.extension}{COMPRESSION_SUFFIXES[self.compression]}"
+            )
+            self.segments += 1
+            try:
+                self._raw = open(self.segment_path, "xb")
+                break
+            except FileExistsError:
+                continue
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor(level=3).stream_writer(self._raw)
+        else:
+            self._stream = self._raw
+        self.segment_events = 0
+        self.segment_bytes = 0
+        self.first_ts_ns = self.last_ts_ns = None
+        self.first_iso = self.last_iso = None
+    def write(self, event: dict):
+        line = (json.dumps(event) + "\n").encode()
+        ts_ns = event.get("timestamp_ns")
+        ts_iso = event.get("timestamp_iso")
+        with self._lock:
+            self._buffer += line
+            self.segment_events += 1
+            self.segment_bytes += len(line)
+            if ts_ns is not None:
+                self.first_ts_ns = ts_ns if self.first_ts_ns is None else min(self.first_ts_ns, ts_ns)
+                self.last_ts_ns = ts_ns if self.last_ts_ns is None else max(self.last_ts_ns, ts_ns)
+            if ts_iso is not None:
+                self.first_iso = ts_iso if self.first_iso is None else min(self.first_iso, ts_iso)
+                self.last_iso = ts_iso if self.last_iso is None else max(self.last_iso, ts_iso)
+            if len(self._buffer) >= self.buffer_bytes:
+                self._drain()
+            if self.segment_bytes >= self.rotate_bytes:
+                self._rotate()
+    def _drain(self):
+        if self._buffer:
+            self._stream.write(bytes(self._buffer))
+            self._buffer.clear()
+    def _close_segment(self):
+        self._drain()
+        self._stream.close()
+        if not self._raw.closed:
+            self._raw.close()
+        if not self.segment_events:
+            os.remove(self.segment_path)
+            return
+        entry = {
+            "segment": os.path.basename(self.segment_path),
+            "compression": self.compression,
+            "events": self.segment_events,
+            "bytes": self.segment_bytes,
+            "stored_bytes": os.path.getsize(self.segment_path),
+            "first_timestamp_ns": self.first_ts_ns,
+            "last_timestamp_ns": self.last_ts_ns,
+            "first_timestamp_iso": self.first_iso,
+            "last_timestamp_iso": self.last_iso,
+            "opened_at": self.segment_started,
+            "closed_at": time.time(),
+        }
+        with open(self.index_path, "a") as index:
+            index.write(json.dumps(entry) + "\n")
+    def _rotate(self):
+        self._close_segment()
+        self._open_segment()
+    def flush(self):
+        with self._lock:
+            self._drain()
+            self._stream.flush()
+            if self.rotate_seconds and self.segment_events and time.time() - self.segment_started >= self.rotate_seconds:
+                self._rotate()
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"File output flush error: {e}", file=sys.stderr)
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            self._close_segment()
\ No newline at end of file
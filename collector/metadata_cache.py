@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+class MetadataCache:
+    def __init__(self, fetch: Callable, max_entries: int = 4096, ttl: float = 600, workers: int = 4, wait_timeout: float = 10):
+        self.fetch = fetch
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.entries = OrderedDict()
+        self.evictions = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(int(workers), 1), thread_name_prefix="metadata")
+    def __len__(self):
+        return len(self.entries)
+    def __contains__(self, container_id):
+        return container_id in self.entries
+    def peek(self, container_id) -> Optional[dict]:
+        entry = self.entries.get(container_id)
+        return entry[0] if entry is not None else None
+    def stale(self, container_id) -> bool:
+        entry = self.entries.get(container_id)
+        return entry is None or time.monotonic() - entry[1] >= self.ttl
+    def put(self, container_id, metadata: dict):
+        with self._lock:
+            self._store(container_id, metadata)
+    def _store(self, container_id, metadata: dict):
+        self.entries[container_id] = (metadata, time.monotonic())
+        self.entries.move_to_end(container_id)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    def claim(self, container_id):
+        with self._lock:
+            future = self._inflight.get(container_id)
+            if future is not None:
+                return future, False
+            future = self._inflight[container_id] = Future()
+            return future, True
+    def finish(self, container_id, metadata: dict = None, error: Exception = None):
+        with self._lock:
+            future = self._inflight.pop(container_id, None)
+            if error is None:
+                self._store(container_id, metadata)
+        if future is None:
+            return
+        if error is None:
+            future.set_result(metadata)
+        else:
+            future.set_exception(error)
+    def _load(self, container_id):
+        try:
+            metadata = self.fetch(container_id)
+        except Exception as e:
+            self.finish(container_id, error=e)
+        else:
+            self.finish(container_id, metadata)
+    def refresh(self, container_id) -> Future:
+        future, owner = self.claim(container_id)
+        if owner:
+            self._pool.submit(self._load, container_id)
+        return future
+    def get(self, container_id, block: bool = True):
+        with self._lock:
+            entry = self.entries.get(container_id)
+            if entry is not None:
+                self.entries.move_to_end(container_id)
+        if entry is not None:
+            if time.monotonic() - entry[1] < self.ttl:
+                return entry[0], "hit"
+            self.refresh(container_id)
+            return entry[0], "stale"
+        if not block:
+            self.refresh(container_id)
+            return None, "pending"
+        future, owner = self.claim(container_id)
+        if owner:
+            self._pool.submit(self._load, container_id)
+        return future.result(self.wait_timeout), "miss" if owner else "shared"
+    def discard(self, container_ids):
+        with self._lock:
+            for container_id in container_ids:
+                self.entries.pop(container_id, None)
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
\ No newline at end of file
@@ -0,0 +1,148 @@
+import bisect
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in pairs) + "}"
+class Counter:
+    kind = "counter"
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self._lock = threading.Lock()
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self.values[labelvalues] = self.values.get(labelvalues, 0) + amount
+    def render(self):
+        for labelvalues, value in list(self.values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {value}"
+class Histogram:
+    kind = "histogram"
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self._lock = threading.Lock()
+    def observe(self, value: float, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(labelvalues)
+            if series is None:
+                series = self.series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    @contextmanager
+    def time(self, *labelvalues):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+    def render(self):
+        for labelvalues, (counts, total, count) in list(self.series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, [('le', le)])} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labelvalues)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labelvalues)} {count}"
+class Gauge:
+    kind = "gauge"
+    def __init__(self, name: str, help: str, labelnames=(), callback=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+    def render(self):
+        if self.callback is None:
+            return
+        try:
+            value = self.callback()
+        except Exception as e:
+            print(f"Metrics gauge {self.name} failed: {e}", file=sys.stderr)
+            return
+        if isinstance(value, dict):
+            for labelvalues, v in value.items():
+                if not isinstance(labelvalues, tuple):
+                    labelvalues = (labelvalues,)
+                yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {v}"
+        else:
+            yield f"{self.name} {value}"
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+    def _register(self, metric):
+        return self.metrics.setdefault(metric.name, metric)
+    def counter(self, name, help, labelnames=()):
+        return self._register(Counter(name, help, labelnames))
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help, labelnames, buckets))
+    def gauge(self, name, help, labelnames=(), callback=None):
+        metric = Gauge(name, help, labelnames, callback)
+        self.metrics[name] = metric
+        return metric
+    def render(self) -> str:
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+REGISTRY = MetricsRegistry()
+MONITOR_RECORDS = REGISTRY.counter("collector_monitor_records_total", "Records read from the monitor host", ("format",))
+MONITOR_READ_SECONDS = REGISTRY.histogram("collector_monitor_read_seconds", "Time to read and decode one monitor frame or line", ("format",))
+JSON_DECODE_SECONDS = REGISTRY.histogram("collector_json_decode_seconds", "Time spent in json.loads per monitor line")
+CONTAINER_RESOLVE = REGISTRY.counter("collector_container_resolve_total", "pid to container resolutions by source", ("source",))
+CONTAINER_RESOLVE_SECONDS = REGISTRY.histogram("collector_container_resolve_seconds", "pid to container resolution latency", ("source",))
+METADATA_CACHE = REGISTRY.counter("collector_metadata_cache_total", "Container metadata cache lookups", ("result",))
+METADATA_FETCH_SECONDS = REGISTRY.histogram("collector_metadata_fetch_seconds", "Docker metadata fetch latency", ("client",))
+IP_CACHE = REGISTRY.counter("collector_ip_cache_total", "Container IP map lookups", ("result",))
+SCORING_SECONDS = REGISTRY.histogram("collector_scoring_seconds", "Categorisation and risk scoring latency", ("monitor_type",))
+OUTPUT_SEND_SECONDS = REGISTRY.histogram("collector_output_send_seconds", "Output send latency", ("mode",))
+OUTPUT_EVENTS = REGISTRY.counter("collector_output_events_total", "Events handed to the output stage", ("mode", "result"))
+OUTPUT_FLUSH_SECONDS = REGISTRY.histogram("collector_output_flush_seconds", "Batch flush latency including retries", ("mode", "result"))
+OUTPUT_BATCH_EVENTS = REGISTRY.histogram("collector_output_batch_events", "Events per flushed batch", ("mode",), buckets=(1, 10, 25, 50, 100, 250, 500, 1000))
+OUTPUT_RETRIES = REGISTRY.counter("collector_output_retries_total", "Output flush attempts that were retried", ("mode",))
+ENRICHED_EVENTS = REGISTRY.counter("collector_enriched_events_total", "Events leaving enrichment", ("result",))
+def register_queue_gauges(events, pending):
+    REGISTRY.gauge("collector_queue_depth", "Events waiting in the intake queue by lane", ("lane",), events.lane_depths)
+    REGISTRY.gauge("collector_queue_dropped", "Events shed from the intake queue by lane", ("lane",), events.drop_counts)
+    REGISTRY.gauge("collector_queue_blocked_puts", "Intake puts that had to wait for room", callback=lambda: events.blocked)
+    REGISTRY.gauge("collector_pipeline_pending", "Events queued in enrichment shards and the output stage", callback=pending)
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def log_message(self, format, *args):
+        pass
+def start_metrics_server(host: str = "127.0.0.1", port: int = 9464):
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+    except OSError as e:
+        print(f"Metrics endpoint unavailable on {host}:{port}: {e}", file=sys.stderr, flush=True)
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    print(f"Metrics endpoint listening on http://{host}:{port}/metrics", file=sys.stderr, flush=True)
+    return server
\ No newline at end of file
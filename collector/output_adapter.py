@@ -1,26 +1,143 @@
+import asyncio
+import gzip
 import json
+import os
+import random
+import socket
 import sys
+import threading
+import time
 import requests
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utilities import config as app_config
+from metrics import REGISTRY, OUTPUT_SEND_SECONDS, OUTPUT_EVENTS, OUTPUT_FLUSH_SECONDS, OUTPUT_BATCH_EVENTS, OUTPUT_RETRIES
+from spool import SegmentSpool
+from file_sink import FileSink
+from db_sink import DatabaseSink
+from stream_sink import StreamSink
 from datetime import datetime
+def output_config() -> dict:
+    return {
+        "file_path": app_config.collector_log_file,
+        "file_buffer_bytes": int(app_config.collector_file_buffer_kb) << 10,
+        "file_flush_interval": app_config.collector_file_flush_interval,
+        "file_rotate_bytes": int(app_config.collector_file_rotate_mb) << 20,
+        "file_rotate_seconds": app_config.collector_file_rotate_seconds,
+        "file_compression": app_config.collector_file_compression,
+        "db_url": app_config.collector_database_url,
+        "db_batch_size": app_config.collector_database_batch_size,
+        "db_flush_interval": app_config.collector_database_flush_interval,
+        "db_notify": app_config.collector_database_notify,
+        "stream_endpoint": app_config.collector_stream_endpoint,
+        "stream_node": app_config.collector_stream_node,
+        "stream_max_events": app_config.collector_stream_max_events,
+        "stream_max_latency": app_config.collector_stream_max_latency_ms / 1000,
+        "stream_max_unacked": app_config.collector_stream_max_unacked,
+        "api_endpoint": app_config.collector_api_endpoint,
+        "stats_endpoint": app_config.collector_stats_endpoint,
+        "batch_endpoint": app_config.collector_batch_endpoint,
+        "batch_max_events": app_config.collector_batch_max_events,
+        "batch_max_latency": app_config.collector_batch_max_latency_ms / 1000,
+        "batch_gzip": app_config.collector_batch_gzip,
+        "batch_max_retries": app_config.collector_batch_max_retries,
+        "batch_max_buffered": app_config.collector_batch_max_buffered,
+        "spool_dir": app_config.collector_spool_dir,
+        "spool_segment_bytes": int(app_config.collector_spool_segment_mb) << 20,
+        "spool_max_bytes": int(app_config.collector_spool_max_mb) << 20,
+        "spool_mmap": app_config.collector_spool_mmap,
+        "debug_logging": app_config.collector_debug_logging
+    }
 class OutputAdapter:
     def __init__(self, mode="stdout", config=None):
         self.mode = mode
         self.config = config or {}
+        self.debug_logging = self.config.get("debug_logging", False)
         if mode == "file":
-            file_path = self.config.get("file_path", "events.log")
-            self.log_file = open(file_path, "a")
-        if mode == "http":
+            self.sink = FileSink(
+                self.config.get("file_path") or "events.log",
+                buffer_bytes=self.config.get("file_buffer_bytes", 1 << 20),
+                flush_interval=self.config.get("file_flush_interval", 1),
+                rotate_bytes=self.config.get("file_rotate_bytes", 256 << 20),
+                rotate_seconds=self.config.get("file_rotate_seconds", 3600),
+                compression=self.config.get("file_compression", "none")
+            )
+            print(f"File mode: Writing {self.sink.compression} segments to {self.sink.directory}", file=sys.stderr)
+        if mode in ("http", "http_batch", "db", "stream"):
             self.api_endpoint = self.config.get("api_endpoint", "http://localhost:8000/api/events")
+            self.stats_endpoint = self.config.get("stats_endpoint", self.api_endpoint.replace("/events", "/stats/drops"))
             self.session = requests.Session()
             self.session.headers.update({"Content-Type": "application/json"})
+        if mode == "db":
+            if not self.config.get("db_url"):
+                raise ValueError("db output mode needs collector.database.url")
+            self.notify_endpoint = self.api_endpoint.rstrip("/") + "/notify" if self.config.get("db_notify", True) else None
+            self.sink = DatabaseSink(
+                self.config["db_url"],
+                batch_size=self.config.get("db_batch_size", 1000),
+                flush_interval=self.config.get("db_flush_interval", 1),
+                on_commit=self._on_db_commit
+            )
+            REGISTRY.gauge("collector_db_failed_rows", "Rows the db output mode failed to write", callback=lambda: self.sink.failed)
+            print(f"DB mode: Writing events to the {self.sink.dialect} events table", file=sys.stderr)
+        if mode == "stream":
+            stream_endpoint = self.config.get("stream_endpoint") or self.api_endpoint.replace("http", "ws", 1).rstrip("/") + "/stream"
+            self.sink = StreamSink(
+                stream_endpoint,
+                self.config.get("stream_node") or socket.gethostname(),
+                max_events=self.config.get("stream_max_events", 100),
+                max_latency=self.config.get("stream_max_latency", 0.05),
+                max_unacked=self.config.get("stream_max_unacked", 10000),
+                on_ack=lambda count: OUTPUT_EVENTS.inc(self.mode, "ok", amount=count)
+            )
+            REGISTRY.gauge("collector_stream_unacked_events", "Events streamed or buffered but not yet acknowledged by the backend", callback=self.sink.pending)
+            REGISTRY.gauge("collector_stream_dropped", "Events dropped because too many were unacknowledged", callback=lambda: self.sink.dropped)
+            print(f"Stream mode: Streaming events to {stream_endpoint}", file=sys.stderr)
+        if mode == "http":
             print(f"HTTP mode: Sending events to {self.api_endpoint}", file=sys.stderr)
+        if mode == "http_batch":
+            self.batch_endpoint = self.config.get("batch_endpoint") or self.api_endpoint.rstrip("/") + "/batch"
+            self.batch_max_events = max(int(self.config.get("batch_max_events", 100)), 1)
+            self.batch_max_latency = self.config.get("batch_max_latency", 0.25)
+            self.batch_gzip = self.config.get("batch_gzip", True)
+            self.batch_max_retries = self.config.get("batch_max_retries", 5)
+            self.batch_max_buffered = self.config.get("batch_max_buffered", 20000)
+            self.batch_retry_delay = self.config.get("batch_retry_delay", 0.2)
+            self.batch_max_retry_delay = self.config.get("batch_max_retry_delay", 10)
+            self.batch = []
+            self._batch_deadline = 0
+            self._batch_cond = threading.Condition()
+            self._closing = False
+            self.spool = None
+            if self.config.get("spool_dir"):
+                self.spool = SegmentSpool(
+                    self.config["spool_dir"],
+                    segment_bytes=self.config.get("spool_segment_bytes", 64 << 20),
+                    max_bytes=self.config.get("spool_max_bytes", 1 << 30),
+                    use_mmap=self.config.get("spool_mmap", False)
+                )
+                REGISTRY.gauge("collector_spool_bytes", "Bytes held in the output spool", callback=self.spool.size_bytes)
+                REGISTRY.gauge("collector_spool_evicted_bytes", "Unsent spool bytes evicted by the disk cap", callback=lambda: self.spool.evicted_bytes)
+                print(f"Spooling output through {self.config['spool_dir']}", file=sys.stderr)
+            self._flusher = threading.Thread(target=self._drain_loop if self.spool else self._flush_loop, name="output-batch", daemon=True)
+            self._flusher.start()
+            print(f"HTTP batch mode: Sending up to {self.batch_max_events} events per request to {self.batch_endpoint}", file=sys.stderr)
     def send(self, event: dict):
+        start = time.perf_counter()
+        self._send(event)
+        OUTPUT_SEND_SECONDS.observe(time.perf_counter() - start, self.mode)
+    def _send(self, event: dict):
         if self.mode == "stdout":
             print(json.dumps(event, ensure_ascii=False), flush=True)
         elif self.mode == "file":
-            self.log_file.write(json.dumps(event) + "\n")
-            self.log_file.flush()
+            self.sink.write(event)
         elif self.mode == "http":
+            if event.get("monitor_type") == "stats":
+                self._send_stats(event)
+                return
             try:
                 response = self.session.post(
                     self.api_endpoint,
@@ -28,19 +145,190 @@ class OutputAdapter:
                     timeout=5
                 )
                 if response.status_code == 201:
-                    result = response.json()
-                    event_id = result.get("data", {}).get("event_id")
-                    print(f"✓ Event sent (ID: {event_id})", file=sys.stderr)
+                    OUTPUT_EVENTS.inc(self.mode, "ok")
+                    if self.debug_logging:
+                        event_id = response.json().get("data", {}).get("event_id")
+                        print(f"✓ Event sent (ID: {event_id})", file=sys.stderr)
                 else:
+                    OUTPUT_EVENTS.inc(self.mode, "error")
                     print(f"✗ Failed to send event: {response.status_code} - {response.text}", file=sys.stderr)
             except requests.exceptions.Timeout:
+                OUTPUT_EVENTS.inc(self.mode, "error")
                 print(f"✗ Timeout sending event to backend", file=sys.stderr)
             except requests.exceptions.ConnectionError:
+                OUTPUT_EVENTS.inc(self.mode, "error")
                 print(f"✗ Connection error: Backend not reachable at {self.api_endpoint}", file=sys.stderr)
             except Exception as e:
+                OUTPUT_EVENTS.inc(self.mode, "error")
                 print(f"✗ HTTP POST error: {e}", file=sys.stderr)
+        elif self.mode == "stream":
+            if event.get("monitor_type") == "stats":
+                self._send_stats(event)
+            elif not self.sink.write(event):
+                OUTPUT_EVENTS.inc(self.mode, "dropped")
+        elif self.mode == "db":
+            if event.get("monitor_type") == "stats":
+                self.sink.write_drop_stat(event)
+            else:
+                self.sink.write(event)
+        elif self.mode == "http_batch":
+            if event.get("monitor_type") == "stats":
+                self._send_stats(event)
+                return
+            if self.spool is not None:
+                self.spool.append(json.dumps(event).encode())
+                return
+            with self._batch_cond:
+                if len(self.batch) >= self.batch_max_buffered:
+                    OUTPUT_EVENTS.inc(self.mode, "dropped")
+                    return
+                if not self.batch:
+                    self._batch_deadline = time.monotonic() + self.batch_max_latency
+                    self._batch_cond.notify()
+                self.batch.append(event)
+                if len(self.batch) == self.batch_max_events:
+                    self._batch_cond.notify()
+    def _flush_loop(self):
+        while True:
+            with self._batch_cond:
+                while not self._closing and (not self.batch or (len(self.batch) < self.batch_max_events and time.monotonic() < self._batch_deadline)):
+                    self._batch_cond.wait(max(self._batch_deadline - time.monotonic(), 0) if self.batch else None)
+                if not self.batch:
+                    return
+                batch = self.batch[:self.batch_max_events]
+                del self.batch[:self.batch_max_events]
+                self._batch_deadline = time.monotonic()
+            if self._flush([json.dumps(event).encode() for event in batch]) == "error":
+                print(f"✗ Dropped batch of {len(batch)} events", file=sys.stderr)
+    def _drain_loop(self):
+        delay = self.batch_retry_delay
+        while not self._closing:
+            records, position = self.spool.read_batch(self.batch_max_events)
+            if not records:
+                with self._batch_cond:
+                    if not self._closing:
+                        self._batch_cond.wait(self.batch_max_latency)
+                continue
+            if self._flush(records) == "error":
+                with self._batch_cond:
+                    if not self._closing:
+                        self._batch_cond.wait(delay)
+                delay = min(delay * 2, self.batch_max_retry_delay)
+                continue
+            delay = self.batch_retry_delay
+            self.spool.commit(position)
+    def _flush(self, records: list) -> str:
+        start = time.perf_counter()
+        result = self._post_batch(records)
+        elapsed = time.perf_counter() - start
+        OUTPUT_FLUSH_SECONDS.observe(elapsed, self.mode, result)
+        OUTPUT_BATCH_EVENTS.observe(len(records), self.mode)
+        OUTPUT_EVENTS.inc(self.mode, result, amount=len(records))
+        if self.debug_logging:
+            print(f"{'✓' if result == 'ok' else '✗'} Batch of {len(records)} events flushed in {elapsed * 1000:.1f} ms ({result})", file=sys.stderr)
+        return result
+    def _post_batch(self, records: list) -> str:
+        body = b"[" + b",".join(records) + b"]"
+        headers = {"Content-Type": "application/json"}
+        if self.batch_gzip:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        error = None
+        for attempt in range(self.batch_max_retries + 1):
+            if attempt:
+                OUTPUT_RETRIES.inc(self.mode)
+                time.sleep(random.uniform(0, min(self.batch_max_retry_delay, self.batch_retry_delay * 2 ** attempt)))
+            try:
+                response = self.session.post(self.batch_endpoint, data=body, headers=headers, timeout=10)
+            except requests.exceptions.RequestException as e:
+                error = e
+                continue
+            if response.status_code in (200, 201):
+                return "ok"
+            if response.status_code == 413 and len(records) > 1:
+                half = len(records) // 2
+                self.batch_max_events = max(half, 1)
+                print(f"Backend rejected a batch of {len(records)} events, lowering batch size to {self.batch_max_events}", file=sys.stderr)
+                results = {self._post_batch(records[:half]), self._post_batch(records[half:])}
+                return "error" if "error" in results else "rejected" if "rejected" in results else "ok"
+            error = f"{response.status_code} - {response.text[:200]}"
+            if response.status_code < 500 and response.status_code != 429:
+                print(f"✗ Backend rejected a batch of {len(records)} events: {error}", file=sys.stderr)
+                return "rejected"
+        print(f"✗ Batch of {len(records)} events failed after {attempt + 1} attempts: {error}", file=sys.stderr)
+        return "error"
+    def _on_db_commit(self, count: int):
+        OUTPUT_EVENTS.inc(self.mode, "ok", amount=count)
+        if self.notify_endpoint is None:
+            return
+        try:
+            self.session.post(self.notify_endpoint, json={"count": count}, timeout=1)
+        except requests.exceptions.RequestException as e:
+            if self.debug_logging:
+                print(f"Live feed notify failed: {e}", file=sys.stderr)
+    def _send_stats(self, event: dict):
+        try:
+            response = self.session.post(self.stats_endpoint, json=event, timeout=5)
+            if response.status_code != 201:
+                print(f"✗ Failed to send drop stats: {response.status_code} - {response.text}", file=sys.stderr)
+        except requests.exceptions.RequestException as e:
+            print(f"✗ Drop stats POST error: {e}", file=sys.stderr)
     def close(self):
-        if self.mode == "file" and hasattr(self, 'log_file'):
-            self.log_file.close()
-        if self.mode == "http" and hasattr(self, 'session'):
-            self.session.close()
\ No newline at end of file
+        if self.mode in ("file", "db", "stream") and hasattr(self, 'sink'):
+            self.sink.close()
+        if self.mode == "http_batch":
+            with self._batch_cond:
+                self._closing = True
+                self._batch_cond.notify()
+            self._flusher.join(timeout=30)
+            if self.spool is not None:
+                self.spool.close()
+        if self.mode in ("http", "http_batch", "db", "stream") and hasattr(self, 'session'):
+            self.session.close()
+class AsyncOutputAdapter:
+    def __init__(self, adapter: OutputAdapter):
+        self.adapter = adapter
+        self.session = None
+        if adapter.mode == "http" and aiohttp is None:
+            print("aiohttp not installed, async HTTP output falls back to a worker thread", file=sys.stderr)
+    async def send(self, event: dict):
+        start = time.perf_counter()
+        await self._send(event)
+        OUTPUT_SEND_SECONDS.observe(time.perf_counter() - start, self.adapter.mode)
+    async def _send(self, event: dict):
+        if self.adapter.mode != "http":
+            if event.get("monitor_type") == "stats" and self.adapter.mode in ("http_batch", "stream"):
+                await asyncio.to_thread(self.adapter.send, event)
+            else:
+                self.adapter.send(event)
+            return
+        if aiohttp is None:
+            await asyncio.to_thread(self.adapter.send, event)
+            return
+        if self.session is None:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+        is_stats = event.get("monitor_type") == "stats"
+        endpoint = self.adapter.stats_endpoint if is_stats else self.adapter.api_endpoint
+        try:
+            async with self.session.post(endpoint, json=event) as response:
+                if response.status != 201:
+                    OUTPUT_EVENTS.inc(self.adapter.mode, "error")
+                    print(f"✗ Failed to send event: {response.status} - {await response.text()}", file=sys.stderr)
+                    return
+                OUTPUT_EVENTS.inc(self.adapter.mode, "ok")
+                if not is_stats and self.adapter.debug_logging:
+                    result = await response.json()
+                    print(f"✓ Event sent (ID: {result.get('data', {}).get('event_id')})", file=sys.stderr)
+        except asyncio.TimeoutError:
+            OUTPUT_EVENTS.inc(self.adapter.mode, "error")
+            print(f"✗ Timeout sending event to backend", file=sys.stderr)
+        except aiohttp.ClientConnectionError:
+            OUTPUT_EVENTS.inc(self.adapter.mode, "error")
+            print(f"✗ Connection error: Backend not reachable at {endpoint}", file=sys.stderr)
+        except Exception as e:
+            OUTPUT_EVENTS.inc(self.adapter.mode, "error")
+            print(f"✗ HTTP POST error: {e}", file=sys.stderr)
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+        await asyncio.to_thread(self.adapter.close)
\ No newline at end of file
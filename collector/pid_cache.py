@@ -0,0 +1,55 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utilities import get_process_start_time
+MISS = object()
+class PidCache:
+    def __init__(self, max_entries: int = 65536, revalidate_interval: float = 30):
+        self.max_entries = max(int(max_entries), 1)
+        self.revalidate_interval = revalidate_interval
+        self.entries = OrderedDict()
+        self.evictions = 0
+        self._lock = threading.Lock()
+    def __len__(self):
+        return len(self.entries)
+    def get(self, pid):
+        now = time.monotonic()
+        with self._lock:
+            entry = self.entries.get(pid)
+            if entry is None:
+                return MISS
+            self.entries.move_to_end(pid)
+            start_time, container_id, checked_at = entry
+            if now - checked_at < self.revalidate_interval:
+                return container_id
+        current = get_process_start_time(pid)
+        with self._lock:
+            if current is None or (start_time is not None and current != start_time):
+                self.entries.pop(pid, None)
+                return MISS
+            if pid in self.entries:
+                self.entries[pid] = (current, container_id, now)
+        return container_id
+    def put(self, pid, start_time, container_id):
+        with self._lock:
+            self.entries[pid] = (start_time, container_id, time.monotonic())
+            self.entries.move_to_end(pid)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+    def container_of(self, pid):
+        entry = self.entries.get(pid)
+        return entry[1] if entry is not None else None
+    def discard(self, pid):
+        with self._lock:
+            self.entries.pop(pid, None)
+    def drop_containers(self, container_ids):
+        with self._lock:
+            for pid in [pid for pid, entry in self.entries.items() if entry[1] in container_ids]:
+                del self.entries[pid]
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
\ No newline at end of file
@@ -0,0 +1,66 @@
+import sys
+import threading
+import queue
+_STOP = object()
+def shard_key(event: dict, container_of=None):
+    if event.get("cgroup_id"):
+        return event["cgroup_id"]
+    if container_of is not None:
+        container_id = container_of(event)
+        if container_id is not None:
+            return container_id
+    return event.get("tgid") or event.get("pid") or 0
+class EnrichmentPipeline:
+    def __init__(self, enricher, output, workers: int = 4, queue_size: int = 1024):
+        self.enricher = enricher
+        self.output = output
+        self.workers = max(int(workers), 1)
+        self.shards = [queue.Queue(maxsize=queue_size) for _ in range(self.workers)]
+        self.output_queue = queue.Queue(maxsize=queue_size)
+        self.sent = 0
+        self.failed = 0
+        self._threads = []
+        self._output_thread = None
+    def start(self):
+        for index, shard in enumerate(self.shards):
+            thread = threading.Thread(target=self._enrich_loop, args=(shard,), name=f"enrich-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._output_thread = threading.Thread(target=self._output_loop, name="output", daemon=True)
+        self._output_thread.start()
+        return self
+    def submit(self, event: dict, timeout=None):
+        self.shards[hash(shard_key(event, self.enricher.shard_container)) % self.workers].put(event, timeout=timeout)
+    def _enrich_loop(self, shard):
+        while True:
+            event = shard.get()
+            if event is _STOP:
+                return
+            try:
+                enriched = self.enricher.enrich(event)
+            except Exception as e:
+                print(f"Enrichment error: {e}", file=sys.stderr)
+                continue
+            if enriched is not None:
+                self.output_queue.put(enriched)
+    def _output_loop(self):
+        while True:
+            event = self.output_queue.get()
+            if event is _STOP:
+                return
+            try:
+                self.output.send(event)
+                self.sent += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Output error: {e}", file=sys.stderr)
+    def pending(self) -> int:
+        return sum(shard.qsize() for shard in self.shards) + self.output_queue.qsize()
+    def stop(self, timeout=None):
+        for shard in self.shards:
+            shard.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+        self.output_queue.put(_STOP)
+        if self._output_thread is not None:
+            self._output_thread.join(timeout)
\ No newline at end of file
@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utilities.record_codec import read_frames
+class TeeReader:
+    def __init__(self, stream, sink):
+        self.stream = stream
+        self.sink = sink
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        if data:
+            self.sink.write(data)
+        return data
+def open_recording(path: str, binary: bool):
+    if not path:
+        return None
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    print(f"Recording monitor output to {path}", file=sys.stderr, flush=True)
+    return open(path, "ab" if binary else "a", buffering=1 << 16)
+def read_recording(path: str):
+    with open(path, "rb") as f:
+        first = f.peek(1)[:1]
+        if first == b"{":
+            for line in f:
+                line = line.strip()
+                if not line.startswith(b"{"):
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"[replay] JSON error: {e}", file=sys.stderr)
+        else:
+            yield from read_frames(f)
+class ReplayContainers:
+    def __init__(self):
+        self.ids = {}
+        self.containers = {}
+        self._lock = threading.Lock()
+    def container_for(self, key: str) -> str:
+        with self._lock:
+            container_id = self.ids.get(key)
+            if container_id is None:
+                container_id = hashlib.sha256(f"replay:{key}".encode()).hexdigest()[:12]
+                self.ids[key] = container_id
+                self.containers[container_id] = {"name": f"replay-{key}", "image": "replay", "status": "running"}
+            return container_id
+    def get(self, container_id: str):
+        return self.containers.get(container_id[:12])
+class ReplaySource:
+    def __init__(self, path: str, event_queue, speed: float = 0, loops: int = 1):
+        self.path = path
+        self.event_queue = event_queue
+        self.speed = float(speed or 0)
+        self.loops = max(int(loops or 1), 1)
+        self.returncode = None
+        self.replayed = 0
+        self._stop = threading.Event()
+        self._thread = None
+    def _delay(self, ts_ns, first_ts_ns, started) -> float:
+        if self.speed <= 0 or ts_ns is None or first_ts_ns is None:
+            return 0
+        return started + (ts_ns - first_ts_ns) / 1e9 / self.speed - time.monotonic()
+    def _pace(self, ts_ns, first_ts_ns, started):
+        delay = self._delay(ts_ns, first_ts_ns, started)
+        if delay > 0:
+            self._stop.wait(delay)
+    def _report(self, started_all):
+        elapsed = time.monotonic() - started_all
+        rate = self.replayed / elapsed if elapsed > 0 else 0
+        print(f"[replay] {self.replayed} events from {self.path} in {elapsed:.2f}s ({rate:.0f} events/s)", file=sys.stderr, flush=True)
+    async def run_async(self):
+        started_all = time.monotonic()
+        for _ in range(self.loops):
+            first_ts_ns = None
+            started = time.monotonic()
+            for event in read_recording(self.path):
+                ts_ns = event.get("timestamp_ns")
+                if first_ts_ns is None:
+                    first_ts_ns = ts_ns
+                delay = self._delay(ts_ns, first_ts_ns, started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self.event_queue.put(event)
+                self.replayed += 1
+        self._report(started_all)
+    def _run(self):
+        started_all = time.monotonic()
+        try:
+            for _ in range(self.loops):
+                first_ts_ns = None
+                started = time.monotonic()
+                for event in read_recording(self.path):
+                    if self._stop.is_set():
+                        return
+                    ts_ns = event.get("timestamp_ns")
+                    if first_ts_ns is None:
+                        first_ts_ns = ts_ns
+                    self._pace(ts_ns, first_ts_ns, started)
+                    self.event_queue.put(event)
+                    self.replayed += 1
+            self._report(started_all)
+        except Exception as e:
+            print(f"[replay] Error: {e}", file=sys.stderr, flush=True)
+            self.returncode = 1
+        finally:
+            if self.returncode is None:
+                self.returncode = 0
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+    def poll(self):
+        return self.returncode
+    def terminate(self):
+        self._stop.set()
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.returncode
\ No newline at end of file
@@ -0,0 +1,162 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+RECORD_HEADER = struct.Struct("=II")
+SEGMENT_SUFFIX = ".seg"
+CURSOR_FILE = "cursor.json"
+class SegmentSpool:
+    def __init__(self, directory: str, segment_bytes: int = 64 << 20, max_bytes: int = 1 << 30, use_mmap: bool = False):
+        self.directory = directory
+        self.segment_bytes = max(int(segment_bytes), RECORD_HEADER.size)
+        self.max_bytes = max(int(max_bytes), self.segment_bytes)
+        self.use_mmap = use_mmap
+        self.evicted_segments = 0
+        self.evicted_bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.segments = sorted(int(name[:-len(SEGMENT_SUFFIX)]) for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX))
+        if not self.segments:
+            self.segments = [1]
+        self.sizes = {}
+        for segment in self.segments[:-1]:
+            self.sizes[segment] = os.path.getsize(self._path(segment))
+        self.sizes[self.segments[-1]] = self._recover_tail(self.segments[-1])
+        self.cursor = self._load_cursor()
+        self._writer = open(self._path(self.segments[-1]), "ab")
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{segment:020d}{SEGMENT_SUFFIX}")
+    def _recover_tail(self, segment: int) -> int:
+        path = self._path(segment)
+        if not os.path.exists(path):
+            open(path, "wb").close()
+            return 0
+        with open(path, "rb") as f:
+            _, offset, _ = self._scan(f, 0, None)
+            size = f.seek(0, os.SEEK_END)
+        if offset < size:
+            print(f"Spool: truncating {size - offset} torn bytes from {path}", file=sys.stderr)
+            os.truncate(path, offset)
+        return offset
+    def _load_cursor(self):
+        try:
+            with open(os.path.join(self.directory, CURSOR_FILE), "r") as f:
+                data = json.load(f)
+            cursor = (int(data["segment"]), int(data["offset"]))
+        except (OSError, ValueError, KeyError):
+            return (self.segments[0], 0)
+        if cursor[0] < self.segments[0]:
+            return (self.segments[0], 0)
+        return cursor
+    def _save_cursor(self):
+        path = os.path.join(self.directory, CURSOR_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"segment": self.cursor[0], "offset": self.cursor[1]}, f)
+        os.replace(path + ".tmp", path)
+    def size_bytes(self) -> int:
+        return sum(self.sizes.values())
+    def append(self, payload: bytes):
+        with self._lock:
+            self._writer.write(RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+            self._writer.write(payload)
+            active = self.segments[-1]
+            self.sizes[active] += RECORD_HEADER.size + len(payload)
+            if self.sizes[active] >= self.segment_bytes:
+                self._rotate()
+            if self.size_bytes() > self.max_bytes:
+                self._evict()
+    def _rotate(self):
+        self._writer.close()
+        segment = self.segments[-1] + 1
+        self.segments.append(segment)
+        self.sizes[segment] = 0
+        self._writer = open(self._path(segment), "ab")
+    def _evict(self):
+        while self.size_bytes() > self.max_bytes and len(self.segments) > 1:
+            segment = self.segments.pop(0)
+            self.evicted_segments += 1
+            self.evicted_bytes += self.sizes.pop(segment)
+            self._remove(segment)
+            if self.cursor[0] <= segment:
+                self.cursor = (self.segments[0], 0)
+                self._save_cursor()
+        if self.evicted_segments:
+            print(f"Spool over {self.max_bytes} bytes, evicted oldest segments (total {self.evicted_segments})", file=sys.stderr)
+    def _remove(self, segment: int):
+        try:
+            os.remove(self._path(segment))
+        except OSError:
+            pass
+    def _scan(self, buf, offset: int, limit):
+        records = []
+        if isinstance(buf, mmap.mmap):
+            end = len(buf)
+            while limit is None or len(records) < limit:
+                if offset + RECORD_HEADER.size > end:
+                    break
+                length, crc = RECORD_HEADER.unpack_from(buf, offset)
+                start = offset + RECORD_HEADER.size
+                payload = buf[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    return records, offset, True
+                records.append(payload)
+                offset = start + length
+            return records, offset, False
+        buf.seek(offset)
+        while limit is None or len(records) < limit:
+            header = buf.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                break
+            length, crc = RECORD_HEADER.unpack(header)
+            payload = buf.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return records, offset, True
+            if limit is not None:
+                records.append(payload)
+            offset += RECORD_HEADER.size + length
+        return records, offset, False
+    def _read_segment(self, segment: int, offset: int, limit: int, sealed: bool):
+        with open(self._path(segment), "rb") as f:
+            if self.use_mmap and sealed and self.sizes.get(segment):
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    return self._scan(buf, offset, limit)
+            return self._scan(f, offset, limit)
+    def read_batch(self, max_records: int):
+        with self._lock:
+            self._writer.flush()
+            segment, offset = self.cursor
+            segments = list(self.segments)
+        records = []
+        while len(records) < max_records:
+            sealed = segment != segments[-1]
+            try:
+                batch, offset, corrupt = self._read_segment(segment, offset, max_records - len(records), sealed)
+            except FileNotFoundError:
+                batch, corrupt = [], sealed
+            records.extend(batch)
+            if not sealed or len(records) >= max_records and not corrupt:
+                break
+            if corrupt:
+                print(f"Spool: skipping corrupt tail of segment {segment}", file=sys.stderr)
+            following = [s for s in segments if s > segment]
+            if not following:
+                break
+            segment, offset = following[0], 0
+        return records, (segment, offset)
+    def commit(self, position):
+        with self._lock:
+            if position <= self.cursor or position[0] < self.segments[0]:
+                return
+            self.cursor = position
+            while self.segments[0] < position[0]:
+                segment = self.segments.pop(0)
+                self.sizes.pop(segment, None)
+                self._remove(segment)
+            self._save_cursor()
+    def close(self):
+        with self._lock:
+            self._writer.close()
+            self._save_cursor()
\ No newline at end of file
@@ -0,0 +1,124 @@
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from urllib.parse import urlencode
+try:
+    from websockets.sync.client import connect as ws_connect
+    from websockets.exceptions import ConnectionClosed, WebSocketException
+except ImportError:
+    ws_connect = None
+class StreamSink:
+    def __init__(self, url: str, node: str, max_events: int = 100, max_latency: float = 0.05, max_unacked: int = 10000, reconnect_delay: float = 0.5, max_reconnect_delay: float = 10, on_ack=None):
+        if ws_connect is None:
+            raise RuntimeError("stream output mode needs the websockets package")
+        self.session = uuid.uuid4().hex
+        self.url = f"{url}?{urlencode({'node': node, 'session': self.session})}"
+        self.max_events = max(int(max_events), 1)
+        self.max_latency = max_latency
+        self.max_unacked = max_unacked
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.on_ack = on_ack
+        self.seq = 0
+        self.acked = 0
+        self.dropped = 0
+        self.connected = False
+        self.buffer = []
+        self.unacked = deque()
+        self.unacked_events = 0
+        self._deadline = 0
+        self._cond = threading.Condition()
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="output-stream", daemon=True)
+        self._thread.start()
+    def pending(self) -> int:
+        return len(self.buffer) + self.unacked_events
+    def write(self, event: dict) -> bool:
+        with self._cond:
+            if self.pending() >= self.max_unacked:
+                self.dropped += 1
+                return False
+            if not self.buffer:
+                self._deadline = time.monotonic() + self.max_latency
+                self._cond.notify_all()
+            self.buffer.append(event)
+            if len(self.buffer) == self.max_events:
+                self._cond.notify_all()
+        return True
+    def _acknowledge(self, ack: int):
+        released = 0
+        with self._cond:
+            while self.unacked and self.unacked[0][0] <= ack:
+                _, count, _ = self.unacked.popleft()
+                released += count
+            self.unacked_events -= released
+            self.acked += released
+            self._cond.notify_all()
+        if released and self.on_ack is not None:
+            self.on_ack(released)
+    def _read_acks(self, ws, lost: threading.Event):
+        try:
+            for raw in ws:
+                message = json.loads(raw)
+                if message.get("type") == "error":
+                    print(f"✗ Ingest stream error after seq {message.get('ack')}: {message.get('detail')}", file=sys.stderr)
+                if "ack" in message:
+                    self._acknowledge(message["ack"])
+        except (ConnectionClosed, ValueError):
+            pass
+        finally:
+            with self._cond:
+                lost.set()
+                self._cond.notify_all()
+    def _send_loop(self, ws, lost: threading.Event):
+        while True:
+            with self._cond:
+                while not self._closing and not lost.is_set() and (not self.buffer or (len(self.buffer) < self.max_events and time.monotonic() < self._deadline)):
+                    self._cond.wait(max(self._deadline - time.monotonic(), 0) if self.buffer else None)
+                if lost.is_set() or not self.buffer:
+                    return
+                batch = self.buffer[:self.max_events]
+                del self.buffer[:self.max_events]
+                self._deadline = time.monotonic()
+                self.seq += len(batch)
+                payload = json.dumps({"seq": self.seq, "events": batch})
+                self.unacked.append((self.seq, len(batch), payload))
+                self.unacked_events += len(batch)
+            ws.send(payload)
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._closing:
+            try:
+                with ws_connect(self.url, open_timeout=5, close_timeout=2) as ws:
+                    ready = json.loads(ws.recv(timeout=5))
+                    self._acknowledge(ready.get("ack", 0))
+                    if ready.get("max_batch_size"):
+                        self.max_events = min(self.max_events, int(ready["max_batch_size"]))
+                    self.connected = True
+                    delay = self.reconnect_delay
+                    lost = threading.Event()
+                    threading.Thread(target=self._read_acks, args=(ws, lost), name="output-stream-acks", daemon=True).start()
+                    with self._cond:
+                        resend = [payload for _, _, payload in self.unacked]
+                    for payload in resend:
+                        ws.send(payload)
+                    self._send_loop(ws, lost)
+            except (OSError, TimeoutError, ValueError, WebSocketException) as e:
+                print(f"✗ Ingest stream to {self.url.split('?', 1)[0]} unavailable: {e}", file=sys.stderr)
+            finally:
+                self.connected = False
+            with self._cond:
+                if not self._closing:
+                    self._cond.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+    def close(self, timeout: float = 5):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.connected and self.pending() and time.monotonic() < deadline:
+                self._cond.wait(0.1)
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
\ No newline at end of file
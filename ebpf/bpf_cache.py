@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tarfile
+import time
+from contextlib import contextmanager
+from monitor_common import config
+KHEADERS_ARCHIVE = "/sys/kernel/kheaders.tar.xz"
+def kernel_release() -> str:
+    return platform.release()
+def cache_dir() -> str:
+    path = config.ebpf_cache_dir
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), path)
+    return path
+def program_key(text: str, cflags) -> str:
+    digest = hashlib.sha256()
+    digest.update(kernel_release().encode())
+    for flag in sorted(cflags):
+        digest.update(b"\0" + flag.encode())
+    digest.update(b"\0" + text.encode())
+    return digest.hexdigest()[:16]
+def prepare_kernel_headers():
+    release = kernel_release()
+    if os.path.isdir(f"/lib/modules/{release}/build") or os.environ.get("BCC_KERNEL_SOURCE"):
+        return None
+    if not os.path.exists(KHEADERS_ARCHIVE):
+        return None
+    target = os.path.join(cache_dir(), release, "kheaders")
+    if not os.path.isdir(target):
+        staging = f"{target}.tmp-{os.getpid()}"
+        try:
+            os.makedirs(staging, exist_ok=True)
+            with tarfile.open(KHEADERS_ARCHIVE, "r:xz") as archive:
+                archive.extractall(staging)
+            os.rename(staging, target)
+        except OSError as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(target):
+                print(f"Could not cache kernel headers in {target}: {e}", file=sys.stderr, flush=True)
+                return None
+    os.environ["BCC_KERNEL_SOURCE"] = target
+    return target
+class StartupTimer:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.phases = {}
+    @contextmanager
+    def phase(self, name: str):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.monotonic() - start) * 1000, 1)
+    def total_ms(self) -> float:
+        return round((time.monotonic() - self.started) * 1000, 1)
+def record_startup(key: str, timer: StartupTimer, probes):
+    report = {
+        "timestamp": time.time(),
+        "kernel_release": kernel_release(),
+        "program_key": key,
+        "probes": list(probes),
+        "phases_ms": timer.phases,
+        "total_ms": timer.total_ms(),
+    }
+    manifest_path = os.path.join(cache_dir(), kernel_release(), f"{key}.json")
+    report["seen_before"] = os.path.exists(manifest_path)
+    print(f"Monitor startup: {json.dumps(report)}", flush=True)
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path, "w") as f:
+            json.dump(report, f)
+        with open(os.path.join(cache_dir(), "startup_history.jsonl"), "a") as f:
+            f.write(json.dumps(report) + "\n")
+    except OSError as e:
+        print(f"Could not write startup report: {e}", file=sys.stderr, flush=True)
+    return report
\ No newline at end of file
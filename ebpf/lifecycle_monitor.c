@@ -0,0 +1,60 @@
+#include <linux/sched.h>
+#include <uapi/linux/ptrace.h>
+#define LIFECYCLE_FORK 1
+#define LIFECYCLE_EXIT 2
+#ifndef CLONE_THREAD
+#define CLONE_THREAD 0x00010000
+#endif
+// Layout mirrored by RECORD_LAYOUTS[RECORD_LIFECYCLE] in utilities/record_codec.py
+struct lifecycle_event_t {
+  u64 ts_ns;
+  u64 cgroup_id;
+  u32 pid;
+  u32 ppid;
+  u8 kind;
+};
+#ifdef USE_RINGBUF
+BPF_RINGBUF_OUTPUT(lifecycle_events, RINGBUF_PAGES);
+#else
+BPF_PERF_OUTPUT(lifecycle_events);
+#endif
+TRACEPOINT_PROBE(task, task_newtask) {
+  if (args->clone_flags & CLONE_THREAD)
+    return 0;
+  u64 cgroup_id = bpf_get_current_cgroup_id();
+  if (!is_traced_cgroup(cgroup_id))
+    return 0;
+  struct lifecycle_event_t evt = {};
+  evt.ts_ns = bpf_ktime_get_ns();
+  evt.cgroup_id = cgroup_id;
+  evt.pid = args->pid;
+  evt.ppid = bpf_get_current_pid_tgid() >> 32;
+  evt.kind = LIFECYCLE_FORK;
+#ifdef USE_RINGBUF
+  if (lifecycle_events.ringbuf_output(&evt, sizeof(evt), 0) < 0)
+    count_output_drop();
+#else
+  lifecycle_events.perf_submit(args, &evt, sizeof(evt));
+#endif
+  return 0;
+}
+TRACEPOINT_PROBE(sched, sched_process_exit) {
+  u64 pidtgid = bpf_get_current_pid_tgid();
+  if ((u32)pidtgid != (u32)(pidtgid >> 32))
+    return 0;
+  u64 cgroup_id = bpf_get_current_cgroup_id();
+  if (!is_traced_cgroup(cgroup_id))
+    return 0;
+  struct lifecycle_event_t evt = {};
+  evt.ts_ns = bpf_ktime_get_ns();
+  evt.cgroup_id = cgroup_id;
+  evt.pid = pidtgid >> 32;
+  evt.kind = LIFECYCLE_EXIT;
+#ifdef USE_RINGBUF
+  if (lifecycle_events.ringbuf_output(&evt, sizeof(evt), 0) < 0)
+    count_output_drop();
+#else
+  lifecycle_events.perf_submit(args, &evt, sizeof(evt));
+#endif
+  return 0;
+}
\ No newline at end of file
@@ -0,0 +1,13 @@
+import os
+from monitor_common import Probe, register_probe
+from utilities.record_codec import RECORD_LIFECYCLE
+THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+@register_probe
+class LifecycleProbe(Probe):
+    name = "lifecycle"
+    c_file = os.path.join(THIS_DIR, "lifecycle_monitor.c")
+    output_table = "lifecycle_events"
+    record_type = RECORD_LIFECYCLE
+if __name__ == "__main__":
+    from monitor_host import run_host
+    run_host([LifecycleProbe.name])
\ No newline at end of file
@@ -0,0 +1,193 @@
+import ctypes
+import json
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utilities import config, is_cgroup_v2, CgroupIndex
+from utilities.record_codec import (
+    RECORD_FD_ENV,
+    RECORD_LAYOUTS,
+    RECORD_DROPS,
+    DROP_RATE_LIMITED,
+    DROP_BUFFER_LOST,
+    encode_frame,
+    decode_records
+)
+TRANSPORT_AUTO = "auto"
+TRANSPORT_RINGBUF = "ringbuf"
+TRANSPORT_PERF = "perf"
+POLL_TIMEOUT_MS = 100
+def ringbuf_supported():
+    from bcc import BPF
+    try:
+        return BPF.ksymname("bpf_ringbuf_output") != -1
+    except Exception:
+        return False
+def select_transport():
+    requested = str(config.ebpf_transport).lower()
+    if requested == TRANSPORT_PERF:
+        return TRANSPORT_PERF
+    if ringbuf_supported():
+        return TRANSPORT_RINGBUF
+    if requested == TRANSPORT_RINGBUF:
+        print("Ring buffer requested but not supported by this kernel, falling back to perf buffer", file=sys.stderr, flush=True)
+    return TRANSPORT_PERF
+def container_filter_enabled():
+    if not config.ebpf_container_only:
+        return False
+    if not is_cgroup_v2():
+        print("Container-only filtering needs cgroup v2, tracing all processes", file=sys.stderr, flush=True)
+        return False
+    return True
+def build_cflags(transport, container_filter):
+    cflags = []
+    if transport == TRANSPORT_RINGBUF:
+        cflags += ["-DUSE_RINGBUF", f"-DRINGBUF_PAGES={config.ebpf_buffer_pages}"]
+    if container_filter:
+        cflags += ["-DFILTER_CONTAINERS"]
+    cflags += [f"-DMAX_CONTAINER_CGROUPS={config.ebpf_max_container_cgroups}"]
+    rate = int(config.ebpf_rate_limit_per_second or 0)
+    if rate > 0:
+        burst = max(int(config.ebpf_rate_limit_burst or 0), 1)
+        cflags += [f"-DRATE_LIMIT_PER_SEC={rate}", f"-DRATE_LIMIT_BURST={burst}"]
+    return cflags
+def open_output(b, table_name, callback, transport, lost_cb=None):
+    if transport == TRANSPORT_RINGBUF:
+        b[table_name].open_ring_buffer(callback)
+    else:
+        b[table_name].open_perf_buffer(callback, page_cnt=config.ebpf_buffer_pages, lost_cb=lost_cb)
+def poll(b, transport, timeout=POLL_TIMEOUT_MS):
+    if transport == TRANSPORT_RINGBUF:
+        b.ring_buffer_poll(timeout)
+    else:
+        b.perf_buffer_poll(timeout)
+class BatchWriter:
+    def __init__(self, stream=None, max_batch=None):
+        self.stream = stream or sys.stdout
+        self.max_batch = max_batch or config.ebpf_batch_size
+        self.lines = []
+    def write(self, record_type: int, raw: bytes):
+        for evt in decode_records(record_type, raw):
+            self.lines.append(json.dumps(evt, ensure_ascii=False))
+        if len(self.lines) >= self.max_batch:
+            self.flush()
+    def flush(self):
+        if not self.lines:
+            return
+        self.stream.write("\n".join(self.lines) + "\n")
+        self.stream.flush()
+        self.lines.clear()
+class FrameWriter:
+    def __init__(self, fd: int, max_batch=None):
+        self.stream = os.fdopen(fd, "wb", buffering=1 << 16)
+        self.max_batch = max_batch or config.ebpf_batch_size
+        self.pending = {}
+        self.count = 0
+    def write(self, record_type: int, raw: bytes):
+        self.pending.setdefault(record_type, []).append(raw)
+        self.count += 1
+        if self.count >= self.max_batch:
+            self.flush()
+    def flush(self):
+        if not self.count:
+            return
+        for record_type, records in self.pending.items():
+            if records:
+                self.stream.write(encode_frame(record_type, b"".join(records)))
+                records.clear()
+        self.stream.flush()
+        self.count = 0
+def open_record_writer():
+    fd = os.environ.get(RECORD_FD_ENV)
+    if fd and str(config.ebpf_record_format).lower() == "binary":
+        return FrameWriter(int(fd))
+    return BatchWriter()
+class DropAccounting:
+    def __init__(self, interval=None):
+        self.interval = interval if interval is not None else config.ebpf_stats_interval
+        self.lost = 0
+        self.output_drops = 0
+        self.suppressed = {}
+        self.last_flush = time.monotonic()
+    def on_lost(self, count):
+        self.lost += count
+    def _rate_limited(self, b):
+        try:
+            buckets = b["rate_buckets"]
+        except KeyError:
+            return []
+        deltas = []
+        seen = {}
+        for key, bucket in buckets.items():
+            cgroup_id = key.value
+            seen[cgroup_id] = bucket.suppressed
+            delta = bucket.suppressed - self.suppressed.get(cgroup_id, 0)
+            if delta < 0:
+                delta = bucket.suppressed
+            if delta:
+                deltas.append((cgroup_id, delta))
+        self.suppressed = seen
+        return deltas
+    def _buffer_lost(self, b):
+        total = b["output_drops"].sum(0).value
+        delta = total - self.output_drops
+        self.output_drops = total
+        lost, self.lost = self.lost, 0
+        return lost + max(delta, 0)
+    def on_tick(self, b, writer, force=False):
+        if not force and time.monotonic() - self.last_flush < self.interval:
+            return
+        self.last_flush = time.monotonic()
+        layout = RECORD_LAYOUTS[RECORD_DROPS]
+        now_ns = time.monotonic_ns()
+        for cgroup_id, count in self._rate_limited(b):
+            writer.write(RECORD_DROPS, layout.pack(now_ns, cgroup_id, count, DROP_RATE_LIMITED))
+        lost = self._buffer_lost(b)
+        if lost:
+            writer.write(RECORD_DROPS, layout.pack(now_ns, 0, lost, DROP_BUFFER_LOST))
+class CgroupAllowlist:
+    def __init__(self, table, index=None):
+        self.table = table
+        self.index = index or CgroupIndex(resync_interval=config.ebpf_cgroup_resync_interval, poll_interval=config.ebpf_cgroup_poll_interval)
+        self.index.subscribe(self.apply)
+    def apply(self, added, removed):
+        for cgroup_id in added:
+            self.table[self.table.Key(cgroup_id)] = self.table.Leaf(1)
+        for cgroup_id in removed:
+            try:
+                del self.table[self.table.Key(cgroup_id)]
+            except KeyError:
+                pass
+    def start(self):
+        self.index.start()
+        return self
+PROBES = {}
+class Probe:
+    name = None
+    c_file = None
+    tracepoints = ()
+    output_table = None
+    record_type = None
+    def cflags(self):
+        return []
+    def record_size(self, data, size):
+        return RECORD_LAYOUTS[self.record_type].size
+    def attach(self, b):
+        for tp, fn_name in self.tracepoints:
+            b.attach_tracepoint(tp=tp, fn_name=fn_name)
+    def open(self, b, writer, transport, lost_cb=None):
+        if self.output_table is None:
+            return
+        record_type = self.record_type
+        record_size = self.record_size
+        def handle_event(ctx, data, size):
+            writer.write(record_type, ctypes.string_at(data, record_size(data, size)))
+        open_output(b, self.output_table, handle_event, transport, lost_cb)
+    def on_tick(self, b, writer):
+        pass
+    def on_exit(self, b, writer):
+        pass
+def register_probe(cls):
+    PROBES[cls.name] = cls
+    return cls
\ No newline at end of file
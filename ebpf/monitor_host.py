@@ -0,0 +1,81 @@
+from bcc import BPF
+import importlib
+import os
+import signal
+import sys
+from monitor_common import (
+    select_transport,
+    container_filter_enabled,
+    build_cflags,
+    open_record_writer,
+    poll,
+    CgroupAllowlist,
+    DropAccounting,
+    PROBES,
+    config
+)
+from bpf_cache import StartupTimer, prepare_kernel_headers, program_key, record_startup
+PRELUDE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "probe_prelude.c")
+BUILTIN_PROBE_MODULES = ("syscall_monitor", "net_monitor", "lifecycle_monitor", "raw_syscall_monitor")
+def load_probe_modules():
+    for module_name in list(BUILTIN_PROBE_MODULES) + config.ebpf_probe_modules:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            print(f"Failed to load probe module {module_name}: {e}", file=sys.stderr, flush=True)
+def run_host(probe_names=None):
+    load_probe_modules()
+    probes = []
+    for name in probe_names or config.ebpf_probes:
+        if name not in PROBES:
+            print(f"Unknown probe '{name}', skipping", file=sys.stderr, flush=True)
+            continue
+        probes.append(PROBES[name]())
+    if not probes:
+        print("No probes enabled, exiting.", file=sys.stderr, flush=True)
+        sys.exit(1)
+    timer = StartupTimer()
+    transport = select_transport()
+    container_filter = container_filter_enabled()
+    cflags = build_cflags(transport, container_filter)
+    with open(PRELUDE_FILE, "r") as f:
+        sources = [f.read()]
+    for probe in probes:
+        cflags += probe.cflags()
+        with open(probe.c_file, "r") as f:
+            sources.append(f.read())
+    text = "\n".join(sources)
+    with timer.phase("kernel_headers"):
+        prepare_kernel_headers()
+    with timer.phase("compile"):
+        b = BPF(text=text, cflags=cflags)
+    with timer.phase("attach"):
+        if container_filter:
+            CgroupAllowlist(b["container_cgroups"]).start()
+        writer = open_record_writer()
+        drops = DropAccounting()
+        for probe in probes:
+            probe.attach(b)
+            probe.open(b, writer, transport, drops.on_lost)
+    record_startup(program_key(text, cflags), timer, [p.name for p in probes])
+    print(f"Loaded BPF program with probes [{', '.join(p.name for p in probes)}] ({transport} transport). Listening for events... (CTRL-C to exit)", flush=True)
+    def exit_gracefully(signum, frame):
+        for probe in probes:
+            probe.on_exit(b, writer)
+        drops.on_tick(b, writer, force=True)
+        writer.flush()
+        print("\nDetaching and exiting.")
+        sys.exit(0)
+    signal.signal(signal.SIGINT, exit_gracefully)
+    signal.signal(signal.SIGTERM, exit_gracefully)
+    while True:
+        try:
+            poll(b, transport)
+            for probe in probes:
+                probe.on_tick(b, writer)
+            drops.on_tick(b, writer)
+            writer.flush()
+        except KeyboardInterrupt:
+            exit_gracefully(None, None)
+if __name__ == "__main__":
+    run_host()
\ No newline at end of file
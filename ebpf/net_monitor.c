@@ -5,8 +5,10 @@
 #include <uapi/linux/ptrace.h>
 #include <uapi/linux/unistd.h>
 #define COMM_LEN TASK_COMM_LEN
+// Layout mirrored by RECORD_LAYOUTS[RECORD_CONNECT] in utilities/record_codec.py
 struct net_event_t {
   u64 ts_ns;
+  u64 cgroup_id;
   u32 pid;
   u32 tgid;
   u32 uid;
@@ -17,7 +19,73 @@ struct net_event_t {
   u16 dport;
   u8 ip_version;
 };
+#ifdef USE_RINGBUF
+BPF_RINGBUF_OUTPUT(net_events, RINGBUF_PAGES);
+#else
 BPF_PERF_OUTPUT(net_events);
+#endif
+#ifdef AGGREGATE_CONNECTIONS
+struct flow_key_t {
+  u64 cgroup_id;
+  u32 daddr;
+  u16 dport;
+  u16 pad;
+};
+struct flow_stats_t {
+  u64 count;
+  u64 first_ts_ns;
+  u64 last_ts_ns;
+  u32 pid;
+  u32 tgid;
+  u32 uid;
+  char comm[COMM_LEN];
+};
+// Userspace flips flow_slot before draining, so it only ever reads and
+// deletes entries in the map the probe has stopped writing to.
+BPF_HASH(flows, struct flow_key_t, struct flow_stats_t, MAX_FLOWS);
+BPF_HASH(flows_alt, struct flow_key_t, struct flow_stats_t, MAX_FLOWS);
+BPF_ARRAY(flow_slot, u32, 1);
+static __always_inline void init_flow(struct flow_stats_t *init, u64 now) {
+  init->count = 1;
+  init->first_ts_ns = now;
+  init->last_ts_ns = now;
+  u64 flow_pidtgid = bpf_get_current_pid_tgid();
+  init->tgid = flow_pidtgid & 0xffffffff;
+  init->pid = flow_pidtgid >> 32;
+  init->uid = bpf_get_current_uid_gid() & 0xffffffff;
+  bpf_get_current_comm(&init->comm, sizeof(init->comm));
+}
+static __always_inline void count_flow(struct flow_key_t *key, u64 now) {
+  struct flow_stats_t *stats = flows.lookup(key);
+  if (stats) {
+    __sync_fetch_and_add(&stats->count, 1);
+    stats->last_ts_ns = now;
+    return;
+  }
+  struct flow_stats_t init = {};
+  init_flow(&init, now);
+  if (flows.insert(key, &init) != 0) {
+    stats = flows.lookup(key);
+    if (stats)
+      __sync_fetch_and_add(&stats->count, 1);
+  }
+}
+static __always_inline void count_flow_alt(struct flow_key_t *key, u64 now) {
+  struct flow_stats_t *stats = flows_alt.lookup(key);
+  if (stats) {
+    __sync_fetch_and_add(&stats->count, 1);
+    stats->last_ts_ns = now;
+    return;
+  }
+  struct flow_stats_t init = {};
+  init_flow(&init, now);
+  if (flows_alt.insert(key, &init) != 0) {
+    stats = flows_alt.lookup(key);
+    if (stats)
+      __sync_fetch_and_add(&stats->count, 1);
+  }
+}
+#endif
 struct connect_args {
   unsigned long long unused;
   int __syscall_nr;
@@ -26,6 +94,9 @@ struct connect_args {
   int addrlen;
 };
 int trace_connect(struct connect_args *args) {
+  u64 cgroup_id = bpf_get_current_cgroup_id();
+  if (!is_traced_cgroup(cgroup_id))
+    return 0;
   struct sockaddr_in sa4 = {};
   u16 family = 0;
   if (args->uservaddr &&
@@ -34,8 +105,25 @@ int trace_connect(struct connect_args *args) {
   family = sa4.sin_family;
   if (family != AF_INET)
     return 0;
+#ifdef AGGREGATE_CONNECTIONS
+  struct flow_key_t key = {};
+  key.cgroup_id = cgroup_id;
+  key.daddr = sa4.sin_addr.s_addr;
+  key.dport = ntohs(sa4.sin_port);
+  u64 now = bpf_ktime_get_ns();
+  int zero = 0;
+  u32 *slot = flow_slot.lookup(&zero);
+  if (slot && *slot)
+    count_flow_alt(&key, now);
+  else
+    count_flow(&key, now);
+  return 0;
+#endif
+  if (!rate_limit_allow(cgroup_id))
+    return 0;
   struct net_event_t evt = {};
   evt.ts_ns = bpf_ktime_get_ns();
+  evt.cgroup_id = cgroup_id;
   u64 pidtgid = bpf_get_current_pid_tgid();
   evt.tgid = pidtgid & 0xffffffff;
   evt.pid = pidtgid >> 32;
@@ -46,6 +134,11 @@ int trace_connect(struct connect_args *args) {
   evt.saddr = 0;
   evt.sport = 0;
   evt.ip_version = 4;
+#ifdef USE_RINGBUF
+  if (net_events.ringbuf_output(&evt, sizeof(evt), 0) < 0)
+    count_output_drop();
+#else
   net_events.perf_submit(args, &evt, sizeof(evt));
+#endif
   return 0;
 }
@@ -1,51 +1,60 @@
-from bcc import BPF
-from datetime import datetime
-import json
 import os
-import signal
-import sys
+import time
+from monitor_common import Probe, register_probe, config
+from utilities.record_codec import RECORD_CONNECT, RECORD_FLOW, RECORD_LAYOUTS
 THIS_DIR = os.path.dirname(os.path.realpath(__file__))
-C_FILE = os.path.join(THIS_DIR, "net_monitor.c")
-b = BPF(src_file=C_FILE)
-b.attach_tracepoint(tp="syscalls:sys_enter_connect", fn_name="trace_connect")
-print("Loaded BPF program and attached to sys_enter_connect tracepoint. Listening for events... (CTRL-C to exit)", flush=True)
-def _bytes_to_str(bv):
-    if not bv:
-        return ""
+FLOW_RECORD = RECORD_LAYOUTS[RECORD_FLOW]
+FLOW_MAPS = ("flows", "flows_alt")
+def _drain_flows(flows):
     try:
-        return bv.decode("utf-8", "ignore").rstrip("\x00")
+        return list(flows.items_lookup_and_delete_batch())
     except Exception:
-        return str(bv)
-def get_boot_time():
-    with open('/proc/uptime', 'r') as f:
-        uptime_seconds = float(f.readline().split()[0])
-        return datetime.now().timestamp() - uptime_seconds
-BOOT_TIME_OFFSET = get_boot_time()
-def handle_event(cpu, data, size):
-    evt = b["net_events"].event(data)
-    timestamp_seconds = BOOT_TIME_OFFSET + (evt.ts_ns / 1e9)
-    out = {
-        "timestamp_ns": int(evt.ts_ns),
-        "timestamp_iso": datetime.fromtimestamp(timestamp_seconds).isoformat() + "Z",
-        "pid": int(evt.pid),
-        "tgid": int(evt.tgid),
-        "uid": int(evt.uid),
-        "comm": _bytes_to_str(evt.comm),
-        "saddr": int(evt.saddr),
-        "daddr": int(evt.daddr),
-        "sport": int(evt.sport),
-        "dport": int(evt.dport),
-        "ip_version": int(evt.ip_version),
-    }
-    print(json.dumps(out, ensure_ascii=False), flush=True)
-b["net_events"].open_perf_buffer(handle_event)
-def exit_gracefully(signum, frame):
-    print("\nDetaching and exiting.")
-    sys.exit(0)
-signal.signal(signal.SIGINT, exit_gracefully)
-signal.signal(signal.SIGTERM, exit_gracefully)
-while True:
-    try:
-        b.perf_buffer_poll()
-    except KeyboardInterrupt:
-        exit_gracefully(None, None)
+        items = list(flows.items())
+        for key, _ in items:
+            try:
+                del flows[key]
+            except KeyError:
+                pass
+        return items
+@register_probe
+class NetworkProbe(Probe):
+    name = "network"
+    c_file = os.path.join(THIS_DIR, "net_monitor.c")
+    tracepoints = (("syscalls:sys_enter_connect", "trace_connect"),)
+    output_table = "net_events"
+    record_type = RECORD_CONNECT
+    def __init__(self):
+        self.aggregate = bool(config.ebpf_net_aggregation)
+        self.aggregate_interval = config.ebpf_net_aggregation_interval
+        self.next_flush = time.monotonic() + self.aggregate_interval
+        self.slot = 0
+    def cflags(self):
+        if self.aggregate:
+            return ["-DAGGREGATE_CONNECTIONS", f"-DMAX_FLOWS={config.ebpf_net_max_flows}"]
+        return []
+    def _swap_flows(self, b):
+        drained = FLOW_MAPS[self.slot]
+        self.slot ^= 1
+        slot = b["flow_slot"]
+        slot[slot.Key(0)] = slot.Leaf(self.slot)
+        return b[drained]
+    def flush_flows(self, b, writer):
+        self._write_flows(_drain_flows(self._swap_flows(b)), writer)
+    def _write_flows(self, flows, writer):
+        for key, stats in flows:
+            writer.write(RECORD_FLOW, FLOW_RECORD.pack(
+                key.cgroup_id, key.daddr, key.dport,
+                stats.count, stats.first_ts_ns, stats.last_ts_ns,
+                stats.pid, stats.tgid, stats.uid, bytes(stats.comm)
+            ))
+    def on_tick(self, b, writer):
+        if self.aggregate and time.monotonic() >= self.next_flush:
+            self.flush_flows(b, writer)
+            self.next_flush = time.monotonic() + self.aggregate_interval
+    def on_exit(self, b, writer):
+        if self.aggregate:
+            for _ in FLOW_MAPS:
+                self.flush_flows(b, writer)
+if __name__ == "__main__":
+    from monitor_host import run_host
+    run_host([NetworkProbe.name])
\ No newline at end of file
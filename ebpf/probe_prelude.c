@@ -0,0 +1,57 @@
+#include <linux/sched.h>
+#include <uapi/linux/ptrace.h>
+#ifdef FILTER_CONTAINERS
+BPF_HASH(container_cgroups, u64, u8, MAX_CONTAINER_CGROUPS);
+#endif
+static __always_inline int is_traced_cgroup(u64 cgroup_id) {
+#ifdef FILTER_CONTAINERS
+  return container_cgroups.lookup(&cgroup_id) != NULL;
+#else
+  return 1;
+#endif
+}
+#ifdef RATE_LIMIT_PER_SEC
+#define RATE_TOKEN_NS 1000000000ULL
+#define RATE_BUCKET_MAX (RATE_LIMIT_BURST * RATE_TOKEN_NS)
+#define RATE_REFILL_CAP_NS (RATE_BUCKET_MAX / RATE_LIMIT_PER_SEC)
+struct rate_bucket_t {
+  u64 tokens;
+  u64 last_ns;
+  u64 suppressed;
+};
+BPF_TABLE("lru_hash", u64, struct rate_bucket_t, rate_buckets, MAX_CONTAINER_CGROUPS);
+#endif
+static __always_inline int rate_limit_allow(u64 cgroup_id) {
+#ifdef RATE_LIMIT_PER_SEC
+  u64 now = bpf_ktime_get_ns();
+  struct rate_bucket_t *bucket = rate_buckets.lookup(&cgroup_id);
+  if (!bucket) {
+    struct rate_bucket_t init = {};
+    init.tokens = RATE_BUCKET_MAX - RATE_TOKEN_NS;
+    init.last_ns = now;
+    rate_buckets.update(&cgroup_id, &init);
+    return 1;
+  }
+  u64 elapsed = now - bucket->last_ns;
+  if (elapsed > RATE_REFILL_CAP_NS)
+    elapsed = RATE_REFILL_CAP_NS;
+  u64 tokens = bucket->tokens + elapsed * RATE_LIMIT_PER_SEC;
+  if (tokens > RATE_BUCKET_MAX)
+    tokens = RATE_BUCKET_MAX;
+  bucket->last_ns = now;
+  if (tokens < RATE_TOKEN_NS) {
+    bucket->tokens = tokens;
+    __sync_fetch_and_add(&bucket->suppressed, 1);
+    return 0;
+  }
+  bucket->tokens = tokens - RATE_TOKEN_NS;
+#endif
+  return 1;
+}
+BPF_PERCPU_ARRAY(output_drops, u64, 1);
+static __always_inline void count_output_drop(void) {
+  u32 zero = 0;
+  u64 *drops = output_drops.lookup(&zero);
+  if (drops)
+    (*drops)++;
+}
\ No newline at end of file
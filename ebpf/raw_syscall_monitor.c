@@ -0,0 +1,56 @@
+#include <linux/sched.h>
+#include <uapi/linux/ptrace.h>
+#define COMM_LEN TASK_COMM_LEN
+#ifndef SYSCALL_BITMAP_WORDS
+#define SYSCALL_BITMAP_WORDS 8
+#endif
+// Layout mirrored by RECORD_LAYOUTS[RECORD_SYSCALL] in utilities/record_codec.py
+struct syscall_event_t {
+  u64 ts_ns;
+  u64 cgroup_id;
+  u32 pid;
+  u32 tgid;
+  u32 uid;
+  u32 syscall_nr;
+  char comm[COMM_LEN];
+  u64 arg0;
+  u64 arg1;
+};
+BPF_ARRAY(syscall_bitmap, u64, SYSCALL_BITMAP_WORDS);
+#ifdef USE_RINGBUF
+BPF_RINGBUF_OUTPUT(syscall_events, RINGBUF_PAGES);
+#else
+BPF_PERF_OUTPUT(syscall_events);
+#endif
+TRACEPOINT_PROBE(raw_syscalls, sys_enter) {
+  long id = args->id;
+  if (id < 0 || id >= SYSCALL_BITMAP_WORDS * 64)
+    return 0;
+  u32 word_idx = id >> 6;
+  u64 *word = syscall_bitmap.lookup(&word_idx);
+  if (!word || !(*word & (1ULL << (id & 63))))
+    return 0;
+  u64 cgroup_id = bpf_get_current_cgroup_id();
+  if (!is_traced_cgroup(cgroup_id))
+    return 0;
+  if (!rate_limit_allow(cgroup_id))
+    return 0;
+  struct syscall_event_t evt = {};
+  evt.ts_ns = bpf_ktime_get_ns();
+  evt.cgroup_id = cgroup_id;
+  u64 pidtgid = bpf_get_current_pid_tgid();
+  evt.tgid = pidtgid & 0xffffffff;
+  evt.pid = pidtgid >> 32;
+  evt.uid = bpf_get_current_uid_gid() & 0xffffffff;
+  evt.syscall_nr = id;
+  bpf_get_current_comm(&evt.comm, sizeof(evt.comm));
+  evt.arg0 = args->args[0];
+  evt.arg1 = args->args[1];
+#ifdef USE_RINGBUF
+  if (syscall_events.ringbuf_output(&evt, sizeof(evt), 0) < 0)
+    count_output_drop();
+#else
+  syscall_events.perf_submit(args, &evt, sizeof(evt));
+#endif
+  return 0;
+}
\ No newline at end of file
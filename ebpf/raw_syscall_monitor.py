@@ -0,0 +1,34 @@
+import os
+import sys
+from monitor_common import Probe, register_probe, config
+from utilities import syscall_numbers_for, traced_syscalls
+from utilities.record_codec import RECORD_SYSCALL
+THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+SYSCALL_BITMAP_WORDS = 8
+DEDICATED_PROBE_SYSCALLS = {"syscall": ("execve",), "network": ("connect",)}
+@register_probe
+class RawSyscallProbe(Probe):
+    name = "raw_syscalls"
+    c_file = os.path.join(THIS_DIR, "raw_syscall_monitor.c")
+    output_table = "syscall_events"
+    record_type = RECORD_SYSCALL
+    def cflags(self):
+        return [f"-DSYSCALL_BITMAP_WORDS={SYSCALL_BITMAP_WORDS}"]
+    def enabled_syscalls(self):
+        exclude = set()
+        for probe_name, names in DEDICATED_PROBE_SYSCALLS.items():
+            if probe_name in config.ebpf_probes:
+                exclude.update(names)
+        return traced_syscalls(config.ebpf_syscall_categories, exclude)
+    def attach(self, b):
+        words = [0] * SYSCALL_BITMAP_WORDS
+        numbers = [nr for nr in syscall_numbers_for(self.enabled_syscalls()) if nr < SYSCALL_BITMAP_WORDS * 64]
+        for nr in numbers:
+            words[nr >> 6] |= 1 << (nr & 63)
+        bitmap = b["syscall_bitmap"]
+        for idx, word in enumerate(words):
+            bitmap[bitmap.Key(idx)] = bitmap.Leaf(word)
+        print(f"Syscall bitmap enables {len(numbers)} syscalls", file=sys.stderr, flush=True)
+if __name__ == "__main__":
+    from monitor_host import run_host
+    run_host([RawSyscallProbe.name])
\ No newline at end of file
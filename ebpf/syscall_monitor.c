@@ -3,17 +3,36 @@
 #include <linux/tracepoint.h>
 #include <linux/types.h>
 #include <uapi/linux/ptrace.h>
-#define ARGV_LEN 128
 #define COMM_LEN TASK_COMM_LEN
-struct event_t {
+#ifndef ARGV_BUDGET
+#define ARGV_BUDGET 1024
+#endif
+#ifndef ARGV_MAX_ARGS
+#define ARGV_MAX_ARGS 32
+#endif
+#define ARG_CHUNK 256
+// Layout mirrored by RECORD_LAYOUTS[RECORD_EXEC] in utilities/record_codec.py.
+// Only offsetof(argv) + argv_len bytes are submitted; argv holds the filename
+// followed by each argument, all NUL terminated.
+struct exec_event_t {
   u64 ts_ns;
+  u64 cgroup_id;
   u32 pid;
   u32 tgid;
   u32 uid;
   char comm[COMM_LEN];
-  char argv[ARGV_LEN];
+  u16 argc;
+  u16 argv_len;
+  u8 truncated;
+  u8 pad[3];
+  char argv[ARGV_BUDGET + ARG_CHUNK];
 };
+BPF_PERCPU_ARRAY(exec_scratch, struct exec_event_t, 1);
+#ifdef USE_RINGBUF
+BPF_RINGBUF_OUTPUT(events, RINGBUF_PAGES);
+#else
 BPF_PERF_OUTPUT(events);
+#endif
 struct execve_args {
   unsigned long long unused;
   int __syscall_nr;
@@ -22,17 +41,67 @@ struct execve_args {
   const char *const *envp;
 };
 int trace_execve(struct execve_args *args) {
-  struct event_t evt = {};
+  u64 cgroup_id = bpf_get_current_cgroup_id();
+  if (!is_traced_cgroup(cgroup_id))
+    return 0;
+  if (!rate_limit_allow(cgroup_id))
+    return 0;
+  u32 zero = 0;
+  struct exec_event_t *evt = exec_scratch.lookup(&zero);
+  if (!evt)
+    return 0;
   u64 pidtgid = bpf_get_current_pid_tgid();
-  evt.tgid = pidtgid & 0xffffffff;
-  evt.pid = pidtgid >> 32;
-  evt.ts_ns = bpf_ktime_get_ns();
-  evt.uid = bpf_get_current_uid_gid() & 0xffffffff;
-  bpf_get_current_comm(&evt.comm, sizeof(evt.comm));
+  evt->tgid = pidtgid & 0xffffffff;
+  evt->pid = pidtgid >> 32;
+  evt->ts_ns = bpf_ktime_get_ns();
+  evt->cgroup_id = cgroup_id;
+  evt->uid = bpf_get_current_uid_gid() & 0xffffffff;
+  evt->argc = 0;
+  evt->truncated = 0;
+  bpf_get_current_comm(&evt->comm, sizeof(evt->comm));
+  u32 offset = 0;
   if (args->filename) {
-    bpf_probe_read_user_str(&evt.argv, sizeof(evt.argv),
-                            (void *)args->filename);
+    int len = bpf_probe_read_user_str(&evt->argv[0], ARG_CHUNK, (void *)args->filename);
+    if (len > 0)
+      offset = len;
+    if (len == ARG_CHUNK)
+      evt->truncated = 1;
   }
-  events.perf_submit(args, &evt, sizeof(evt));
+#pragma unroll
+  for (int i = 0; i < ARGV_MAX_ARGS; i++) {
+    const char *arg = NULL;
+    if (bpf_probe_read_user(&arg, sizeof(arg), (void *)&args->argv[i]) < 0 || !arg)
+      break;
+    if (offset >= ARGV_BUDGET) {
+      evt->truncated = 1;
+      break;
+    }
+    int len = bpf_probe_read_user_str(&evt->argv[offset], ARG_CHUNK, (void *)arg);
+    if (len <= 0)
+      break;
+    if (len == ARG_CHUNK)
+      evt->truncated = 1;
+    offset += len;
+    evt->argc++;
+  }
+  if (evt->argc == ARGV_MAX_ARGS) {
+    const char *arg = NULL;
+    if (bpf_probe_read_user(&arg, sizeof(arg), (void *)&args->argv[ARGV_MAX_ARGS]) == 0 && arg)
+      evt->truncated = 1;
+  }
+  if (offset > ARGV_BUDGET) {
+    offset = ARGV_BUDGET;
+    evt->truncated = 1;
+  }
+  evt->argv_len = offset;
+  u32 size = offsetof(struct exec_event_t, argv) + offset;
+  if (size > sizeof(*evt))
+    return 0;
+#ifdef USE_RINGBUF
+  if (events.ringbuf_output(evt, size, 0) < 0)
+    count_output_drop();
+#else
+  events.perf_submit(args, evt, size);
+#endif
   return 0;
 }
\ No newline at end of file
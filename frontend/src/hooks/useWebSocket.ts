@@ -23,6 +23,7 @@ export interface WebSocketMessage {
   dest_ip?: string;
   source_port?: number;
   dest_port?: number;
+  connection_count?: number;
   source_container_id?: string;
   dest_container_id?: string;
   source_container_name?: string;
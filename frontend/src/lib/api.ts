@@ -26,6 +26,7 @@ export interface BackendEvent {
   dest_ip?: string;
   source_port?: number;
   dest_port?: number;
+  connection_count?: number;
   risk_score: number;
   categories: string[];
   is_security_relevant: boolean;
@@ -0,0 +1,6 @@
+import os
+import sys
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "ebpf"))
+sys.path.insert(0, os.path.join(ROOT, "collector"))
\ No newline at end of file
@@ -0,0 +1,21 @@
+import json
+import pytest
+pytest.importorskip("requests")
+import collector
+@pytest.mark.parametrize("runtime", ["threads", "asyncio"])
+def test_main_replays_capture_to_stdout(tmp_path, monkeypatch, capsys, runtime):
+    path = tmp_path / "capture.jsonl"
+    path.write_text('{"monitor_type": "syscall", "syscall_name": "setuid", "pid": 10, "tgid": 10, "cgroup_id": 5, "uid": 1000, "timestamp_ns": 1}\n')
+    for key, value in {
+        "COLLECTOR_RUNTIME": runtime,
+        "COLLECTOR_REPLAY_FILE": str(path),
+        "COLLECTOR_REPLAY_SPEED": "0",
+        "COLLECTOR_OUTPUT_MODE": "stdout",
+        "COLLECTOR_METRICS_PORT": "0",
+        "COLLECTOR_DOCKER_EVENTS": "false"
+    }.items():
+        monkeypatch.setenv(key, value)
+    collector.main()
+    [event] = [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+    assert event["syscall_name"] == "setuid"
+    assert event["container_name"] == "replay-cgroup-5"
\ No newline at end of file
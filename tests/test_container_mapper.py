@@ -0,0 +1,19 @@
+import os
+import time
+from utilities.container_mapper import CgroupIndex
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+def test_fallback_polls_on_poll_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(CgroupIndex, "_init_inotify", lambda self: False)
+    index = CgroupIndex(str(tmp_path), resync_interval=300, poll_interval=0.05).start()
+    scope = tmp_path / "system.slice" / ("docker-" + "ab" * 32 + ".scope")
+    scope.mkdir(parents=True)
+    cgroup_id = os.stat(scope).st_ino
+    assert _wait_for(lambda: index.lookup(cgroup_id) == "ab" * 6)
+    scope.rmdir()
+    assert _wait_for(lambda: index.lookup(cgroup_id) is None)
\ No newline at end of file
@@ -0,0 +1,29 @@
+import pytest
+from utilities.container_registry import ContainerRegistry
+CONTAINER_ID = "ab" * 32
+def _inspect(status, ips):
+    return {"Name": "/web", "Config": {"Image": "nginx"}, "State": {"Status": status}, "NetworkSettings": {"Networks": {"bridge": {"IPAddress": ip} for ip in ips}}}
+@pytest.fixture
+def registry(monkeypatch):
+    registry = ContainerRegistry(socket_path="/nonexistent.sock")
+    state = {"inspect": _inspect("running", ["172.17.0.2"])}
+    monkeypatch.setattr(registry, "_request", lambda path: state["inspect"])
+    registry.refresh(CONTAINER_ID)
+    registry.state = state
+    return registry
+def _event(action):
+    return {"Type": "container", "Action": action, "Actor": {"ID": CONTAINER_ID, "Attributes": {}}}
+@pytest.mark.parametrize("action", ["kill", "oom"])
+def test_kill_and_oom_refresh_instead_of_marking_stopped(registry, action):
+    registry.apply_event(_event(action))
+    assert registry.get(CONTAINER_ID)["status"] == "running"
+    assert registry.container_for_ip("172.17.0.2") == CONTAINER_ID[:12]
+@pytest.mark.parametrize("action", ["die", "stop"])
+def test_die_and_stop_mark_container_exited(registry, action):
+    registry.apply_event(_event(action))
+    assert registry.get(CONTAINER_ID)["status"] == "exited"
+    assert registry.container_for_ip("172.17.0.2") is None
+def test_kill_picks_up_exit_from_inspect(registry):
+    registry.state["inspect"] = _inspect("exited", [])
+    registry.apply_event(_event("kill"))
+    assert registry.get(CONTAINER_ID)["status"] == "exited"
\ No newline at end of file
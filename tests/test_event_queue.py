@@ -0,0 +1,70 @@
+import asyncio
+import queue
+import pytest
+from event_queue import (
+    LANE_CONTROL,
+    LANE_HIGH,
+    LANE_NORMAL,
+    LANE_LOW,
+    AsyncPriorityEventQueue,
+    PriorityEventQueue,
+    classify_event
+)
+def _syscall(name, uid=0, **extra):
+    return dict(monitor_type="syscall", syscall_name=name, uid=uid, **extra)
+@pytest.mark.parametrize("event, lane", [
+    ({"monitor_type": "lifecycle", "event_type": "process_fork"}, LANE_CONTROL),
+    ({"monitor_type": "stats", "event_type": "rate_limited"}, LANE_CONTROL),
+    (_syscall("setuid", uid=1000), LANE_HIGH),
+    (_syscall("init_module"), LANE_HIGH),
+    (_syscall("mount"), LANE_HIGH),
+    (_syscall("openat", uid=1000), LANE_NORMAL),
+    (_syscall("execve", uid=1000), LANE_NORMAL),
+    (_syscall("execve"), LANE_NORMAL),
+    (_syscall("read", uid=1000), LANE_LOW),
+    ({"monitor_type": "network", "dport": 22}, LANE_HIGH),
+    ({"monitor_type": "network", "dport": 443}, LANE_LOW),
+])
+def test_classify_event(event, lane):
+    assert classify_event(event) == lane
+def test_shedding_drops_lowest_lane_first():
+    events = PriorityEventQueue(maxsize=3)
+    events.put(_syscall("read", tag=1))
+    events.put(_syscall("execve", tag=2))
+    events.put(_syscall("read", tag=3))
+    assert events.put(_syscall("setuid", tag=4))
+    assert events.put(_syscall("execve", tag=5))
+    assert events.drop_counts() == {"control": 0, "high": 0, "normal": 0, "low": 2}
+    assert events.put(_syscall("init_module", tag=6))
+    assert events.drop_counts()["normal"] == 1
+    assert [events.get(block=False)["tag"] for _ in range(3)] == [4, 5, 6]
+def test_low_lane_is_dropped_when_only_higher_lanes_queued():
+    events = PriorityEventQueue(maxsize=1)
+    events.put(_syscall("setuid"))
+    assert not events.put(_syscall("read"))
+    assert not events.put(_syscall("execve"), block=False)
+    assert events.drop_counts() == {"control": 0, "high": 0, "normal": 1, "low": 1}
+def test_control_lane_is_bounded_and_never_sheds_events():
+    events = PriorityEventQueue(maxsize=2, control_maxsize=2)
+    events.put(_syscall("setuid", tag="a"))
+    events.put(_syscall("read", tag="b"))
+    for pid in range(4):
+        assert events.put({"monitor_type": "lifecycle", "pid": pid}, block=False)
+    assert events.lane_depths() == {"control": 2, "high": 1, "normal": 0, "low": 1}
+    assert events.drop_counts()["control"] == 2
+    drained = [events.get(block=False) for _ in range(4)]
+    assert [event.get("tag", event.get("pid")) for event in drained] == ["a", "b", 2, 3]
+    with pytest.raises(queue.Empty):
+        events.get(block=False)
+def test_async_queue_sheds_like_threaded_queue():
+    async def main():
+        events = AsyncPriorityEventQueue(maxsize=2)
+        await events.put(_syscall("read", tag=1))
+        await events.put(_syscall("execve", tag=2))
+        await events.put(_syscall("setuid", tag=3))
+        await events.put({"monitor_type": "stats", "tag": 4})
+        await events.close()
+        return [(await events.get())["tag"] for _ in range(3)], events.drop_counts()
+    tags, drops = asyncio.run(main())
+    assert tags == [2, 3, 4]
+    assert drops["low"] == 1
\ No newline at end of file
@@ -0,0 +1,17 @@
+import json
+import file_sink
+from file_sink import FileSink
+def test_restart_in_same_second_does_not_truncate_previous_segment(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_sink.time, "time", lambda: 1700000000.0)
+    path = str(tmp_path / "events.log")
+    first = FileSink(path)
+    first.write({"timestamp_ns": 1, "seq": 1})
+    first.close()
+    second = FileSink(path)
+    second.write({"timestamp_ns": 2, "seq": 2})
+    second.close()
+    assert first.segment_path != second.segment_path
+    with open(first.segment_path) as f:
+        assert [json.loads(line)["seq"] for line in f] == [1]
+    with open(second.segment_path) as f:
+        assert [json.loads(line)["seq"] for line in f] == [2]
\ No newline at end of file
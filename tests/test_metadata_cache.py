@@ -0,0 +1,18 @@
+import threading
+from metadata_cache import MetadataCache
+def test_nonblocking_miss_fetches_in_background():
+    release = threading.Event()
+    def fetch(container_id):
+        release.wait(5)
+        return {"name": container_id}
+    cache = MetadataCache(fetch, workers=1, wait_timeout=0.01)
+    assert cache.get("abc", block=False) == (None, "pending")
+    release.set()
+    cache.refresh("abc").result(5)
+    assert cache.get("abc", block=False) == ({"name": "abc"}, "hit")
+def test_blocking_miss_shares_inflight_fetch():
+    cache = MetadataCache(lambda container_id: {"name": container_id}, workers=1)
+    future, owner = cache.claim("abc")
+    assert owner
+    threading.Timer(0.05, cache.finish, ("abc", {"name": "web"})).start()
+    assert cache.get("abc") == ({"name": "web"}, "shared")
\ No newline at end of file
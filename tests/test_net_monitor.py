@@ -0,0 +1,50 @@
+import copy
+from collections import namedtuple
+from types import SimpleNamespace
+from net_monitor import FLOW_MAPS, NetworkProbe
+from utilities.record_codec import decode_records
+FlowKey = namedtuple("FlowKey", "cgroup_id daddr dport")
+class FakeTable(dict):
+    Key = Leaf = staticmethod(lambda value: value)
+class FakeFlows(FakeTable):
+    def __init__(self, kernel):
+        super().__init__()
+        self.kernel = kernel
+    def items_lookup_and_delete_batch(self):
+        raise RuntimeError("batch ops unsupported")
+    def items(self):
+        snapshot = [(key, copy.copy(stats)) for key, stats in super().items()]
+        if self.kernel.live:
+            self.kernel.connect()
+        return snapshot
+class FakeBPF:
+    def __init__(self):
+        self.tables = {"flow_slot": FakeTable({0: 0})}
+        for name in FLOW_MAPS:
+            self.tables[name] = FakeFlows(self)
+        self.connects = 0
+        self.live = True
+    def __getitem__(self, name):
+        return self.tables[name]
+    def connect(self):
+        self.connects += 1
+        flows = self.tables[FLOW_MAPS[self.tables["flow_slot"][0]]]
+        stats = flows.setdefault(FlowKey(7, 0x0200a8c0, 443), SimpleNamespace(count=0, first_ts_ns=1, last_ts_ns=1, pid=1, tgid=1, uid=0, comm=b"curl"))
+        stats.count += 1
+class Writer:
+    def __init__(self):
+        self.records = []
+    def write(self, record_type, payload):
+        self.records.extend(decode_records(record_type, payload))
+def test_flow_drain_does_not_lose_concurrent_increments():
+    b = FakeBPF()
+    probe = NetworkProbe()
+    probe.aggregate = True
+    writer = Writer()
+    for _ in range(5):
+        b.connect()
+        probe.flush_flows(b, writer)
+    b.live = False
+    probe.on_exit(b, writer)
+    assert sum(record["connection_count"] for record in writer.records) == b.connects
+    assert not b["flows"] and not b["flows_alt"]
\ No newline at end of file
@@ -0,0 +1,29 @@
+import os
+from event_enricher import EventEnricher
+from pipeline import EnrichmentPipeline, shard_key
+def test_shard_key_prefers_cgroup_id():
+    assert shard_key({"cgroup_id": 7, "pid": 1}, lambda event: "other") == 7
+def test_shard_key_falls_back_to_resolved_container_then_tgid():
+    containers = {1: "abc", 2: "abc"}
+    container_of = lambda event: containers.get(event["pid"])
+    assert shard_key({"cgroup_id": 0, "pid": 1, "tgid": 1}, container_of) == shard_key({"cgroup_id": 0, "pid": 2, "tgid": 2}, container_of)
+    assert shard_key({"cgroup_id": 0, "pid": 9, "tgid": 8}, container_of) == 8
+    assert shard_key({"pid": 9}) == 9
+def test_cgroup_v1_container_stays_on_one_shard():
+    enricher = EventEnricher(replay=True)
+    pipeline = EnrichmentPipeline(enricher, None, workers=8)
+    enricher.enrich({"monitor_type": "syscall", "syscall_name": "execve", "cgroup_id": 0, "pid": 100, "tgid": 100})
+    events = [{"monitor_type": "lifecycle", "event_type": "process_fork", "cgroup_id": 0, "pid": 100 + n, "ppid": 100 + n - 1} for n in range(1, 20)]
+    for event in events:
+        enricher.enrich(event)
+    events += [{"monitor_type": "syscall", "syscall_name": "execve", "cgroup_id": 0, "pid": 100 + n, "tgid": 100 + n} for n in range(20)]
+    for event in events:
+        pipeline.submit(event)
+    assert sorted(shard.qsize() for shard in pipeline.shards)[:-1] == [0] * 7
+def test_shard_container_only_consults_pid_cache():
+    enricher = EventEnricher(use_cgroup_index=False, use_docker_events=False)
+    assert enricher.shard_container({"monitor_type": "syscall", "cgroup_id": 0, "pid": os.getpid()}) is None
+    assert len(enricher.pid_cache) == 0
+    enricher.pid_cache.put(os.getpid(), None, "abc")
+    assert enricher.shard_container({"monitor_type": "syscall", "cgroup_id": 0, "pid": os.getpid()}) == "abc"
+    assert enricher.shard_container({"monitor_type": "lifecycle", "event_type": "process_fork", "pid": 1, "ppid": os.getpid()}) == "abc"
\ No newline at end of file
@@ -0,0 +1,72 @@
+import io
+import struct
+import pytest
+from utilities.record_codec import (
+    DROP_RATE_LIMITED,
+    FRAME_HEADER,
+    RECORD_CONNECT,
+    RECORD_DROPS,
+    RECORD_EXEC,
+    RECORD_FLOW,
+    RECORD_LAYOUTS,
+    RECORD_LIFECYCLE,
+    RECORD_SYSCALL,
+    EXEC_ARGV_LEN_OFFSET,
+    decode_records,
+    encode_frame,
+    iter_frames,
+    read_frames
+)
+from utilities.syscall_utils import syscall_name_for
+def _exec_record(ts_ns, pid, argv, truncated=0):
+    args = b"\0".join(argv) + b"\0"
+    return RECORD_LAYOUTS[RECORD_EXEC].pack(ts_ns, 7, pid, pid, 1000, b"bash", len(argv), len(args), truncated) + args
+def _roundtrip(record_type, payload):
+    return list(read_frames(io.BytesIO(encode_frame(record_type, payload))))
+def test_exec_argv_length_offset_matches_layout():
+    record = _exec_record(1, 2, [b"/bin/true"])
+    assert struct.unpack_from("=H", record, EXEC_ARGV_LEN_OFFSET)[0] == len(b"/bin/true\0")
+def test_exec_roundtrip_with_variable_length_argv():
+    payload = _exec_record(10, 100, [b"/bin/sh", b"-c", b"echo hi"]) + _exec_record(11, 101, [b"/usr/bin/id"], truncated=1)
+    first, second = _roundtrip(RECORD_EXEC, payload)
+    assert first["filename"] == "/bin/sh"
+    assert first["argv"] == "-c echo hi"
+    assert (first["pid"], first["cgroup_id"], first["uid"], first["comm"], first["argc"]) == (100, 7, 1000, "bash", 3)
+    assert not first["argv_truncated"]
+    assert second["argv"] == "/usr/bin/id"
+    assert second["argv_truncated"]
+    assert second["timestamp_ns"] == 11
+def test_connect_roundtrip():
+    payload = RECORD_LAYOUTS[RECORD_CONNECT].pack(5, 7, 10, 10, 0, b"curl", 0x0100007f, 0x0200a8c0, 40000, 443, 4)
+    [event] = _roundtrip(RECORD_CONNECT, payload)
+    assert event["monitor_type"] == "network"
+    assert (event["saddr"], event["daddr"], event["sport"], event["dport"], event["ip_version"]) == (0x0100007f, 0x0200a8c0, 40000, 443, 4)
+    assert event["comm"] == "curl"
+def test_flow_roundtrip():
+    payload = RECORD_LAYOUTS[RECORD_FLOW].pack(7, 0x0200a8c0, 5432, 12, 100, 200, 10, 10, 999, b"psql")
+    [event] = _roundtrip(RECORD_FLOW, payload)
+    assert event["connection_count"] == 12
+    assert (event["first_timestamp_ns"], event["last_timestamp_ns"], event["timestamp_ns"]) == (100, 200, 100)
+    assert (event["dport"], event["uid"], event["comm"]) == (5432, 999, "psql")
+def test_lifecycle_roundtrip():
+    layout = RECORD_LAYOUTS[RECORD_LIFECYCLE]
+    fork, exit_ = _roundtrip(RECORD_LIFECYCLE, layout.pack(1, 7, 11, 10, 1) + layout.pack(2, 7, 11, 0, 2))
+    assert (fork["event_type"], fork["pid"], fork["ppid"]) == ("process_fork", 11, 10)
+    assert exit_["event_type"] == "process_exit"
+def test_syscall_roundtrip():
+    nr = 105
+    payload = RECORD_LAYOUTS[RECORD_SYSCALL].pack(3, 7, 12, 12, 1000, nr, b"su", 0, 0xffffffff)
+    [event] = _roundtrip(RECORD_SYSCALL, payload)
+    assert (event["syscall_name"], event["syscall_nr"], event["syscall_args"]) == (syscall_name_for(nr), nr, [0, 0xffffffff])
+def test_drops_roundtrip():
+    payload = RECORD_LAYOUTS[RECORD_DROPS].pack(4, 7, 250, DROP_RATE_LIMITED)
+    [event] = _roundtrip(RECORD_DROPS, payload)
+    assert (event["monitor_type"], event["event_type"], event["count"]) == ("stats", "rate_limited", 250)
+@pytest.mark.parametrize("cut", [1, FRAME_HEADER.size, FRAME_HEADER.size + 5])
+def test_truncated_trailing_frame_is_dropped(cut):
+    complete = encode_frame(RECORD_DROPS, RECORD_LAYOUTS[RECORD_DROPS].pack(4, 7, 1, DROP_RATE_LIMITED))
+    trailing = encode_frame(RECORD_EXEC, _exec_record(1, 2, [b"/bin/true"]))[:cut]
+    assert [record_type for record_type, _ in iter_frames(io.BytesIO(complete + trailing))] == [RECORD_DROPS]
+    assert len(list(read_frames(io.BytesIO(complete + trailing)))) == 1
+def test_unknown_record_type_is_skipped():
+    assert list(decode_records(99, b"\0" * 16)) == []
\ No newline at end of file
@@ -0,0 +1,38 @@
+import queue
+from event_enricher import EventEnricher
+from replay import ReplaySource
+from utilities.record_codec import RECORD_EXEC, RECORD_LIFECYCLE, RECORD_LAYOUTS, encode_frame
+def _exec_frame(cgroup_id, pid, argv):
+    args = b"\0".join(argv) + b"\0"
+    payload = RECORD_LAYOUTS[RECORD_EXEC].pack(1000, cgroup_id, pid, pid, 1000, b"sh", len(argv), len(args), 0) + args
+    return encode_frame(RECORD_EXEC, payload)
+def _replay(path):
+    events = queue.Queue()
+    source = ReplaySource(str(path), events, speed=0).start()
+    assert source.wait(5) == 0
+    enricher = EventEnricher(replay=True)
+    enriched = []
+    while not events.empty():
+        event = enricher.enrich(events.get())
+        if event is not None:
+            enriched.append(event)
+    return enriched
+def test_replayed_capture_produces_output(tmp_path):
+    path = tmp_path / "capture.bin"
+    fork = encode_frame(RECORD_LIFECYCLE, RECORD_LAYOUTS[RECORD_LIFECYCLE].pack(900, 0, 4243, 4242, 1))
+    path.write_bytes(_exec_frame(77, 4242, [b"/bin/sh", b"-c", b"id"]) + _exec_frame(77, 4242, [b"/usr/bin/id"]) + _exec_frame(0, 4242, [b"/bin/true"]) + fork + _exec_frame(0, 4243, [b"/bin/ls"]))
+    enriched = _replay(path)
+    assert len(enriched) == 4
+    assert enriched[0]["container_id"] == enriched[1]["container_id"]
+    assert enriched[0]["container_name"] == "replay-cgroup-77"
+    assert enriched[2]["container_name"] == "replay-pid-4242"
+    assert enriched[3]["container_id"] == enriched[2]["container_id"]
+    assert all(event["container_image"] == "replay" for event in enriched)
+    assert all(len(event["container_id"]) == 12 for event in enriched)
+def test_replayed_json_capture_produces_output(tmp_path):
+    path = tmp_path / "capture.jsonl"
+    path.write_text('{"monitor_type": "network", "pid": 10, "cgroup_id": 5, "uid": 0, "daddr": 16777343, "dport": 22}\n')
+    enriched = _replay(path)
+    assert [event["event_type"] for event in enriched] == ["tcp_connect"]
+    assert enriched[0]["source_container_name"] == "replay-cgroup-5"
+    assert len(enriched[0]["source_container_id"]) == 12
\ No newline at end of file
@@ -0,0 +1,69 @@
+import os
+import pytest
+from spool import RECORD_HEADER, SegmentSpool
+def _record(n):
+    return f"event-{n:014d}".encode()
+def _fill(spool, start, count):
+    for n in range(start, start + count):
+        spool.append(_record(n))
+@pytest.fixture(params=[False, True], ids=["file", "mmap"])
+def use_mmap(request):
+    return request.param
+def test_append_read_commit_across_rotation(tmp_path, use_mmap):
+    spool = SegmentSpool(str(tmp_path), segment_bytes=64, use_mmap=use_mmap)
+    _fill(spool, 0, 7)
+    assert len(spool.segments) == 3
+    records, position = spool.read_batch(4)
+    assert records == [_record(n) for n in range(4)]
+    spool.commit(position)
+    assert spool.segments[0] == position[0] == 2
+    assert not os.path.exists(spool._path(1))
+    records, position = spool.read_batch(10)
+    assert records == [_record(n) for n in range(4, 7)]
+    spool.commit(position)
+    assert spool.read_batch(10)[0] == []
+    _fill(spool, 7, 1)
+    assert spool.read_batch(10)[0] == [_record(7)]
+    spool.close()
+def test_eviction_moves_cursor_to_oldest_remaining_segment(tmp_path, use_mmap):
+    spool = SegmentSpool(str(tmp_path), segment_bytes=64, max_bytes=128, use_mmap=use_mmap)
+    _fill(spool, 0, 12)
+    assert spool.evicted_segments > 0
+    assert spool.size_bytes() <= 128
+    assert spool.cursor == (spool.segments[0], 0)
+    records, _ = spool.read_batch(100)
+    first = int(records[0].decode().split("-")[1])
+    assert first > 0
+    assert records == [_record(n) for n in range(first, 12)]
+    spool.close()
+    assert SegmentSpool(str(tmp_path), segment_bytes=64, max_bytes=128).cursor == spool.cursor
+def test_restart_truncates_partial_record_and_keeps_cursor(tmp_path):
+    spool = SegmentSpool(str(tmp_path))
+    _fill(spool, 0, 3)
+    records, position = spool.read_batch(1)
+    spool.commit(position)
+    spool.close()
+    path = spool._path(spool.segments[-1])
+    intact = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(RECORD_HEADER.pack(100, 0) + b"torn")
+    spool = SegmentSpool(str(tmp_path))
+    assert os.path.getsize(path) == intact
+    assert spool.cursor == position
+    _fill(spool, 3, 1)
+    records, _ = spool.read_batch(10)
+    assert records == [_record(n) for n in range(1, 4)]
+    spool.close()
+def test_commit_of_evicted_position_is_ignored(tmp_path):
+    spool = SegmentSpool(str(tmp_path), segment_bytes=64, max_bytes=128)
+    _fill(spool, 0, 2)
+    records, stale = spool.read_batch(2)
+    assert stale[0] == 1
+    _fill(spool, 2, 10)
+    assert spool.segments[0] > stale[0]
+    cursor = spool.cursor
+    spool.commit(stale)
+    assert spool.cursor == cursor
+    records, _ = spool.read_batch(100)
+    assert records[-1] == _record(11)
+    spool.close()
\ No newline at end of file
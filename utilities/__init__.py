@@ -1,5 +1,6 @@
 from .docker_utils import (
     get_container_id_from_pid,
+    get_process_start_time,
     get_container_metadata,
     is_containerized,
     get_all_container_ips
@@ -8,11 +9,24 @@ from .syscall_utils import (
     parse_syscall_name,
     is_security_relevant_syscall,
     categorize_syscall,
-    get_risk_score
+    get_risk_score,
+    get_network_risk,
+    syscall_name_for,
+    syscall_numbers_for,
+    traced_syscalls
 )
+from .container_mapper import (
+    container_id_from_cgroup_path,
+    is_cgroup_v2,
+    scan_container_cgroups,
+    CgroupIndex
+)
+from .async_docker import AsyncDockerClient
+from .container_registry import ContainerRegistry
 from .config_loader import config
 __all__ = [
     'get_container_id_from_pid',
+    'get_process_start_time',
     'get_container_metadata',
     'is_containerized',
     'get_all_container_ips',
@@ -20,5 +34,15 @@ __all__ = [
     'is_security_relevant_syscall',
     'categorize_syscall',
     'get_risk_score',
+    'get_network_risk',
+    'syscall_name_for',
+    'syscall_numbers_for',
+    'traced_syscalls',
+    'container_id_from_cgroup_path',
+    'is_cgroup_v2',
+    'scan_container_cgroups',
+    'CgroupIndex',
+    'AsyncDockerClient',
+    'ContainerRegistry',
     'config'
 ]
@@ -0,0 +1,58 @@
+import asyncio
+import json
+import os
+from typing import Optional, Dict
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+class DockerAPIError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Docker API {status}: {message}")
+        self.status = status
+def docker_socket_path() -> str:
+    host = os.environ.get("DOCKER_HOST", "")
+    if host.startswith("unix://"):
+        return host[len("unix://"):]
+    return DEFAULT_DOCKER_SOCKET
+def metadata_from_inspect(data: dict) -> Dict[str, Optional[str]]:
+    return {
+        "name": data.get("Name", "").lstrip("/") or None,
+        "image": data.get("Config", {}).get("Image"),
+        "status": data.get("State", {}).get("Status")
+    }
+def ips_from_container_list(containers: list) -> Dict[str, str]:
+    ip_to_container = {}
+    for container in containers:
+        cid = container.get("Id", "")[:12]
+        networks = container.get("NetworkSettings", {}).get("Networks", {}) or {}
+        for net_info in networks.values():
+            ip = net_info.get("IPAddress")
+            if ip:
+                ip_to_container[ip] = cid
+    return ip_to_container
+class AsyncDockerClient:
+    def __init__(self, socket_path: str = None, timeout: float = 5):
+        self.socket_path = socket_path or docker_socket_path()
+        self.timeout = timeout
+    async def _request(self, path: str):
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(self.socket_path), self.timeout)
+        try:
+            writer.write(f"GET {path} HTTP/1.0\r\nHost: docker\r\n\r\n".encode())
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), self.timeout)
+        finally:
+            writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        if status >= 400:
+            raise DockerAPIError(status, body.decode("utf-8", "replace").strip())
+        return json.loads(body)
+    async def inspect(self, container_id: str) -> dict:
+        return await self._request(f"/containers/{container_id}/json")
+    async def list_containers(self) -> list:
+        return await self._request("/containers/json")
+    async def get_container_metadata(self, container_id: str) -> Dict[str, Optional[str]]:
+        try:
+            return metadata_from_inspect(await self.inspect(container_id))
+        except (OSError, asyncio.TimeoutError, DockerAPIError, ValueError):
+            return {"name": None, "image": None, "status": None}
+    async def get_all_container_ips(self) -> Dict[str, str]:
+        return ips_from_container_list(await self.list_containers())
\ No newline at end of file
@@ -39,21 +39,218 @@ class Config:
                 return default
         return value
     @property
-    def ebpf_syscall_monitor(self):
-        return self.get('ebpf.syscall_monitor')
+    def ebpf_monitor_host(self):
+        return self.get('ebpf.monitor_host', '../ebpf/monitor_host.py')
+    def get_list(self, key_path, default=None):
+        value = self.get(key_path, default)
+        if isinstance(value, str):
+            return [v.strip() for v in value.split(',') if v.strip()]
+        return list(value or [])
     @property
-    def ebpf_net_monitor(self):
-        return self.get('ebpf.net_monitor')
+    def ebpf_probes(self):
+        return self.get_list('ebpf.probes', ['syscall', 'network', 'lifecycle', 'raw_syscalls'])
+    @property
+    def ebpf_probe_modules(self):
+        return self.get_list('ebpf.probe_modules', [])
+    @property
+    def ebpf_cache_dir(self):
+        return self.get('ebpf.cache_dir', '/var/cache/container-security-visualizer')
+    @property
+    def ebpf_transport(self):
+        return self.get('ebpf.transport', 'auto')
+    @property
+    def ebpf_buffer_pages(self):
+        return self.get('ebpf.buffer_pages', 64)
+    @property
+    def ebpf_batch_size(self):
+        return self.get('ebpf.batch_size', 256)
+    @property
+    def ebpf_record_format(self):
+        return self.get('ebpf.record_format', 'binary')
+    @property
+    def ebpf_syscall_categories(self):
+        return self.get_list('ebpf.syscall_categories', [])
+    @property
+    def ebpf_argv_max_bytes(self):
+        return self.get('ebpf.argv_max_bytes', 1024)
+    @property
+    def ebpf_argv_max_args(self):
+        return self.get('ebpf.argv_max_args', 32)
+    @property
+    def ebpf_container_only(self):
+        return self.get('ebpf.container_only', True)
+    @property
+    def ebpf_max_container_cgroups(self):
+        return self.get('ebpf.max_container_cgroups', 10240)
+    @property
+    def ebpf_cgroup_resync_interval(self):
+        return self.get('ebpf.cgroup_resync_interval_seconds', 300)
+    @property
+    def ebpf_cgroup_poll_interval(self):
+        return self.get('ebpf.cgroup_poll_interval_seconds', 2)
+    @property
+    def ebpf_net_aggregation(self):
+        return self.get('ebpf.net_aggregation', False)
+    @property
+    def ebpf_net_aggregation_interval(self):
+        return self.get('ebpf.net_aggregation_interval_seconds', 5)
+    @property
+    def ebpf_net_max_flows(self):
+        return self.get('ebpf.net_max_flows', 65536)
+    @property
+    def ebpf_rate_limit_per_second(self):
+        return self.get('ebpf.rate_limit_per_second', 0)
+    @property
+    def ebpf_rate_limit_burst(self):
+        return self.get('ebpf.rate_limit_burst', 0)
+    @property
+    def ebpf_stats_interval(self):
+        return self.get('ebpf.stats_interval_seconds', 10)
     @property
     def collector_output_mode(self):
         return self.get('collector.output_mode', 'stdout')
     @property
     def collector_log_file(self):
-        return self.get('collector.log_file')
+        path = self.get('collector.log_file')
+        if path and not os.path.isabs(path):
+            path = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "config", path))
+        return path
+    @property
+    def collector_file_buffer_kb(self):
+        return self.get('collector.file.buffer_kb', 1024)
+    @property
+    def collector_file_flush_interval(self):
+        return self.get('collector.file.flush_interval_seconds', 1)
+    @property
+    def collector_file_rotate_mb(self):
+        return self.get('collector.file.rotate_mb', 256)
+    @property
+    def collector_file_rotate_seconds(self):
+        return self.get('collector.file.rotate_seconds', 3600)
+    @property
+    def collector_file_compression(self):
+        return self.get('collector.file.compression', 'gzip')
     @property
     def collector_api_endpoint(self):
         return self.get('collector.api_endpoint', 'http://localhost:8000/api/events')
     @property
+    def collector_stats_endpoint(self):
+        return self.get('collector.stats_endpoint') or self.collector_api_endpoint.replace('/events', '/stats/drops')
+    @property
+    def collector_batch_endpoint(self):
+        return self.get('collector.batch.endpoint') or self.collector_api_endpoint.rstrip('/') + '/batch'
+    @property
+    def collector_batch_max_events(self):
+        return self.get('collector.batch.max_events', 100)
+    @property
+    def collector_batch_max_latency_ms(self):
+        return self.get('collector.batch.max_latency_ms', 250)
+    @property
+    def collector_batch_gzip(self):
+        return self.get('collector.batch.gzip', True)
+    @property
+    def collector_batch_max_retries(self):
+        return self.get('collector.batch.max_retries', 5)
+    @property
+    def collector_batch_max_buffered(self):
+        return self.get('collector.batch.max_buffered_events', 20000)
+    @property
+    def collector_spool_dir(self):
+        return self.get('collector.spool.directory')
+    @property
+    def collector_spool_segment_mb(self):
+        return self.get('collector.spool.segment_mb', 64)
+    @property
+    def collector_spool_max_mb(self):
+        return self.get('collector.spool.max_mb', 1024)
+    @property
+    def collector_spool_mmap(self):
+        return self.get('collector.spool.mmap', False)
+    @property
+    def collector_database_url(self):
+        return self.get('collector.database.url')
+    @property
+    def collector_database_batch_size(self):
+        return self.get('collector.database.batch_size', 1000)
+    @property
+    def collector_database_flush_interval(self):
+        return self.get('collector.database.flush_interval_seconds', 1)
+    @property
+    def collector_database_notify(self):
+        return self.get('collector.database.notify', True)
+    @property
+    def collector_stream_endpoint(self):
+        return self.get('collector.stream.endpoint')
+    @property
+    def collector_stream_node(self):
+        return self.get('collector.stream.node')
+    @property
+    def collector_stream_max_events(self):
+        return self.get('collector.stream.max_events', 100)
+    @property
+    def collector_stream_max_latency_ms(self):
+        return self.get('collector.stream.max_latency_ms', 50)
+    @property
+    def collector_stream_max_unacked(self):
+        return self.get('collector.stream.max_unacked_events', 10000)
+    @property
+    def collector_runtime(self):
+        return self.get('collector.runtime', 'threads')
+    @property
+    def collector_enrich_workers(self):
+        return self.get('collector.enrich_workers', 4)
+    @property
+    def collector_queue_size(self):
+        return self.get('collector.queue_size', 1024)
+    @property
+    def collector_event_queue_size(self):
+        return self.get('collector.event_queue.max_events', 10000)
+    @property
+    def collector_high_risk_score(self):
+        return self.get('collector.event_queue.high_risk_score', 5)
+    @property
+    def collector_low_risk_score(self):
+        return self.get('collector.event_queue.low_risk_score', 2)
+    @property
+    def collector_control_queue_size(self):
+        return self.get('collector.event_queue.max_control_events', 1024)
+    @property
+    def collector_metrics_host(self):
+        return self.get('collector.metrics.host', '127.0.0.1')
+    @property
+    def collector_metrics_port(self):
+        return self.get('collector.metrics.port', 9464)
+    @property
+    def collector_docker_events(self):
+        return self.get('collector.docker_events', True)
+    @property
+    def collector_debug_logging(self):
+        return self.get('collector.debug_logging', False)
+    @property
+    def collector_record_file(self):
+        return self.get('collector.record_file')
+    @property
+    def collector_replay_file(self):
+        return self.get('collector.replay.file')
+    @property
+    def collector_replay_speed(self):
+        return self.get('collector.replay.speed', 1.0)
+    @property
+    def collector_replay_loops(self):
+        return self.get('collector.replay.loops', 1)
+    @property
     def cache_ttl(self):
         return self.get('cache.pid_ttl_seconds', 60)
+    @property
+    def pid_cache_size(self):
+        return self.get('cache.pid_cache_size', 65536)
+    @property
+    def pid_revalidate_interval(self):
+        return self.get('cache.pid_revalidate_seconds', 30)
+    @property
+    def metadata_cache_size(self):
+        return self.get('cache.metadata_cache_size', 4096)
+    @property
+    def metadata_fetch_workers(self):
+        return self.get('cache.metadata_fetch_workers', 4)
 config = Config()
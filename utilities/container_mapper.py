@@ -0,0 +1,179 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Optional, Dict, Callable, List
+CGROUP_ROOT = "/sys/fs/cgroup"
+_HEX_CHARS = frozenset("0123456789abcdefABCDEF")
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+def container_id_from_cgroup_path(path: str) -> Optional[str]:
+    for t in reversed(path.split("/")):
+        if t.endswith(".scope"):
+            t = t[:-6]
+        if t.startswith("docker-"):
+            t = t[7:]
+        if len(t) >= 12 and _HEX_CHARS.issuperset(t):
+            return t[:12]
+    return None
+def is_cgroup_v2(root: str = CGROUP_ROOT) -> bool:
+    return os.path.exists(os.path.join(root, "cgroup.controllers"))
+def _walk_cgroups(path: str, container_id: Optional[str], on_container: Callable, on_dir: Callable = None):
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                cid = container_id or container_id_from_cgroup_path(entry.name)
+                if cid:
+                    on_container(entry.path, entry.inode(), cid)
+                elif on_dir:
+                    on_dir(entry.path)
+            except OSError:
+                continue
+            _walk_cgroups(entry.path, cid, on_container, on_dir)
+def scan_container_cgroups(root: str = CGROUP_ROOT) -> Dict[int, str]:
+    index = {}
+    def _add(path, cgroup_id, container_id):
+        index[cgroup_id] = container_id
+    _walk_cgroups(root, None, _add)
+    return index
+class CgroupIndex:
+    def __init__(self, root: str = CGROUP_ROOT, resync_interval: float = 300, poll_interval: float = 2):
+        self.root = root
+        self.resync_interval = resync_interval
+        self.poll_interval = poll_interval
+        self._ids: Dict[int, str] = {}
+        self._paths: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable] = []
+        self._watches: Dict[int, str] = {}
+        self._inotify_fd = None
+        self._libc = None
+        self._thread = None
+    def lookup(self, cgroup_id: int) -> Optional[str]:
+        return self._ids.get(cgroup_id)
+    def snapshot(self) -> Dict[int, str]:
+        with self._lock:
+            return dict(self._ids)
+    def __len__(self):
+        return len(self._ids)
+    def subscribe(self, listener: Callable):
+        self._listeners.append(listener)
+    def _notify(self, added: Dict[int, str], removed: Dict[int, str]):
+        if not added and not removed:
+            return
+        for listener in self._listeners:
+            try:
+                listener(added, removed)
+            except Exception as e:
+                print(f"Cgroup index listener error: {e}", file=sys.stderr)
+    def rebuild(self):
+        ids, paths = {}, {}
+        def _add(path, cgroup_id, container_id):
+            ids[cgroup_id] = container_id
+            paths[path] = cgroup_id
+        _walk_cgroups(self.root, None, _add, self._add_watch)
+        with self._lock:
+            added = {k: v for k, v in ids.items() if self._ids.get(k) != v}
+            removed = {k: v for k, v in self._ids.items() if k not in ids}
+            self._ids = ids
+            self._paths = paths
+        self._notify(added, removed)
+    def _add_path(self, path: str):
+        added = {}
+        def _add(p, cgroup_id, container_id):
+            added[cgroup_id] = container_id
+            with self._lock:
+                self._ids[cgroup_id] = container_id
+                self._paths[p] = cgroup_id
+        container_id = container_id_from_cgroup_path(os.path.relpath(path, self.root))
+        if container_id:
+            try:
+                _add(path, os.stat(path).st_ino, container_id)
+            except OSError:
+                return
+        else:
+            self._add_watch(path)
+        _walk_cgroups(path, container_id, _add, self._add_watch)
+        self._notify(added, {})
+    def _remove_path(self, path: str):
+        removed = {}
+        prefix = path + "/"
+        with self._lock:
+            for p in [p for p in self._paths if p == path or p.startswith(prefix)]:
+                cgroup_id = self._paths.pop(p)
+                removed[cgroup_id] = self._ids.pop(cgroup_id, None)
+        self._notify({}, removed)
+    def _init_inotify(self) -> bool:
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = self._libc.inotify_init1(_IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return False
+        if fd < 0:
+            return False
+        self._inotify_fd = fd
+        self._add_watch(self.root)
+        return True
+    def _add_watch(self, path: str):
+        if self._inotify_fd is None:
+            return
+        wd = self._libc.inotify_add_watch(self._inotify_fd, os.fsencode(path), _IN_CREATE | _IN_DELETE)
+        if wd >= 0:
+            self._watches[wd] = path
+    def _read_inotify(self):
+        buf = os.read(self._inotify_fd, 64 * 1024)
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, name_len = _INOTIFY_EVENT.unpack_from(buf, offset)
+            offset += _INOTIFY_EVENT.size
+            name = buf[offset:offset + name_len].rstrip(b"\0").decode("utf-8", "replace")
+            offset += name_len
+            if mask & _IN_Q_OVERFLOW:
+                self.rebuild()
+                continue
+            parent = self._watches.get(wd)
+            if parent is None or not mask & _IN_ISDIR:
+                continue
+            path = os.path.join(parent, name)
+            if mask & _IN_CREATE:
+                self._add_path(path)
+            elif mask & _IN_DELETE:
+                self._remove_path(path)
+                for stale in [w for w, p in self._watches.items() if p == path]:
+                    del self._watches[stale]
+    def _run(self):
+        last_resync = time.time()
+        while True:
+            try:
+                if self._inotify_fd is not None:
+                    self._read_inotify()
+                else:
+                    time.sleep(self.poll_interval)
+                    self.rebuild()
+                    continue
+                if time.time() - last_resync >= self.resync_interval:
+                    self.rebuild()
+                    last_resync = time.time()
+            except Exception as e:
+                print(f"Cgroup index watch error: {e}", file=sys.stderr)
+                time.sleep(1)
+    def start(self):
+        if not self._init_inotify():
+            print(f"inotify unavailable, cgroup index falls back to rescans every {self.poll_interval}s", file=sys.stderr)
+        self.rebuild()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
\ No newline at end of file
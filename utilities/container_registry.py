@@ -0,0 +1,156 @@
+import http.client
+import json
+import socket
+import sys
+import threading
+import time
+from typing import Optional, Dict
+from urllib.parse import quote
+from .async_docker import docker_socket_path, ips_from_container_list
+EVENT_FILTERS = json.dumps({"type": ["container", "network"]})
+STOPPED_ACTIONS = {"die", "stop"}
+REFRESH_ACTIONS = {"start", "restart", "unpause", "pause", "update", "kill", "oom"}
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+class ContainerRegistry:
+    def __init__(self, socket_path: str = None, timeout: float = 5, reconnect_delay: float = 1, max_reconnect_delay: float = 30):
+        self.socket_path = socket_path or docker_socket_path()
+        self.timeout = timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.containers: Dict[str, dict] = {}
+        self.ip_map: Dict[str, str] = {}
+        self.connected = False
+        self.resyncs = 0
+        self.events_seen = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    def get(self, container_id: str) -> Optional[dict]:
+        return self.containers.get(container_id[:12])
+    def container_for_ip(self, ip: str) -> Optional[str]:
+        return self.ip_map.get(ip)
+    def _request(self, path: str):
+        conn = UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            body = response.read()
+            if response.status == 404:
+                return None
+            if response.status >= 400:
+                raise OSError(f"Docker API {response.status}: {body[:200]!r}")
+            return json.loads(body)
+        finally:
+            conn.close()
+    def _store(self, container_id: str, entry: Optional[dict]):
+        short_id = container_id[:12]
+        with self._lock:
+            old = self.containers.pop(short_id, None)
+            ip_map = {ip: cid for ip, cid in self.ip_map.items() if cid != short_id} if old else dict(self.ip_map)
+            if entry is not None:
+                self.containers[short_id] = entry
+                for ip in entry["ips"]:
+                    ip_map[ip] = short_id
+            self.ip_map = ip_map
+    def resync(self):
+        listing = self._request("/containers/json") or []
+        containers = {}
+        for item in listing:
+            names = item.get("Names") or [""]
+            containers[item["Id"][:12]] = {
+                "name": names[0].lstrip("/") or None,
+                "image": item.get("Image"),
+                "status": item.get("State"),
+                "ips": list(ips_from_container_list([item])),
+            }
+        ip_map = {ip: cid for cid, entry in containers.items() for ip in entry["ips"]}
+        with self._lock:
+            self.containers = containers
+            self.ip_map = ip_map
+        self.resyncs += 1
+    def refresh(self, container_id: str):
+        data = self._request(f"/containers/{container_id}/json")
+        if data is None:
+            self._store(container_id, None)
+            return
+        networks = data.get("NetworkSettings", {}).get("Networks", {}) or {}
+        self._store(container_id, {
+            "name": data.get("Name", "").lstrip("/") or None,
+            "image": data.get("Config", {}).get("Image"),
+            "status": data.get("State", {}).get("Status"),
+            "ips": [n.get("IPAddress") for n in networks.values() if n.get("IPAddress")],
+        })
+    def apply_event(self, event: dict):
+        self.events_seen += 1
+        action = event.get("Action") or event.get("status") or ""
+        action = action.split(":", 1)[0]
+        actor = event.get("Actor", {})
+        attributes = actor.get("Attributes", {}) or {}
+        if event.get("Type") == "network":
+            container_id = attributes.get("container")
+            if container_id and action in ("connect", "disconnect"):
+                self.refresh(container_id)
+            return
+        container_id = actor.get("ID") or event.get("id")
+        if not container_id:
+            return
+        short_id = container_id[:12]
+        if action == "destroy":
+            self._store(short_id, None)
+        elif action in REFRESH_ACTIONS:
+            self.refresh(container_id)
+        elif action in STOPPED_ACTIONS:
+            entry = self.containers.get(short_id)
+            if entry is not None:
+                self._store(short_id, dict(entry, status="exited", ips=[]))
+        elif action == "rename":
+            entry = self.containers.get(short_id)
+            if entry is not None:
+                self._store(short_id, dict(entry, name=attributes.get("name", entry["name"])))
+            else:
+                self.refresh(container_id)
+    def _stream(self):
+        conn = UnixHTTPConnection(self.socket_path, timeout=None)
+        try:
+            conn.request("GET", f"/events?filters={quote(EVENT_FILTERS)}")
+            response = conn.getresponse()
+            if response.status != 200:
+                raise OSError(f"Docker events stream returned {response.status}")
+            self.resync()
+            self.connected = True
+            while not self._stop.is_set():
+                line = response.readline()
+                if not line:
+                    return
+                line = line.strip()
+                if line:
+                    self.apply_event(json.loads(line))
+        finally:
+            self.connected = False
+            conn.close()
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self._stream()
+            except Exception as e:
+                print(f"Docker events stream error: {e}", file=sys.stderr, flush=True)
+            if time.monotonic() - started > self.max_reconnect_delay:
+                delay = self.reconnect_delay
+            self._stop.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="docker-events", daemon=True)
+        self._thread.start()
+        return self
+    def stop(self):
+        self._stop.set()
\ No newline at end of file
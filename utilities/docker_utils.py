@@ -1,37 +1,48 @@
 import os
 import time
 import sys
-import docker
-import docker.errors
 from typing import Optional, Dict
+from .container_mapper import container_id_from_cgroup_path
+from .config_loader import config
+PROC_ROOT = os.environ.get("HOST_PROC", "/proc")
+_CLIENT = None
+def _docker_client():
+    global _CLIENT
+    if _CLIENT is None:
+        import docker
+        _CLIENT = docker.from_env(timeout=5, max_pool_size=max(int(config.metadata_fetch_workers), 1))
+    return _CLIENT
+def _debug_log(path: str, message: str):
+    if not config.collector_debug_logging:
+        return
+    try:
+        with open(path, "a") as log:
+            log.write(message + "\n")
+    except OSError:
+        pass
+def get_process_start_time(pid: int) -> Optional[int]:
+    try:
+        with open(f"{PROC_ROOT}/{pid}/stat", "rb") as fh:
+            stat = fh.read()
+        return int(stat[stat.rindex(b")") + 2:].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
 def get_container_id_from_pid(pid: int) -> Optional[str]:
-    cgroup_file = f"/proc/{pid}/cgroup"
+    cgroup_file = f"{PROC_ROOT}/{pid}/cgroup"
     if not os.path.exists(cgroup_file):
         return None
     try:
         with open(cgroup_file, "r") as fh:
             lines = fh.readlines()
-            try:
-                with open("/tmp/cgroup_debug.log", "a") as log:
-                    log.write(f"PID {pid} cgroup: {lines}\n")
-            except: pass
+            _debug_log("/tmp/cgroup_debug.log", f"PID {pid} cgroup: {lines}")
             for line in lines:
                 parts = line.strip().split(":")
                 if len(parts) < 3:
                     continue
-                path = parts[2]
-                tokens = path.split("/")
-                for t in reversed(tokens):
-                    if t.endswith(".scope"):
-                        t = t[:-6]
-                    if t.startswith("docker-"):
-                        t = t[7:]
-                    if len(t) >= 12 and all(c in '0123456789abcdefABCDEF' for c in t):
-                        try:
-                            with open("/tmp/cgroup_debug.log", "a") as log:
-                                log.write(f"  MATCH: {t[:12]}\n")
-                        except: pass
-                        return t[:12]
+                container_id = container_id_from_cgroup_path(parts[2])
+                if container_id:
+                    _debug_log("/tmp/cgroup_debug.log", f"  MATCH: {container_id}")
+                    return container_id
     except Exception:
         return None
     return None
@@ -39,14 +50,11 @@ import json
 import subprocess
 def get_container_metadata(container_id: str) -> Dict[str, Optional[str]]:
     def log_debug(msg):
-        try:
-            with open("docker_utils_debug.log", "a") as f:
-                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {msg}\n")
-        except: pass
+        if config.collector_debug_logging:
+            _debug_log("docker_utils_debug.log", f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {msg}")
     log_debug(f"Getting metadata for {container_id}")
     try:
-        client = docker.from_env(timeout=5)
-        container = client.containers.get(container_id)
+        container = _docker_client().containers.get(container_id)
         log_debug(f"SDK success: {container.name}")
         return {
             "name": container.name,
@@ -76,8 +84,7 @@ def is_containerized(pid: int) -> bool:
 def get_all_container_ips() -> Dict[str, str]:
     ip_to_container = {}
     try:
-        client = docker.from_env(timeout=5)
-        for container in client.containers.list():
+        for container in _docker_client().containers.list():
             try:
                 networks = container.attrs.get("NetworkSettings", {}).get("Networks", {})
                 container_id_short = container.id[:12]
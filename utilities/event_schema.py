@@ -0,0 +1,59 @@
+import json
+from datetime import datetime
+EVENTS_TABLE = "events"
+EVENT_COLUMNS = (
+    "timestamp_ns",
+    "timestamp_iso",
+    "pid",
+    "tgid",
+    "uid",
+    "comm",
+    "monitor_type",
+    "container_id",
+    "container_name",
+    "container_image",
+    "container_status",
+    "argv",
+    "categories",
+    "risk_score",
+    "is_security_relevant",
+    "source_ip",
+    "dest_ip",
+    "source_port",
+    "dest_port",
+    "event_type",
+    "connection_count",
+    "source_container_id",
+    "dest_container_id",
+    "source_container_name",
+    "dest_container_name",
+)
+DROP_STATS_TABLE = "drop_stats"
+DROP_STAT_COLUMNS = ("timestamp_ns", "timestamp_iso", "container_id", "container_name", "reason", "count")
+SERVER_COLUMNS = ("id", "created_at")
+def parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+def event_values(event: dict) -> dict:
+    values = {column: event.get(column) for column in EVENT_COLUMNS}
+    values["timestamp_iso"] = parse_timestamp(event["timestamp_iso"])
+    if values["connection_count"] is None:
+        values["connection_count"] = 1
+    return values
+def drop_stat_values(event: dict) -> dict:
+    return {
+        "timestamp_ns": event["timestamp_ns"],
+        "timestamp_iso": parse_timestamp(event["timestamp_iso"]),
+        "container_id": event.get("container_id"),
+        "container_name": event.get("container_name"),
+        "reason": event.get("event_type"),
+        "count": event.get("count", 0),
+    }
+def encode_json_columns(values: dict) -> dict:
+    if values.get("categories") is not None:
+        values["categories"] = json.dumps(values["categories"])
+    return values
+def check_table_columns(table, columns):
+    actual = {column.name for column in table.columns} - set(SERVER_COLUMNS)
+    drift = actual.symmetric_difference(columns)
+    if drift:
+        raise RuntimeError(f"{table.name} model columns differ from utilities.event_schema: {sorted(drift)}")
\ No newline at end of file
@@ -0,0 +1,150 @@
+import struct
+from datetime import datetime
+from typing import Iterator, Dict, Tuple
+from .syscall_utils import syscall_name_for
+RECORD_FD_ENV = "MONITOR_RECORD_FD"
+FRAME_HEADER = struct.Struct("=HI")
+RECORD_EXEC = 1
+RECORD_CONNECT = 2
+RECORD_FLOW = 3
+RECORD_LIFECYCLE = 4
+RECORD_SYSCALL = 5
+RECORD_DROPS = 6
+LIFECYCLE_EVENT_TYPES = {1: "process_fork", 2: "process_exit"}
+DROP_RATE_LIMITED = 1
+DROP_BUFFER_LOST = 2
+DROP_REASONS = {DROP_RATE_LIMITED: "rate_limited", DROP_BUFFER_LOST: "buffer_lost"}
+RECORD_LAYOUTS = {
+    RECORD_EXEC: struct.Struct("=QQIII16sHHB3x"),
+    RECORD_CONNECT: struct.Struct("=QQIII16sIIHHB7x"),
+    RECORD_FLOW: struct.Struct("=QIH2xQQQIII16s4x"),
+    RECORD_LIFECYCLE: struct.Struct("=QQIIB7x"),
+    RECORD_SYSCALL: struct.Struct("=QQIIII16sQQ"),
+    RECORD_DROPS: struct.Struct("=QQQB7x"),
+}
+EXEC_ARGV_LEN_OFFSET = 46
+def get_boot_time():
+    with open('/proc/uptime', 'r') as f:
+        uptime_seconds = float(f.readline().split()[0])
+        return datetime.now().timestamp() - uptime_seconds
+BOOT_TIME_OFFSET = get_boot_time()
+def ns_to_iso(ts_ns: int) -> str:
+    return datetime.fromtimestamp(BOOT_TIME_OFFSET + (ts_ns / 1e9)).isoformat() + "Z"
+def _cstr(raw: bytes) -> str:
+    return raw.split(b"\0", 1)[0].decode("utf-8", "ignore")
+def encode_frame(record_type: int, payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(record_type, len(payload)) + payload
+def decode_records(record_type: int, payload: bytes) -> Iterator[Dict]:
+    layout = RECORD_LAYOUTS.get(record_type)
+    if layout is None:
+        return
+    if record_type == RECORD_EXEC:
+        view = memoryview(payload)
+        offset = 0
+        while offset + layout.size <= len(view):
+            ts_ns, cgroup_id, pid, tgid, uid, comm, argc, argv_len, truncated = layout.unpack_from(view, offset)
+            offset += layout.size
+            strings = str(view[offset:offset + argv_len], "utf-8", "replace").rstrip("\0").split("\0")
+            offset += argv_len
+            filename = strings[0]
+            yield {
+                "timestamp_ns": ts_ns,
+                "timestamp_iso": ns_to_iso(ts_ns),
+                "monitor_type": "syscall",
+                "cgroup_id": cgroup_id,
+                "pid": pid,
+                "tgid": tgid,
+                "uid": uid,
+                "comm": _cstr(comm),
+                "filename": filename,
+                "argv": " ".join(strings[1:]) or filename,
+                "argc": argc,
+                "argv_truncated": bool(truncated),
+                "syscall_name": "execve"
+            }
+    elif record_type == RECORD_CONNECT:
+        for ts_ns, cgroup_id, pid, tgid, uid, comm, saddr, daddr, sport, dport, ip_version in layout.iter_unpack(payload):
+            yield {
+                "timestamp_ns": ts_ns,
+                "timestamp_iso": ns_to_iso(ts_ns),
+                "monitor_type": "network",
+                "cgroup_id": cgroup_id,
+                "pid": pid,
+                "tgid": tgid,
+                "uid": uid,
+                "comm": _cstr(comm),
+                "saddr": saddr,
+                "daddr": daddr,
+                "sport": sport,
+                "dport": dport,
+                "ip_version": ip_version,
+            }
+    elif record_type == RECORD_FLOW:
+        for cgroup_id, daddr, dport, count, first_ts, last_ts, pid, tgid, uid, comm in layout.iter_unpack(payload):
+            yield {
+                "timestamp_ns": first_ts,
+                "timestamp_iso": ns_to_iso(first_ts),
+                "monitor_type": "network",
+                "cgroup_id": cgroup_id,
+                "pid": pid,
+                "tgid": tgid,
+                "uid": uid,
+                "comm": _cstr(comm),
+                "saddr": 0,
+                "daddr": daddr,
+                "sport": 0,
+                "dport": dport,
+                "ip_version": 4,
+                "connection_count": count,
+                "first_timestamp_ns": first_ts,
+                "last_timestamp_ns": last_ts,
+            }
+    elif record_type == RECORD_LIFECYCLE:
+        for ts_ns, cgroup_id, pid, ppid, kind in layout.iter_unpack(payload):
+            yield {
+                "timestamp_ns": ts_ns,
+                "timestamp_iso": ns_to_iso(ts_ns),
+                "monitor_type": "lifecycle",
+                "event_type": LIFECYCLE_EVENT_TYPES.get(kind, "unknown"),
+                "cgroup_id": cgroup_id,
+                "pid": pid,
+                "ppid": ppid,
+            }
+    elif record_type == RECORD_SYSCALL:
+        for ts_ns, cgroup_id, pid, tgid, uid, nr, comm, arg0, arg1 in layout.iter_unpack(payload):
+            yield {
+                "timestamp_ns": ts_ns,
+                "timestamp_iso": ns_to_iso(ts_ns),
+                "monitor_type": "syscall",
+                "cgroup_id": cgroup_id,
+                "pid": pid,
+                "tgid": tgid,
+                "uid": uid,
+                "comm": _cstr(comm),
+                "syscall_name": syscall_name_for(nr),
+                "syscall_nr": nr,
+                "syscall_args": [arg0, arg1]
+            }
+    elif record_type == RECORD_DROPS:
+        for ts_ns, cgroup_id, count, kind in layout.iter_unpack(payload):
+            yield {
+                "timestamp_ns": ts_ns,
+                "timestamp_iso": ns_to_iso(ts_ns),
+                "monitor_type": "stats",
+                "event_type": DROP_REASONS.get(kind, "unknown"),
+                "cgroup_id": cgroup_id,
+                "count": count,
+            }
+def iter_frames(stream) -> Iterator[Tuple[int, bytes]]:
+    while True:
+        header = stream.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            return
+        record_type, length = FRAME_HEADER.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length:
+            return
+        yield record_type, payload
+def read_frames(stream) -> Iterator[Dict]:
+    for record_type, payload in iter_frames(stream):
+        yield from decode_records(record_type, payload)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterable, Set, Tuple
 SECURITY_RELEVANT_SYSCALLS = {
     'execve', 'execveat', 'fork', 'vfork', 'clone', 'clone3',
     'setuid', 'setgid', 'setreuid', 'setregid', 'setresuid', 'setresgid',
@@ -10,6 +10,13 @@ SECURITY_RELEVANT_SYSCALLS = {
     'reboot', 'sethostname', 'setdomainname',
     'ptrace', 'process_vm_readv', 'process_vm_writev'
 }
+HIGH_VOLUME_SYSCALLS = {
+    'open', 'openat', 'openat2', 'creat',
+    'fork', 'vfork', 'clone', 'clone3',
+    'socket', 'accept', 'accept4'
+}
+REMOTE_ACCESS_PORTS = {22, 23, 3389}
+WEB_PORTS = {80, 443, 8080, 8443}
 SYSCALL_CATEGORIES = {
     'process': ['execve', 'execveat', 'fork', 'vfork', 'clone', 'clone3', 'exit', 'exit_group'],
     'file': ['open', 'openat', 'openat2', 'creat', 'read', 'write', 'close', 'stat', 'fstat', 'lstat'],
@@ -18,6 +25,26 @@ SYSCALL_CATEGORIES = {
     'ipc': ['pipe', 'pipe2', 'msgget', 'msgsnd', 'msgrcv', 'shmget', 'shmat', 'shmdt', 'semget', 'semop'],
     'system': ['mount', 'umount', 'umount2', 'reboot', 'sethostname', 'setdomainname', 'init_module', 'finit_module']
 }
+_SYSCALL_TABLE = None
+def syscall_table() -> Dict[int, str]:
+    global _SYSCALL_TABLE
+    if _SYSCALL_TABLE is None:
+        try:
+            from bcc.syscall import syscalls
+            _SYSCALL_TABLE = {int(nr): name.decode() for nr, name in syscalls.items()}
+        except Exception:
+            _SYSCALL_TABLE = {}
+    return _SYSCALL_TABLE
+def syscall_name_for(nr: int) -> str:
+    return syscall_table().get(nr, f"syscall_{nr}")
+def syscall_numbers_for(names: Iterable[str]) -> List[int]:
+    wanted = {n.lower() for n in names}
+    return sorted(nr for nr, name in syscall_table().items() if name in wanted)
+def traced_syscalls(categories: Iterable[str] = (), exclude: Iterable[str] = ()) -> Set[str]:
+    names = set(SECURITY_RELEVANT_SYSCALLS) - HIGH_VOLUME_SYSCALLS
+    for category in categories:
+        names.update(SYSCALL_CATEGORIES.get(category, []))
+    return names - set(exclude)
 def parse_syscall_name(argv: str) -> Optional[str]:
     if not argv:
         return None
@@ -44,4 +71,10 @@ def get_risk_score(syscall_name: str, uid: int = None) -> int:
         score += 4
     if uid is not None and uid != 0 and score > 0:
         score += 2
-    return min(score, 10)
\ No newline at end of file
+    return min(score, 10)
+def get_network_risk(dest_port: int) -> Tuple[int, bool]:
+    if dest_port in REMOTE_ACCESS_PORTS:
+        return 5, True
+    if dest_port in WEB_PORTS:
+        return 1, False
+    return 3, True
\ No newline at end of file